@@ -0,0 +1,83 @@
+# Bytes per frame written to the terminal by the dashboard on the synthetic
+# backend: the full redraw from the home position it did before against the
+# changed cells drawn by cmd.screen.Screen. With pyte installed, both outputs
+# are fed to a terminal emulator and compared cell by cell after every frame.
+#
+#   python -m benchmarks.dashboard_redraw [--frames 40] [--interval 0.8]
+
+import argparse
+import contextlib
+import io
+import time
+
+from performance_monitor.cmd import settings, tools
+from performance_monitor.cmd.combiner import Combiner
+from performance_monitor.cmd.screen import Screen
+
+try:
+    import pyte
+except ImportError:
+    pyte = None
+
+
+def frame_lines(combiner: Combiner):
+    # what info_display draws, without the rows cut to the terminal height
+    out = [f"{tools.get_title(group)}\n{tables}" for group, tables in combiner.get_info()]
+    return "\n".join(out).split("\n")
+
+
+def run(columns: int, threads: int, frames: int, interval: float):
+    settings.reset(columns)
+    with contextlib.redirect_stdout(io.StringIO()):
+        combiner = Combiner(backend="synthetic", backend_options={"threads": str(threads)})
+    screen = Screen(io.StringIO())
+    emulators = None
+    full_bytes = diff_bytes = 0
+    render_time = 0.0
+    same = True
+    try:
+        for frame in range(frames):
+            lines = frame_lines(combiner)
+            full = "\x1b[0;0H" + "\n".join(lines)
+            start = time.perf_counter()
+            diff = screen.render(lines)
+            render_time += time.perf_counter() - start
+            full_bytes += len(full.encode())
+            diff_bytes += len(diff.encode())
+
+            if pyte is not None:
+                if emulators is None:
+                    emulators = [pyte.Screen(columns, len(lines) + 1) for _ in range(2)]
+                    streams = [pyte.Stream(emulator) for emulator in emulators]
+                # the tty turns every newline into CR LF on the way
+                streams[0].feed(full.replace("\n", "\r\n"))
+                streams[1].feed(diff.replace("\n", "\r\n"))
+                same = same and emulators[0].display == emulators[1].display
+            time.sleep(interval)
+    finally:
+        with contextlib.redirect_stdout(io.StringIO()):
+            combiner.dispose()
+
+    print(f"{columns} columns, {threads} threads, {frames} frames")
+    print(f"  full redraw    {full_bytes / frames:8.0f} bytes per frame")
+    print(
+        f"  changed cells  {diff_bytes / frames:8.0f} bytes per frame "
+        f"({full_bytes / diff_bytes:.1f}x less)"
+    )
+    print(f"  diff time      {render_time / frames * 1000:8.2f} ms per frame")
+    if pyte is not None:
+        print(f"  same screen    {same}")
+
+
+def main():
+    arguments = argparse.ArgumentParser()
+    arguments.add_argument("--frames", type=int, default=40)
+    arguments.add_argument("--interval", type=float, default=0.8)
+    args = arguments.parse_args()
+
+    for columns, threads in ((100, 16), (160, 64)):
+        run(columns, threads, args.frames, args.interval)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+# Time per update of the LibreHardwareMonitor CPU and GPU getters. The .NET
+# library only loads on Windows, so it is replaced by plain Python objects
+# shaped like its sensors. This measures the Python side only; a real sensor
+# attribute read crosses into .NET and costs more. The digest of the sensor
+# values tells whether two commits report the same values.
+#
+#   python -m benchmarks.lhm_sensors [--threads 128,256] [--updates N]
+
+import argparse
+import contextlib
+import enum
+import hashlib
+import io
+import json
+import sys
+import timeit
+import types
+from collections.abc import Mapping
+
+
+class SensorType(enum.Enum):
+    Voltage = 0
+    Clock = 2
+    Temperature = 3
+    Load = 4
+    Power = 7
+    Data = 8
+    SmallData = 9
+
+
+class HardwareType(enum.Enum):
+    Cpu = 2
+    GpuNvidia = 3
+    GpuAmd = 4
+    GpuIntel = 5
+
+
+class Sensor:
+    def __init__(self, name: str, sensor_type: SensorType, value: float):
+        self.Name = name
+        self.SensorType = sensor_type
+        self.Value = value
+
+
+class Hardware:
+    def __init__(self, name: str, hardware_type: HardwareType, sensors):
+        self.Name = name
+        self.HardwareType = hardware_type
+        self.Identifier = f"/{hardware_type.name.lower()}/{id(self)}"
+        self.Sensors = sensors
+
+    def Update(self): ...
+
+
+class Computer:
+    hardware = []
+
+    def __init__(self):
+        self.Hardware = Computer.hardware
+
+    def Open(self): ...
+
+    def Close(self): ...
+
+
+def cpu_sensors(threads: int):
+    # named like the Intel CPU sensors of LibreHardwareMonitor
+    cores = threads // 2
+    sensors = [
+        Sensor("CPU Total", SensorType.Load, 31.5),
+        Sensor("CPU Core Max", SensorType.Load, 88.0),
+        Sensor("CPU Package", SensorType.Temperature, 61.0),
+        Sensor("Core Max", SensorType.Temperature, 64.0),
+        Sensor("Core Average", SensorType.Temperature, 57.0),
+        Sensor("CPU Package", SensorType.Power, 95.5),
+        Sensor("CPU Cores", SensorType.Power, 80.25),
+        Sensor("Bus Speed", SensorType.Clock, 100.0),
+        Sensor("CPU Core", SensorType.Voltage, 1.2),
+    ]
+    for core in range(1, cores + 1):
+        sensors += [
+            Sensor(f"CPU Core #{core}", SensorType.Temperature, 50.0 + core % 10),
+            Sensor(f"CPU Core #{core} Distance to TjMax", SensorType.Temperature, 40.0),
+            Sensor(f"CPU Core #{core}", SensorType.Clock, 4000.0 + core),
+            Sensor(f"CPU Core #{core}", SensorType.Voltage, 1.1),
+        ]
+        for thread in (1, 2):
+            sensors.append(
+                Sensor(f"CPU Core #{core} Thread #{thread}", SensorType.Load, float(core % 100))
+            )
+    return sensors
+
+
+def gpu_sensors():
+    return [
+        Sensor("GPU Core", SensorType.Temperature, 55.0),
+        Sensor("GPU Core", SensorType.Clock, 2105.0),
+        Sensor("GPU Memory", SensorType.Clock, 1000.0),
+        Sensor("GPU Core", SensorType.Load, 37.0),
+        Sensor("GPU Package", SensorType.Power, 123.0),
+        Sensor("GPU Memory Total", SensorType.SmallData, 16368.0),
+        Sensor("GPU Memory Used", SensorType.SmallData, 1024.0),
+    ]
+
+
+def install_fake_library():
+    hardware_module = types.ModuleType("LibreHardwareMonitor.Hardware")
+    hardware_module.Computer = Computer
+    hardware_module.IHardware = Hardware
+    hardware_module.ISensor = Sensor
+    hardware_module.HardwareType = HardwareType
+    hardware_module.SensorType = SensorType
+    library = types.ModuleType("LibreHardwareMonitor")
+    library.Hardware = hardware_module
+    clr = types.ModuleType("clr")
+    clr.AddReference = lambda path: None
+    sys.modules.update(
+        {
+            "clr": clr,
+            "LibreHardwareMonitor": library,
+            "LibreHardwareMonitor.Hardware": hardware_module,
+        }
+    )
+
+
+def digest(getter) -> str:
+    # records and buffers are compared by their values
+    def default(value):
+        return dict(value) if isinstance(value, Mapping) else list(value)
+
+    encoded = json.dumps(getter.sensors(), default=default, sort_keys=True)
+    return hashlib.sha1(encoded.encode()).hexdigest()[:12]
+
+
+def bench(name: str, getter, updates: int):
+    best = min(timeit.repeat(getter.update, number=updates, repeat=5)) / updates
+    print(f"  {name:<24} {best * 1e6:8.1f} us per update, values {digest(getter)}")
+    getter.dispose()
+
+
+def main():
+    arguments = argparse.ArgumentParser()
+    arguments.add_argument("--threads", type=str, default="128,256")
+    arguments.add_argument("--updates", type=int, default=2000)
+    args = arguments.parse_args()
+
+    install_fake_library()
+    from performance_monitor.info_getter.cpu_info import CpuInformation
+    from performance_monitor.info_getter.general_gpu_info import GeneralGpuInformation
+
+    for threads in (int(item) for item in args.threads.split(",")):
+        Computer.hardware = [Hardware("Fake CPU", HardwareType.Cpu, cpu_sensors(threads))]
+        with contextlib.redirect_stdout(io.StringIO()):
+            getter = CpuInformation()
+        bench(f"CPU, {threads} threads", getter, args.updates)
+
+    Computer.hardware = [Hardware("Fake GPU", HardwareType.GpuAmd, gpu_sensors())]
+    with contextlib.redirect_stdout(io.StringIO()):
+        getter = GeneralGpuInformation()
+    bench("GPU, 7 sensors", getter, args.updates)
+
+
+if __name__ == "__main__":
+    main()
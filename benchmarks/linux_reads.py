@@ -0,0 +1,119 @@
+# Time and read syscalls per update of LinuxCpuInformation and
+# LinuxMemoryInformation on a fake 2 x 64 core, 256 thread tree, with the
+# syscalls counted from /proc/self/io. Run it at two commits to compare them.
+# It also times the ways of rereading a short sysfs value.
+#
+#   python -m benchmarks.linux_reads [--ticks N]
+
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import time
+import timeit
+
+from performance_monitor.info_getter.linux_cpu_info import LinuxCpuInformation
+from performance_monitor.info_getter.linux_memory_info import LinuxMemoryInformation
+from tests.fake_root import (
+    write_cpu_topology,
+    write_hwmon,
+    write_meminfo,
+    write_rapl,
+)
+
+PACKAGES = 2
+CORES = 64
+
+
+def write_tree(root: str):
+    write_cpu_topology(root, packages=PACKAGES, cores=CORES, threads_per_core=2)
+    for package in range(PACKAGES):
+        temperatures = {f"Package id {package}": 60000}
+        temperatures.update({f"Core {core}": 50000 + core for core in range(CORES)})
+        write_hwmon(root, package, "coretemp", temperatures)
+        write_rapl(root, package, 1_000_000, 262_143_328_850)
+    write_meminfo(
+        root,
+        {
+            "MemTotal": 65_000_000,
+            "MemFree": 20_000_000,
+            "MemAvailable": 40_000_000,
+            "SwapTotal": 8_000_000,
+            "SwapFree": 8_000_000,
+        },
+    )
+
+
+def read_syscalls() -> int:
+    with open("/proc/self/io", "rb") as file:
+        for line in file:
+            if line.startswith(b"syscr:"):
+                return int(line.split()[1])
+    return 0
+
+
+def bench_updates(root: str, ticks: int):
+    with contextlib.redirect_stdout(io.StringIO()):
+        cpu = LinuxCpuInformation(root)
+        memory = LinuxMemoryInformation(root)
+    for _ in range(5):
+        cpu.update()
+        memory.update()
+
+    start_reads = read_syscalls()
+    start = time.perf_counter()
+    for _ in range(ticks):
+        cpu.update()
+        memory.update()
+    duration = time.perf_counter() - start
+    # the read of /proc/self/io itself is one more
+    reads = read_syscalls() - start_reads - 1
+
+    cpu.dispose()
+    memory.dispose()
+    print(f"{sum(len(load) for load in cpu.load)} threads, {ticks} ticks")
+    print(f"  {duration / ticks * 1000:.2f} ms per tick")
+    print(f"  {reads / ticks:.0f} read syscalls per tick")
+
+
+def bench_short_reads(root: str):
+    path = os.path.join(root, "sys/devices/system/cpu/cpu0/cpufreq/scaling_cur_freq")
+    fd = os.open(path, os.O_RDONLY)
+    buffer = bytearray(64)
+
+    def pread():
+        return int(os.pread(fd, 32, 0))
+
+    def preadv_slice():
+        size = os.preadv(fd, [buffer], 0)
+        return int(bytes(memoryview(buffer)[:size]))
+
+    def open_read_close():
+        with open(path, "rb") as file:
+            return int(file.read())
+
+    print("rereading scaling_cur_freq")
+    for name, function in (
+        ("pread", pread),
+        ("preadv and slice", preadv_slice),
+        ("open, read, close", open_read_close),
+    ):
+        best = min(timeit.repeat(function, number=20000, repeat=5)) / 20000
+        print(f"  {name:<18} {best * 1e6:.2f} us")
+    os.close(fd)
+
+
+def main():
+    arguments = argparse.ArgumentParser()
+    arguments.add_argument("--ticks", type=int, default=200)
+    args = arguments.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        write_tree(root)
+        bench_updates(root, args.ticks)
+        bench_short_reads(root)
+
+
+if __name__ == "__main__":
+    main()
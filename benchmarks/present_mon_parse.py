@@ -0,0 +1,121 @@
+# CPU time per frame of reading PresentMon's CSV output, the csv.DictReader
+# loop the frame time collector used before against PresentMonParser fed with
+# read1() chunks. A synthetic --v1_metrics capture of two swapchains at about
+# 1500 fps is piped through cat, so both read from a real pipe.
+#
+#   python -m benchmarks.present_mon_parse [--frames N]
+
+import argparse
+import csv
+import io
+import os
+import random
+import subprocess
+import tempfile
+import time
+from typing import List
+
+from performance_monitor.info_getter.present_mon import PresentMonParser
+
+COLUMNS = (
+    "Application,ProcessID,SwapChainAddress,Runtime,SyncInterval,PresentFlags,"
+    "AllowsTearing,PresentMode,WasBatched,DwmNotified,Dropped,TimeInSeconds,"
+    "msInPresentAPI,msBetweenPresents,msUntilRenderComplete,msUntilDisplayed,"
+    "msBetweenDisplayChange,msUntilRenderStart,msGPUActive,msGPUVideoActive,"
+    "msSinceInput,QPCTime"
+)
+
+
+def write_capture(path: str, frames: int):
+    generator = random.Random(0)
+    now = 0.0
+    with open(path, "w", newline="") as file:
+        file.write(COLUMNS + "\r\n")
+        for frame in range(frames):
+            frame_ms = max(0.2, generator.gauss(1.33, 0.15))
+            now += frame_ms / 1000
+            swapchain = "0x000001F0A2B3C4D0" if frame % 2 else "0x000001F0A2B3C8E0"
+            file.write(
+                f"game.exe,4242,{swapchain},DXGI,0,512,1,Hardware: Independent Flip,0,0,0,"
+                f"{now:.6f},{frame_ms * 0.1:.4f},{frame_ms:.4f},{frame_ms * 0.8:.4f},"
+                f"{frame_ms * 1.2:.4f},{frame_ms:.4f},{frame_ms * 0.05:.4f},"
+                f"{frame_ms * 0.7:.4f},0.0000,NA,{int(now * 1e7)}\r\n"
+            )
+
+
+def read_rows(path: str) -> List[float]:
+    # the collector before: a line buffered text pipe, a dict per row and a
+    # clock read per frame to find the end of a window
+    process = subprocess.Popen(
+        ["cat", path],
+        stdout=subprocess.PIPE,
+        text=True,
+        encoding="utf-8",
+        errors="ignore",
+        bufsize=1,
+    )
+    frame_times = []
+    reader = csv.DictReader(process.stdout)
+    column = next(field for field in reader.fieldnames if "msbetweenpresents" in field.lower())
+    window_start = time.monotonic()
+    for row in reader:
+        value = row.get(column)
+        if value:
+            try:
+                frame_times.append(float(value))
+            except ValueError:
+                pass
+        now = time.monotonic()
+        if now - window_start < 0.2:
+            continue
+        window_start = now
+    process.wait()
+    return frame_times
+
+
+def read_chunks(path: str) -> List[float]:
+    process = subprocess.Popen(["cat", path], stdout=subprocess.PIPE)
+    stdout: io.BufferedReader = process.stdout
+    parser = PresentMonParser()
+    frame_times = []
+    window_start = time.monotonic()
+    while True:
+        chunk = stdout.read1(1 << 16)
+        if not chunk:
+            break
+        frame_times += parser.feed(chunk)
+        now = time.monotonic()
+        if now - window_start < 0.2:
+            continue
+        window_start = now
+    process.wait()
+    return frame_times
+
+
+def main():
+    arguments = argparse.ArgumentParser()
+    arguments.add_argument("--frames", type=int, default=600_000)
+    args = arguments.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "capture.csv")
+        write_capture(path, args.frames)
+        print(f"{args.frames} frames, {os.path.getsize(path) / 1e6:.0f} MB")
+
+        results = []
+        for name, read in (("csv.DictReader", read_rows), ("PresentMonParser", read_chunks)):
+            start_cpu = time.process_time()
+            start = time.perf_counter()
+            frame_times = read(path)
+            cpu = time.process_time() - start_cpu
+            duration = time.perf_counter() - start
+            results.append(frame_times)
+            print(
+                f"  {name:<17} {cpu / len(frame_times) * 1e9:6.0f} ns per frame CPU, "
+                f"{len(frame_times) / duration / 1e6:.2f} M frames/s"
+            )
+        print(f"  same frame times: {results[0] == results[1]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+# Cost of collecting the sensors of every getter on the synthetic backend:
+# sensors() of all getters per tick, sensor_keys() per call, and a whole
+# server sample (update, records and JSON encoding). Run it at two commits to
+# compare them.
+#
+#   python -m benchmarks.sensor_records [--threads 64] [--gpus 4]
+
+import argparse
+import contextlib
+import io
+import timeit
+
+from performance_monitor.server.combiner import Combiner
+
+
+def best_of(function, number: int) -> float:
+    return min(timeit.repeat(function, number=number, repeat=7)) / number
+
+
+def main():
+    arguments = argparse.ArgumentParser()
+    arguments.add_argument("--threads", type=str, default="64")
+    arguments.add_argument("--gpus", type=str, default="4")
+    args = arguments.parse_args()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        combiner = Combiner(
+            backend="synthetic",
+            backend_options={"threads": args.threads, "gpus": args.gpus},
+        )
+    getters = combiner.available_getters
+    combiner._sample()
+
+    def sensors():
+        return [getter.sensors() for getter in getters]
+
+    def sensor_keys():
+        return getters[1].sensor_keys()
+
+    def sample():
+        with combiner._lock:
+            return combiner._sample()
+
+    print(f"synthetic backend, {len(getters)} getters")
+    print(f"  sensors() of all getters {best_of(sensors, 2000) * 1e6:8.2f} us")
+    print(f"  sensor_keys()            {best_of(sensor_keys, 20000) * 1e6:8.2f} us")
+    print(f"  server _sample()         {best_of(sample, 200) * 1e3:8.3f} ms")
+    with contextlib.redirect_stdout(io.StringIO()):
+        combiner.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+# Requests per second and the median and 99th percentile latency of the
+# threading and asyncio server engines under 1, 100 and 1000 concurrent
+# clients, each sending POST /info back to back. The server runs the
+# synthetic backend in a child process with a 1 s sampler; the clients keep
+# their connection open unless the server closes it.
+#
+#   python -m benchmarks.server_engines [--duration SECONDS] [--clients 1,100,1000]
+
+import argparse
+import asyncio
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from typing import List
+
+REQUEST = b"POST /info HTTP/1.1\r\nHost: localhost\r\nContent-Length: 0\r\n\r\n"
+
+
+def start_server(engine: str, port: int) -> subprocess.Popen:
+    return subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "performance_monitor.server.runner",
+            "--engine",
+            engine,
+            "--port",
+            str(port),
+            "--backend",
+            "synthetic",
+        ],
+        stdout=subprocess.DEVNULL,
+        # the threading engine logs every request
+        stderr=subprocess.DEVNULL,
+    )
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_for_port(port: int, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1.0).close()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.1)
+
+
+async def _client(port: int, latencies: List[float]):
+    # requests until cancelled, a request still open then is not counted
+    reader = writer = None
+    try:
+        while True:
+            start = time.perf_counter()
+            try:
+                if writer is None:
+                    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+                writer.write(REQUEST)
+                head = await reader.readuntil(b"\r\n\r\n")
+            except (OSError, asyncio.IncompleteReadError):
+                if writer is not None:
+                    writer.close()
+                reader = writer = None
+                continue
+            lines = head.lower().split(b"\r\n")
+            length = 0
+            close = lines[0].startswith(b"http/1.0")
+            for line in lines[1:]:
+                key, _, value = line.partition(b":")
+                if key == b"content-length":
+                    length = int(value)
+                elif key == b"connection":
+                    close = value.strip() != b"keep-alive"
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - start)
+            if close:
+                writer.close()
+                reader = writer = None
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+async def _load(port: int, clients: int, duration: float) -> List[float]:
+    latencies = []
+    tasks = [asyncio.create_task(_client(port, latencies)) for _ in range(clients)]
+    await asyncio.sleep(duration)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    return latencies
+
+
+def main():
+    arguments = argparse.ArgumentParser()
+    arguments.add_argument("--duration", type=float, default=5.0)
+    arguments.add_argument("--clients", type=str, default="1,100,1000")
+    args = arguments.parse_args()
+
+    print(f"{'clients':>8} {'engine':>10} {'rps':>8} {'p50 ms':>8} {'p99 ms':>8}")
+    for clients in (int(item) for item in args.clients.split(",")):
+        for engine in ("threading", "asyncio"):
+            port = _free_port()
+            server = start_server(engine, port)
+            try:
+                _wait_for_port(port)
+                latencies = asyncio.run(_load(port, clients, args.duration))
+            finally:
+                server.terminate()
+                server.wait()
+            rps = len(latencies) / args.duration
+            p50, p99 = (
+                (statistics.quantiles(latencies, n=100)[index] * 1000 for index in (49, 98))
+                if len(latencies) > 1
+                else (float("nan"), float("nan"))
+            )
+            print(f"{clients:>8} {engine:>10} {rps:>8.0f} {p50:>8.2f} {p99:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
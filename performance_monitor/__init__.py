@@ -1,7 +1,13 @@
 __version__ = "0.0.2+sp1"
 
-import performance_monitor.assets
-import performance_monitor.third_party
-import performance_monitor.info_getter
-import performance_monitor.cmd
-import performance_monitor.server
+import importlib
+
+# subpackages load on first access, so the server never pays for the
+# dashboard (wcwidth) and neither pays for unused getters
+_subpackages = ("assets", "third_party", "info_getter", "cmd", "server", "analyze")
+
+
+def __getattr__(name: str):
+    if name not in _subpackages:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return importlib.import_module(f"{__name__}.{name}")
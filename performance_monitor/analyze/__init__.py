@@ -0,0 +1,10 @@
+import importlib
+
+
+# the analyzer needs NumPy, which is only installed with the analyze extra
+def __getattr__(name: str):
+    if name == "FrameTimeAnalyzer":
+        return importlib.import_module(f"{__name__}.analyzer").FrameTimeAnalyzer
+    if name != "analyzer":
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return importlib.import_module(f"{__name__}.{name}")
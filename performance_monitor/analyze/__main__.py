@@ -0,0 +1,96 @@
+import argparse
+import json
+import time
+
+import tabulate
+
+from .analyzer import FrameTimeAnalyzer
+
+_COLUMNS = (
+    ("frames", "Frames", "d"),
+    ("seconds", "Seconds", ".1f"),
+    ("fps", "FPS", ".1f"),
+    ("fps_1_low", "1% Low", ".1f"),
+    ("fps_0_1_low", "0.1% Low", ".1f"),
+    ("frame_time_p50", "P50 ms", ".2f"),
+    ("frame_time_p99", "P99 ms", ".2f"),
+    ("stutters", "Stutters", "d"),
+    ("frame_time_stddev", "Stddev ms", ".2f"),
+    ("frame_time_jitter", "Jitter ms", ".2f"),
+)
+
+
+def _format_row(stats: dict) -> list:
+    return [
+        "-" if stats[key] is None else format(stats[key], spec)
+        for key, _, spec in _COLUMNS
+    ]
+
+
+def _print_report(report: dict, processes: list):
+    headers = [title for _, title, _ in _COLUMNS]
+    print(
+        tabulate.tabulate(
+            [[name, *_format_row(report["processes"][name])] for name in processes],
+            headers=["Process", *headers],
+            disable_numparse=True,
+        )
+    )
+    for name in processes:
+        print(f"\n{name}, every {report['interval']:g} s:")
+        print(
+            tabulate.tabulate(
+                [
+                    [format(stats["start"], "g"), *_format_row(stats)]
+                    for stats in report["intervals"][name]
+                ],
+                headers=["Start s", *headers],
+                disable_numparse=True,
+            )
+        )
+
+
+if __name__ == "__main__":
+    arguments = argparse.ArgumentParser(
+        prog="python -m performance_monitor.analyze",
+        description="Frame time statistics of PresentMon CSV captures.",
+    )
+    arguments.add_argument("files", type=str, nargs="+", metavar="FILE")
+    arguments.add_argument("--interval", type=float, default=60.0)
+    arguments.add_argument("--stutter-ratio", type=float, default=2.0)
+    arguments.add_argument(
+        "--process", type=str, action="append", default=None, metavar="NAME"
+    )
+    arguments.add_argument("--block-size", type=int, default=1 << 20)
+    arguments.add_argument("--json", action="store_true", default=False)
+    args = arguments.parse_args()
+
+    for path in args.files:
+        start = time.perf_counter()
+        analyzer = FrameTimeAnalyzer(
+            interval=args.interval, stutter_ratio=args.stutter_ratio
+        )
+        analyzer.analyze_file(path, block_size=args.block_size)
+        report = analyzer.report()
+        if args.process:
+            wanted = {name.lower() for name in args.process}
+            for key in ("processes", "intervals"):
+                report[key] = {
+                    name: value
+                    for name, value in report[key].items()
+                    if name in wanted
+                }
+        elapsed = time.perf_counter() - start
+
+        if args.json:
+            print(json.dumps({"file": path, **report}))
+            continue
+        # the busiest process first
+        processes = sorted(
+            report["processes"],
+            key=lambda name: report["processes"][name]["frames"],
+            reverse=True,
+        )
+        frames = sum(item["frames"] for item in report["processes"].values())
+        print(f"{path}: {frames} frames analyzed in {elapsed:.2f} s\n")
+        _print_report(report, processes)
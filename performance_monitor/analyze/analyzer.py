@@ -0,0 +1,370 @@
+import math
+from array import array
+from typing import Dict, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError as error:
+    raise ImportError(
+        "The frame time analyzer needs NumPy, "
+        "install it with: pip install performance_monitor[analyze]"
+    ) from error
+
+from ..info_getter.frame_stats import (
+    BUCKET_COUNT,
+    FrameStats,
+    FrameTimeHistogram,
+    bucket_starts,
+)
+from ..info_getter.present_mon import PresentMonParser
+
+_COMMA = ord(",")
+_NEWLINE = ord("\n")
+_DOT = ord(".")
+_MINUS = ord("-")
+_ZERO = ord("0")
+
+# decimals beyond this many digits do not fit the int64 mantissa
+_MAX_DIGITS = 18
+_POWERS = 10.0 ** np.arange(_MAX_DIGITS + 1)
+
+
+def _gather(
+    data: np.ndarray, starts: np.ndarray, lengths: np.ndarray, width: int
+) -> np.ndarray:
+    # the bytes of every field padded with zeros to the same width, one column
+    # each, so a position of all the fields is one contiguous row
+    offsets = np.arange(width)[:, None]
+    positions = np.minimum(starts + offsets, len(data) - 1)
+    return np.where(offsets < lengths, data[positions], 0).astype(np.uint8)
+
+
+def _parse_numbers(
+    data: np.ndarray, starts: np.ndarray, lengths: np.ndarray
+) -> np.ndarray:
+    # plain decimals like -12.345 are converted without a Python loop over the
+    # fields: the digits form an int64 mantissa divided by a power of ten,
+    # which rounds exactly like float(); anything else, e.g. NA, becomes NaN
+    width = int(lengths.max()) if len(lengths) else 0
+    if width == 0:
+        return np.full(len(starts), np.nan)
+    chars = _gather(data, starts, lengths, width)
+    # padding and other characters wrap around to large values
+    values = chars - np.uint8(_ZERO)
+    digits = values <= 9
+    dots = chars == _DOT
+    negative = chars[0] == _MINUS
+
+    other = (chars != 0) & ~digits & ~dots
+    other[0] &= ~negative
+    digit_counts = digits.sum(axis=0)
+    valid = (
+        ~other.any(axis=0)
+        & (dots.sum(axis=0) <= 1)
+        & (digit_counts > 0)
+        & (digit_counts <= _MAX_DIGITS)
+    )
+
+    mantissa = np.zeros(len(starts), dtype=np.int64)
+    decimals = np.zeros(len(starts), dtype=np.int64)
+    after_dot = np.zeros(len(starts), dtype=bool)
+    for position in range(width):
+        digit = digits[position]
+        mantissa = np.where(digit, mantissa * 10 + values[position], mantissa)
+        decimals += digit & after_dot
+        after_dot |= dots[position]
+
+    result = mantissa / _POWERS[np.minimum(decimals, _MAX_DIGITS)]
+    np.negative(result, out=result, where=negative)
+    result[~valid] = np.nan
+    return result
+
+
+def _parse_names(data: np.ndarray, starts: np.ndarray, lengths: np.ndarray):
+    width = max(int(lengths.max()) if len(lengths) else 0, 1)
+    chars = _gather(data, starts, lengths, width)
+    return np.ascontiguousarray(chars.T).view(f"S{width}").ravel()
+
+
+class _FrameAccumulator:
+    # the frames of one process or interval: a histogram over the buckets of
+    # the live collector, so lows and quantiles are computed the same way, and
+    # mergeable moments for the frame pacing
+
+    __slots__ = (
+        "counts",
+        "frames",
+        "total",
+        "mean",
+        "m2",
+        "jitter_sum",
+        "jitter_count",
+    )
+
+    counts: np.ndarray
+    frames: int
+    total: float
+    mean: float
+    # sum of squared deviations from the mean
+    m2: float
+    # sum of squared differences of successive frame times
+    jitter_sum: float
+    jitter_count: int
+
+    def __init__(self):
+        self.counts = np.zeros(BUCKET_COUNT, dtype=np.int64)
+        self.frames = 0
+        self.total = 0.0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.jitter_sum = 0.0
+        self.jitter_count = 0
+
+    def add(
+        self,
+        counts: np.ndarray,
+        frames: int,
+        total: float,
+        m2: float,
+        jitter_sum: float,
+        jitter_count: int,
+    ):
+        if frames <= 0:
+            return
+        mean = total / frames
+        combined = self.frames + frames
+        delta = mean - self.mean
+        self.m2 += m2 + delta * delta * self.frames * frames / combined
+        self.mean += delta * frames / combined
+        self.counts += counts
+        self.frames = combined
+        self.total += total
+        self.jitter_sum += jitter_sum
+        self.jitter_count += jitter_count
+
+    def stats(self, stutter_ratio: float) -> Optional[FrameStats]:
+        histogram = FrameTimeHistogram()
+        histogram.counts = array("q", self.counts.tolist())
+        histogram.count = self.frames
+        histogram.total = self.total
+        return histogram.stats(stutter_ratio)
+
+    def stddev(self) -> float:
+        return math.sqrt(self.m2 / self.frames) if self.frames else 0.0
+
+    def jitter(self) -> float:
+        # root mean square of the change from one frame time to the next
+        if not self.jitter_count:
+            return 0.0
+        return math.sqrt(self.jitter_sum / self.jitter_count)
+
+    def as_dict(self, stutter_ratio: float) -> Dict[str, float]:
+        stats = self.stats(stutter_ratio)
+        return {
+            "frames": self.frames,
+            "seconds": self.total / 1000,
+            "fps": stats.fps if stats else None,
+            "fps_1_low": stats.fps_1_low if stats else None,
+            "fps_0_1_low": stats.fps_0_1_low if stats else None,
+            "frame_time_p50": stats.frame_time_p50 if stats else None,
+            "frame_time_p99": stats.frame_time_p99 if stats else None,
+            "stutters": stats.stutters if stats else 0,
+            "frame_time_stddev": self.stddev(),
+            "frame_time_jitter": self.jitter(),
+        }
+
+
+class FrameTimeAnalyzer:
+    # statistics of a PresentMon capture of any size: the file is fed in
+    # blocks, only the process, time and frame time columns are converted, in
+    # bulk with NumPy, and frames are folded into per process and per interval
+    # accumulators, so memory depends on the processes and the length of the
+    # capture but not on its frame count
+
+    # seconds of an interval of the time breakdown
+    interval: float
+    # a frame this many times slower than the median counts as a stutter
+    stutter_ratio: float
+
+    processes: Dict[str, _FrameAccumulator]
+    intervals: Dict[str, Dict[int, _FrameAccumulator]]
+
+    _parser: PresentMonParser
+    _bucket_starts: np.ndarray
+    # last frame time per process, for the jitter across blocks
+    _last_frame_times: Dict[str, float]
+    # seconds presented so far per process, when the capture has no time column
+    _clocks: Dict[str, float]
+
+    def __init__(self, interval: float = 60.0, stutter_ratio: float = 2.0):
+        if interval <= 0:
+            raise ValueError("Analyzer interval must be positive")
+        self.interval = interval
+        self.stutter_ratio = stutter_ratio
+        self.processes = {}
+        self.intervals = {}
+        self._parser = PresentMonParser()
+        self._bucket_starts = np.array(bucket_starts())
+        self._last_frame_times = {}
+        self._clocks = {}
+
+    def _columns(
+        self, body: bytes
+    ) -> Tuple[np.ndarray, np.ndarray, Optional[np.ndarray]]:
+        parser = self._parser
+        if parser.process_column is None:
+            raise RuntimeError("Cannot find process column in PresentMon output")
+        column_count = parser.column_count
+        data = np.frombuffer(body, dtype=np.uint8)
+        newlines = data == _NEWLINE
+        delimiters = np.flatnonzero((data == _COMMA) | newlines)
+        rows = np.count_nonzero(newlines)
+        if len(delimiters) != rows * column_count or not newlines[
+            delimiters[column_count - 1 :: column_count]
+        ].all():
+            # rows of an unexpected width are dropped
+            lines = [
+                line
+                for line in body.split(b"\n")
+                if line.count(b",") == column_count - 1
+            ]
+            if not lines:
+                return np.empty(0), np.empty(0), None
+            return self._columns(b"\n".join(lines) + b"\n")
+
+        # a field ends at a delimiter and starts after the one before it
+        bounds = np.concatenate(([-1], delimiters))
+
+        def field(column: int) -> Tuple[np.ndarray, np.ndarray]:
+            starts = bounds[column : -1 : column_count] + 1
+            ends = bounds[column + 1 :: column_count]
+            return starts, ends - starts
+
+        frame_times = _parse_numbers(data, *field(parser.column))
+        names = _parse_names(data, *field(parser.process_column))
+        times = None
+        if parser.time_column is not None:
+            times = _parse_numbers(data, *field(parser.time_column))
+        return frame_times, names, times
+
+    def feed(self, chunk: bytes):
+        body = self._parser.take_rows(chunk)
+        if not body:
+            return
+        frame_times, names, times = self._columns(body)
+        valid = frame_times >= 0
+        if times is not None:
+            valid &= ~np.isnan(times)
+        if not valid.all():
+            frame_times = frame_times[valid]
+            names = names[valid]
+            times = times[valid] if times is not None else None
+        if not len(frame_times):
+            return
+
+        buckets = np.searchsorted(self._bucket_starts, frame_times, side="right") - 1
+        np.maximum(buckets, 0, out=buckets)
+
+        # rows of one process are taken together in their original order
+        raw_names, inverse = np.unique(names, return_inverse=True)
+        order = np.argsort(inverse, kind="stable")
+        ends = np.cumsum(np.bincount(inverse, minlength=len(raw_names)))
+        start = 0
+        for raw_name, end in zip(raw_names, ends):
+            rows = order[start:end]
+            start = end
+            name = raw_name.decode("utf-8", errors="ignore").strip().lower()
+            self._add_process(
+                name,
+                frame_times[rows],
+                buckets[rows],
+                times[rows] if times is not None else None,
+            )
+
+    def _add_process(
+        self,
+        name: str,
+        frame_times: np.ndarray,
+        buckets: np.ndarray,
+        times: Optional[np.ndarray],
+    ):
+        if times is None:
+            times = self._clocks.get(name, 0.0) + np.cumsum(frame_times) / 1000
+            self._clocks[name] = float(times[-1])
+
+        previous = self._last_frame_times.get(name)
+        self._last_frame_times[name] = float(frame_times[-1])
+        steps = np.diff(
+            frame_times, prepend=frame_times[0] if previous is None else previous
+        )
+        jitter_weights = np.ones(len(frame_times))
+        if previous is None:
+            # the first frame of a process has nothing to differ from
+            jitter_weights[0] = 0.0
+
+        interval_ids, groups = np.unique(
+            np.floor(times / self.interval).astype(np.int64), return_inverse=True
+        )
+        group_count = len(interval_ids)
+        frames = np.bincount(groups, minlength=group_count)
+        totals = np.bincount(groups, weights=frame_times, minlength=group_count)
+        deviations = frame_times - (totals / frames)[groups]
+        m2s = np.bincount(
+            groups, weights=deviations * deviations, minlength=group_count
+        )
+        jitter_sums = np.bincount(groups, weights=steps * steps, minlength=group_count)
+        jitter_counts = np.bincount(
+            groups, weights=jitter_weights, minlength=group_count
+        )
+        counts = np.bincount(
+            groups * BUCKET_COUNT + buckets, minlength=group_count * BUCKET_COUNT
+        ).reshape(group_count, BUCKET_COUNT)
+
+        process = self.processes.get(name)
+        if process is None:
+            process = self.processes[name] = _FrameAccumulator()
+        process_intervals = self.intervals.setdefault(name, {})
+        for group, interval_id in enumerate(interval_ids.tolist()):
+            accumulator = process_intervals.get(interval_id)
+            if accumulator is None:
+                accumulator = process_intervals[interval_id] = _FrameAccumulator()
+            partial = (
+                counts[group],
+                int(frames[group]),
+                float(totals[group]),
+                float(m2s[group]),
+                float(jitter_sums[group]),
+                int(jitter_counts[group]),
+            )
+            accumulator.add(*partial)
+            process.add(*partial)
+
+    def analyze_file(self, path: str, block_size: int = 1 << 20):
+        with open(path, "rb") as file:
+            while True:
+                chunk = file.read(block_size)
+                if not chunk:
+                    break
+                self.feed(chunk)
+        # a last row without a line break
+        self.feed(b"\n")
+
+    def report(self) -> Dict[str, Dict]:
+        stutter_ratio = self.stutter_ratio
+        return {
+            "interval": self.interval,
+            "processes": {
+                name: accumulator.as_dict(stutter_ratio)
+                for name, accumulator in self.processes.items()
+            },
+            "intervals": {
+                name: [
+                    {
+                        "start": interval_id * self.interval,
+                        **accumulator.as_dict(stutter_ratio),
+                    }
+                    for interval_id, accumulator in sorted(process_intervals.items())
+                ]
+                for name, process_intervals in self.intervals.items()
+            },
+        }
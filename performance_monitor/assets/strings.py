@@ -4,6 +4,7 @@ outline_name = "Outline"
 time = "Time"
 total_power = "Total Power"
 fps = "FPS (1%Low)"
+update_time = "Update (Speedup)"
 
 cpu_usage = "Usage"
 cpu_max_thread_usage = "Max Usage"
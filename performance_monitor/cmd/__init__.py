@@ -1 +1,7 @@
-import performance_monitor.cmd.combiner
+import importlib
+
+
+def __getattr__(name: str):
+    if name not in ("combiner", "layout", "runner", "screen", "settings", "tools"):
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return importlib.import_module(f"{__name__}.{name}")
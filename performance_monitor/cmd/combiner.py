@@ -1,47 +1,75 @@
 from datetime import datetime
 import time
-from typing import Optional, Tuple, List
+from typing import TYPE_CHECKING, Dict, Optional, Tuple, List
 
 from . import settings, tools
 from ..assets import strings
 from ..info_getter import (
-    TimeInformation,
-    CpuInformation,
-    GeneralGpuInformation,
-    NvidiaGpuInformation,
-    MemoryInformation,
-    NetworkInformation,
-    FrameTimeInformation,
+    GETTER_NAMES,
     Combiner as BaseCombiner,
+    Replay,
+    default_backend,
+    get_getters_dict,
 )
 
+if TYPE_CHECKING:
+    from ..info_getter import (
+        TimeInformation,
+        CpuInformation,
+        GeneralGpuInformation,
+        NvidiaGpuInformation,
+        MemoryInformation,
+        NetworkInformation,
+        FrameTimeInformation,
+    )
+
 
 class Combiner(BaseCombiner):
-    time: TimeInformation
-    cpu: CpuInformation
-    gpu: Optional[GeneralGpuInformation]
-    nv_gpu: Optional[NvidiaGpuInformation]
-    memory: MemoryInformation
-    network: NetworkInformation
-    frame_time: FrameTimeInformation
+    # the getters come from a backend, these are the fields the dashboard reads
+    time: "TimeInformation"
+    cpu: "CpuInformation"
+    gpu: Optional["GeneralGpuInformation"]
+    nv_gpu: Optional["NvidiaGpuInformation"]
+    memory: "MemoryInformation"
+    network: "NetworkInformation"
+    frame_time: Optional["FrameTimeInformation"]
 
     def __init__(
         self,
         general_gpu_enable: bool = True,
         nv_gpu_enable: bool = True,
+        update_intervals: Optional[Dict[str, float]] = None,
+        update_workers: int = 0,
+        update_timeout: Optional[float] = None,
+        show_update_stats: bool = False,
+        replay: Optional[Replay] = None,
+        backend: Optional[str] = None,
+        backend_options: Optional[Dict[str, str]] = None,
     ):
+        backend = backend or default_backend()
+        disabled = [
+            name
+            for name, enable in (("gpu", general_gpu_enable), ("nv_gpu", nv_gpu_enable))
+            if not enable
+        ]
         super().__init__(
-            getters_dict={
-                "time": TimeInformation,
-                "cpu": CpuInformation,
-                "gpu": GeneralGpuInformation if general_gpu_enable else None,
-                "nv_gpu": NvidiaGpuInformation if nv_gpu_enable else None,
-                "memory": MemoryInformation,
-                "network": NetworkInformation,
-                "frame_time": FrameTimeInformation,
-            }
+            # a replay brings its own getters, no backend is loaded for it
+            getters_dict=(
+                dict.fromkeys(GETTER_NAMES)
+                if replay is not None
+                else get_getters_dict(
+                    backend, GETTER_NAMES, options=backend_options, disabled=disabled
+                )
+            ),
+            update_intervals=update_intervals,
+            update_workers=update_workers,
+            update_timeout=update_timeout,
+            replay=replay,
         )
-        time.sleep(2)
+        self.show_update_stats = show_update_stats
+        if replay is None and backend != "synthetic":
+            # let the hardware sensors settle before the first frame
+            time.sleep(2)
 
     def _get_total_power(self) -> float:
         return (
@@ -51,14 +79,29 @@ class Combiner(BaseCombiner):
         )
 
     def _get_fps_str(self) -> str:
-        if self.frame_time.fps is None or self.frame_time.fps_1_low is None:
+        if (
+            self.frame_time is None
+            or self.frame_time.fps is None
+            or self.frame_time.fps_1_low is None
+        ):
             fps = strings.error_value
         else:
             fps = f"{self.frame_time.fps}({self.frame_time.fps_1_low})"
         return fps
 
+    def _get_update_stats_str(self) -> str:
+        return tools.get_pair_display(
+            f"{self.update_stats.tick_time * 1000:.0f}ms",
+            f"x{self.update_stats.speedup:.1f}",
+        )
+
     def outline_info(self) -> Tuple[str, List[Tuple[str, str]]]:
         time_datetime = datetime.fromtimestamp(self.time.time)
+        update_stats_rows = (
+            [tools.get_tuple(strings.update_time, self._get_update_stats_str())]
+            if self.show_update_stats
+            else []
+        )
         return strings.outline_name, tools.get_table(
             [
                 tools.get_tuple(
@@ -76,7 +119,7 @@ class Combiner(BaseCombiner):
                         self._get_fps_str(),
                         (
                             self.frame_time.target_process
-                            if self.frame_time.target_process
+                            if self.frame_time and self.frame_time.target_process
                             else "UNKNOWN"
                         ),
                         sep="@ ",
@@ -92,6 +135,7 @@ class Combiner(BaseCombiner):
                         highest=180,
                     ),
                 ),
+                *update_stats_rows,
             ]
         )
 
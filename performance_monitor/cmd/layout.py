@@ -0,0 +1,107 @@
+import re
+from functools import lru_cache
+from typing import Dict, List, Sequence, Tuple
+
+from wcwidth import wcwidth
+
+_ANSI_ESCAPE_RE = re.compile(r"\x1b\[[0-9;]*m")
+
+
+@lru_cache(maxsize=1024)
+def _char_width(ch: str) -> int:
+    return max(0, wcwidth(ch))
+
+
+@lru_cache(maxsize=4096)
+def _wide_text_width(s: str) -> int:
+    # the same bars and blocks come back on every tick
+    return sum(map(_char_width, s))
+
+
+def text_width(s: str) -> int:
+    # display width of a string without escapes
+    if s.isascii() and s.isprintable():
+        return len(s)
+    return _wide_text_width(s)
+
+
+def display_width(s: str) -> int:
+    if "\x1b" in s:
+        s = _ANSI_ESCAPE_RE.sub("", s)
+    return text_width(s)
+
+
+def _center(s: str, width: int) -> str:
+    pad = max(0, width - display_width(s))
+    return " " * (pad // 2) + s + " " * (pad - pad // 2)
+
+
+class TableLayout:
+    # the two column tables of the dashboard in the layout of tabulate's
+    # "pretty" format for one terminal size: borders and key cells are built
+    # once, a tick only puts the value lines into their slots
+
+    key_width: int
+    value_width: int
+    border: str
+
+    # the "| key |" start of a row for every key cell seen, "" for a key cell
+    # that does not fill its slot
+    _row_starts: Dict[str, str]
+    _blank_row_start: str
+
+    def __init__(self, key_width: int, value_width: int):
+        self.key_width = key_width
+        self.value_width = value_width
+        self.border = f"+{'-' * (key_width + 2)}+{'-' * (value_width + 2)}+"
+        self._row_starts = {}
+        self._blank_row_start = f"| {' ' * key_width} |"
+
+    def _row_start(self, key: str) -> str:
+        row_start = self._row_starts.get(key)
+        if row_start is None:
+            fits = "\n" not in key and display_width(key) == self.key_width
+            row_start = self._row_starts[key] = f"| {key} |" if fits else ""
+        return row_start
+
+    def render(self, rows: Sequence[Tuple[str, str]]) -> str:
+        value_width = self.value_width
+        lines = [self.border]
+        for key, value in rows:
+            row_start = self._row_start(key)
+            if not row_start:
+                return self._render_measured(rows)
+            value_lines = value.split("\n") if "\n" in value else (value,)
+            for value_line in value_lines:
+                if display_width(value_line) != value_width:
+                    # a value that does not fill its slot exactly
+                    return self._render_measured(rows)
+                lines.append(f"{row_start} {value_line} |")
+                row_start = self._blank_row_start
+        lines.append(self.border)
+        return "\n".join(lines)
+
+    def _render_measured(self, rows: Sequence[Tuple[str, str]]) -> str:
+        # columns as wide as their widest cell and cells centered in them, as
+        # tabulate does when the cells were not padded to the slot widths
+        cells: List[Tuple[List[str], List[str]]] = [
+            (key.split("\n"), value.split("\n")) for key, value in rows
+        ]
+        key_width = max(
+            (display_width(line) for keys, _ in cells for line in keys), default=0
+        )
+        value_width = max(
+            (display_width(line) for _, values in cells for line in values),
+            default=0,
+        )
+        border = f"+{'-' * (key_width + 2)}+{'-' * (value_width + 2)}+"
+        lines = [border]
+        for keys, values in cells:
+            for index in range(max(len(keys), len(values))):
+                key = keys[index] if index < len(keys) else ""
+                value = values[index] if index < len(values) else ""
+                lines.append(
+                    f"| {_center(key, key_width)} | {_center(value, value_width)} |"
+                )
+        lines.append(border)
+        return "\n".join(lines)
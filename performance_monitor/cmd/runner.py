@@ -7,12 +7,35 @@ import argparse
 from performance_monitor import __version__
 from . import tools, settings
 from .combiner import Combiner
+from ..info_getter import (
+    RecordWriter,
+    Replay,
+    default_backend,
+    get_backend_names,
+    parse_backend_options,
+    parse_update_intervals,
+)
 
 if __name__ == "__main__":
     arguments = argparse.ArgumentParser()
     arguments.add_argument("-ft", "--flush_time", type=float, default=0.8)
     arguments.add_argument("--exclude-general-gpu", action="store_true", default=False)
     arguments.add_argument("--exclude-nvidia-gpu", action="store_true", default=False)
+    arguments.add_argument(
+        "--update-interval", type=str, action="append", metavar="NAME=SECONDS"
+    )
+    arguments.add_argument("--update-workers", type=int, default=0)
+    arguments.add_argument("--update-timeout", type=float, default=None)
+    arguments.add_argument("--show-update-stats", action="store_true", default=False)
+    arguments.add_argument("--record", type=str, default=None, metavar="FILE")
+    arguments.add_argument("--replay", type=str, default=None, metavar="FILE")
+    arguments.add_argument("--speed", type=float, default=1.0)
+    arguments.add_argument(
+        "--backend", type=str, choices=get_backend_names(), default=default_backend()
+    )
+    arguments.add_argument(
+        "--backend-option", type=str, action="append", metavar="KEY=VALUE"
+    )
     args = arguments.parse_args()
 
     print(f"Package: performance_monitor-{__version__}")
@@ -23,9 +46,21 @@ if __name__ == "__main__":
     combiner = Combiner(
         general_gpu_enable=not args.exclude_general_gpu,
         nv_gpu_enable=not args.exclude_nvidia_gpu,
+        update_intervals=parse_update_intervals(args.update_interval),
+        update_workers=args.update_workers,
+        update_timeout=args.update_timeout,
+        show_update_stats=args.show_update_stats,
+        replay=Replay(args.replay, speed=args.speed) if args.replay else None,
+        backend=args.backend,
+        backend_options=parse_backend_options(args.backend_option),
     )
 
-    # close all after unexpected exit
+    # close all after unexpected exit; handlers run in reverse, so the
+    # recording is closed after the combiner's last tick
+    if args.record:
+        recorder = RecordWriter(args.record)
+        combiner.add_sink(recorder)
+        atexit.register(recorder.close)
     atexit.register(combiner.dispose)
 
     print("\033[?25l")
@@ -0,0 +1,113 @@
+import re
+import sys
+from typing import BinaryIO, List, Optional, TextIO, Tuple
+
+from .layout import text_width
+
+_ESCAPE_RE = re.compile(r"\x1b\[[0-9;?]*[A-Za-z]")
+# escapes after which the text is drawn in the default style again
+_STYLE_RESETS = ("\x1b[0m", "\x1b[m")
+
+
+def _common_prefix_length(a: str, b: str) -> int:
+    # a binary search over slice comparisons, each of them runs in C
+    low, high = 0, min(len(a), len(b))
+    while low < high:
+        middle = (low + high + 1) // 2
+        if a[:middle] == b[:middle]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+def _find_cut(old: str, new: str) -> Tuple[int, int]:
+    # the index from which new has to be written over old, and the column it
+    # starts at; it never splits an escape and never starts inside a style,
+    # so the written part looks the same as in a full redraw
+    same = _common_prefix_length(old, new)
+    cut = column = cut_column = position = 0
+    styled = False
+    for match in _ESCAPE_RE.finditer(new):
+        start = min(match.start(), same)
+        if not styled:
+            cut, cut_column = start, column + text_width(new[position:start])
+        if match.end() > same:
+            return cut, cut_column
+        column += text_width(new[position : match.start()])
+        styled = match.group() not in _STYLE_RESETS
+        position = match.end()
+    if not styled:
+        cut, cut_column = same, column + text_width(new[position:same])
+    return cut, cut_column
+
+
+class Screen:
+    # the frame shown on the terminal: drawing a new frame moves the cursor to
+    # the lines that changed and rewrites them from their first changed cell,
+    # all of it in a single write
+
+    lines: List[str]
+    # display width of every line in lines
+    widths: List[int]
+
+    _stream: TextIO
+    _output: Optional[BinaryIO]
+    _erase: bool
+
+    def __init__(self, stream: Optional[TextIO] = None):
+        self._stream = stream or sys.stdout
+        self._output = getattr(self._stream, "buffer", None)
+        self.lines = []
+        self.widths = []
+        self._erase = False
+
+    def clear(self):
+        # erase the terminal with the next frame, which is then drawn in full
+        self.lines = []
+        self.widths = []
+        self._erase = True
+
+    def render(self, lines: List[str]) -> str:
+        previous = self.lines
+        previous_widths = self.widths
+        out = ["\x1b[2J"] if self._erase else []
+        widths = []
+        for row, line in enumerate(lines):
+            if row < len(previous) and previous[row] == line:
+                widths.append(previous_widths[row])
+                continue
+            width = text_width(_ESCAPE_RE.sub("", line))
+            widths.append(width)
+            if row >= len(previous):
+                out.append(f"\x1b[{row + 1};1H{line}")
+                continue
+            cut, column = _find_cut(previous[row], line)
+            out.append(f"\x1b[{row + 1};{column + 1}H{line[cut:]}")
+            if width < previous_widths[row]:
+                # the rest of a longer old line
+                out.append("\x1b[K")
+        for row in range(len(lines), len(previous)):
+            out.append(f"\x1b[{row + 1};1H\x1b[K")
+
+        self.lines = list(lines)
+        self.widths = widths
+        self._erase = False
+        return "".join(out)
+
+    def draw(self, lines: List[str]) -> int:
+        # returns the bytes written to the terminal
+        out = self.render(lines)
+        if not out:
+            return 0
+        stream = self._stream
+        if self._output is None:
+            stream.write(out)
+            stream.flush()
+            return len(out.encode(stream.encoding or "utf-8", errors="replace"))
+        data = out.encode(stream.encoding or "utf-8", errors="replace")
+        # whatever was printed before goes out first
+        stream.flush()
+        self._output.write(data)
+        self._output.flush()
+        return len(data)
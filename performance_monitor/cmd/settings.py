@@ -21,7 +21,6 @@ usage_display = [" ", "▏", "▎", "▎", "▌", "▋", "▊", "▉", "█"]
 
 time_fmt = "%Y/%m/%d %H:%M:%S"
 
-tabulate_table_style = "pretty"
 k_base = 1024
 byte2mb = k_base * k_base
 byte2kb = k_base
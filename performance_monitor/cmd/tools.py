@@ -1,25 +1,19 @@
 import os
 from collections import defaultdict
+from functools import lru_cache
 from typing import List, Optional, Tuple
-import tabulate
 import math
-import re
 from wcwidth import wcwidth
 
 from . import settings
-
-tabulate.PRESERVE_WHITESPACE = True
-
-_ANSI_ESCAPE_RE = re.compile(r"\x1b\[[0-9;]*m")
+from ..info_getter import hardware
+from .layout import TableLayout, display_width
+from .screen import Screen
 
 
 def get_display_width(s: str):
-    plain = _ANSI_ESCAPE_RE.sub("", s)
-    width = 0
-    for ch in plain:
-        w = wcwidth(ch)
-        width += 0 if w < 0 else w
-    return width
+    # printable ASCII is measured by its length, other text once per string
+    return display_width(s)
 
 
 def ljust_display(s: str, target_width: int):
@@ -45,8 +39,22 @@ def get_title(s: str):
     return settings.colors.title + ljust_display(title, width) + settings.colors.END
 
 
+def get_layout() -> TableLayout:
+    # rebuilt with the borders of a new terminal size after settings.reset
+    layout = getattr(get_layout, "layout", None)
+    if (
+        layout is None
+        or layout.key_width != settings.max_key_len
+        or layout.value_width != settings.max_val_len
+    ):
+        layout = get_layout.layout = TableLayout(
+            settings.max_key_len, settings.max_val_len
+        )
+    return layout
+
+
 def get_table(info_list: List):
-    return tabulate.tabulate(info_list, tablefmt=settings.tabulate_table_style)
+    return get_layout().render(info_list)
 
 
 def get_sum(values: List) -> float:
@@ -251,10 +259,16 @@ def get_byte_speed_display(byte_amount: float):
     return f"{speed:.2f}{settings.byte_speed_postfixes[-1]}"
 
 
-def get_key_string(_key: str, clip_key: bool = True):
+@lru_cache(maxsize=256)
+def _get_key_string(_key: str, clip_key: bool, max_key_len: int):
     if clip_key:
-        _key = get_clipped_string(_key, settings.max_key_len)
-    return ljust_display(_key, settings.max_key_len)
+        _key = get_clipped_string(_key, max_key_len)
+    return ljust_display(_key, max_key_len)
+
+
+def get_key_string(_key: str, clip_key: bool = True):
+    # keys never change, they are clipped and padded once per terminal size
+    return _get_key_string(_key, clip_key, settings.max_key_len)
 
 
 def get_val_string(_val: str, clip_val: bool = True):
@@ -274,6 +288,8 @@ def info_display(info: List[Tuple[str, List[Tuple[str, str]]]]) -> bool:
     if not hasattr(info_display, "pre_terminal_col_size"):
         info_display.pre_terminal_col_size = 0
         info_display.pre_terminal_row_size = 0
+        info_display.screen = Screen()
+        info_display.report_count = hardware.report_count
 
     # if terminal size changed, we will reset the settings and clear the screen to avoid display issues
     cur_terminal_col_size = os.get_terminal_size().columns
@@ -285,9 +301,14 @@ def info_display(info: List[Tuple[str, List[Tuple[str, str]]]]) -> bool:
         info_display.pre_terminal_col_size = cur_terminal_col_size
         info_display.pre_terminal_row_size = cur_terminal_row_size
         settings.reset(cur_terminal_col_size)
-        os.system("cls")
+        info_display.screen.clear()
         return False
 
+    if info_display.report_count != hardware.report_count:
+        # a message was printed over the last frame, this one is drawn in full
+        info_display.report_count = hardware.report_count
+        info_display.screen.clear()
+
     out = list(f"{get_title(group)}\n{tables}" for group, tables in info)
 
     group_lines = [item.count("\n") + 1 for item in out]
@@ -306,6 +327,6 @@ def info_display(info: List[Tuple[str, List[Tuple[str, str]]]]) -> bool:
             )
         )
 
-    print("\x1b[0;0H", end="")
-    print("\n".join(out), end="")
+    # only the cells that changed since the last frame are written
+    info_display.screen.draw("\n".join(out).split("\n"))
     return True
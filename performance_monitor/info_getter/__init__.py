@@ -1,9 +1,48 @@
-from performance_monitor.info_getter.hardware import GeneralHardware
-from performance_monitor.info_getter.cpu_info import CpuInformation
-from performance_monitor.info_getter.nv_gpu_info import NvidiaGpuInformation
-from performance_monitor.info_getter.general_gpu_info import GeneralGpuInformation
-from performance_monitor.info_getter.memory_info import MemoryInformation
-from performance_monitor.info_getter.net_info import NetworkInformation
-from performance_monitor.info_getter.time_info import TimeInformation
-from performance_monitor.info_getter.frame_time_info import FrameTimeInformation
-from performance_monitor.info_getter.info_combiner import Combiner
+import importlib
+
+from performance_monitor.info_getter.hardware import (
+    GeneralHardware,
+    SensorLayout,
+    SensorRecord,
+    json_default,
+    new_buffer,
+    report,
+)
+from performance_monitor.info_getter.history import HistoryStore
+from performance_monitor.info_getter.rollup import RollupStore, parse_rollup_tiers
+from performance_monitor.info_getter.record import RecordWriter, Replay, read_records
+from performance_monitor.info_getter.backend import (
+    GETTER_NAMES,
+    default_backend,
+    get_backend_names,
+    get_getters_dict,
+    parse_backend_options,
+    register_backend,
+    resolve_getter,
+)
+from performance_monitor.info_getter.info_combiner import (
+    Combiner,
+    UpdateStats,
+    parse_update_intervals,
+)
+
+# getter modules pull in pythonnet, pynvml or psutil when imported,
+# so they are only loaded on first use of the class
+_lazy_getters = {
+    "CpuInformation": "performance_monitor.info_getter.cpu_info",
+    "NvidiaGpuInformation": "performance_monitor.info_getter.nv_gpu_info",
+    "GeneralGpuInformation": "performance_monitor.info_getter.general_gpu_info",
+    "MemoryInformation": "performance_monitor.info_getter.memory_info",
+    "NetworkInformation": "performance_monitor.info_getter.net_info",
+    "TimeInformation": "performance_monitor.info_getter.time_info",
+    "FrameTimeInformation": "performance_monitor.info_getter.frame_time_info",
+}
+
+
+def __getattr__(name: str):
+    module_name = _lazy_getters.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
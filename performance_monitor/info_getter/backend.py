@@ -0,0 +1,106 @@
+import importlib
+import sys
+from functools import partial
+from typing import Dict, List, Optional, Sequence, Type
+
+from .hardware import GeneralHardware
+
+# getter classes of every backend as "module:Class", a module is only imported
+# once a combiner asks for it, so the runtimes of other backends stay unloaded
+_backends: Dict[str, Dict[str, str]] = {}
+# in the order the combiners show them
+GETTER_NAMES = ("time", "cpu", "gpu", "nv_gpu", "memory", "network", "frame_time")
+_backend_options: Dict[str, bool] = {}
+
+
+def register_backend(name: str, getters: Dict[str, str], takes_options: bool = False):
+    _backends[name] = dict(getters)
+    _backend_options[name] = takes_options
+
+
+def get_backend_names() -> List[str]:
+    return list(_backends)
+
+
+def default_backend() -> str:
+    return "linux" if sys.platform.startswith("linux") else "windows"
+
+
+def parse_backend_options(items: Optional[List[str]]) -> Dict[str, str]:
+    # parses "key=value" items as given on the command line
+    options = {}
+    for item in items or []:
+        key, sep, value = item.partition("=")
+        if not sep or not key.strip():
+            raise ValueError(f"Invalid backend option: {item}, expected KEY=VALUE")
+        options[key.strip()] = value.strip()
+    return options
+
+
+def resolve_getter(backend: str, name: str) -> Optional[Type[GeneralHardware]]:
+    if backend not in _backends:
+        raise ValueError(f"Unknown backend: {backend}")
+    spec = _backends[backend].get(name)
+    if spec is None:
+        return None
+    module_name, _, cls_name = spec.partition(":")
+    return getattr(importlib.import_module(module_name), cls_name)
+
+
+def get_getters_dict(
+    backend: str,
+    names: Sequence[str],
+    options: Optional[Dict[str, str]] = None,
+    disabled: Sequence[str] = (),
+) -> Dict[str, Optional[Type[GeneralHardware]]]:
+    # getters the backend does not provide are disabled like excluded ones,
+    # backend options are handed to the constructor of every getter
+    if backend not in _backends:
+        raise ValueError(f"Unknown backend: {backend}")
+    if options and not _backend_options[backend]:
+        raise ValueError(f"The {backend} backend takes no options")
+
+    getters_dict = {}
+    for name in names:
+        getter_cls = None if name in disabled else resolve_getter(backend, name)
+        if getter_cls is not None and options:
+            getter_cls = partial(getter_cls, **options)
+        getters_dict[name] = getter_cls
+    return getters_dict
+
+
+register_backend(
+    "windows",
+    {
+        "time": "performance_monitor.info_getter.time_info:TimeInformation",
+        "cpu": "performance_monitor.info_getter.cpu_info:CpuInformation",
+        "gpu": "performance_monitor.info_getter.general_gpu_info:GeneralGpuInformation",
+        "nv_gpu": "performance_monitor.info_getter.nv_gpu_info:NvidiaGpuInformation",
+        "memory": "performance_monitor.info_getter.memory_info:MemoryInformation",
+        "network": "performance_monitor.info_getter.net_info:NetworkInformation",
+        "frame_time": "performance_monitor.info_getter.frame_time_info:FrameTimeInformation",
+    },
+)
+register_backend(
+    "linux",
+    {
+        "time": "performance_monitor.info_getter.time_info:TimeInformation",
+        "cpu": "performance_monitor.info_getter.linux_cpu_info:LinuxCpuInformation",
+        "gpu": "performance_monitor.info_getter.linux_gpu_info:LinuxGpuInformation",
+        "nv_gpu": "performance_monitor.info_getter.nv_gpu_info:NvidiaGpuInformation",
+        "memory": "performance_monitor.info_getter.linux_memory_info:LinuxMemoryInformation",
+        "network": "performance_monitor.info_getter.net_info:NetworkInformation",
+    },
+)
+register_backend(
+    "synthetic",
+    {
+        "time": "performance_monitor.info_getter.synthetic_info:SyntheticTimeInformation",
+        "cpu": "performance_monitor.info_getter.synthetic_info:SyntheticCpuInformation",
+        "gpu": "performance_monitor.info_getter.synthetic_info:SyntheticGpuInformation",
+        "memory": "performance_monitor.info_getter.synthetic_info:SyntheticMemoryInformation",
+        "network": "performance_monitor.info_getter.synthetic_info:SyntheticNetworkInformation",
+        "frame_time": "performance_monitor.info_getter.synthetic_info:SyntheticFrameTimeInformation",
+    },
+    takes_options=True,
+)
@@ -1,104 +1,141 @@
-import clr
+from array import array
 from typing import Annotated, List
 
-from ..third_party import LHM_dll_path
-from .hardware import GeneralHardware
+from .hardware import GeneralHardware, new_buffer
+from .lhm_session import Hardware, HardwareType, LhmSession, SensorType
 
-clr.AddReference(LHM_dll_path)
-from LibreHardwareMonitor import Hardware  # type: ignore
-from LibreHardwareMonitor.Hardware import HardwareType, SensorType  # type: ignore
+
+class _CpuSensorIndex:
+    # the sensors of one CPU sorted by the field they feed, so an update reads
+    # values only instead of crossing into .NET for every name and type
+
+    __slots__ = (
+        "sensor_count",
+        "temperature",
+        "clock",
+        "load",
+        "usage",
+        "voltage",
+        "power",
+    )
+
+    sensor_count: int
+    temperature: List[Hardware.ISensor]
+    clock: List[Hardware.ISensor]
+    load: List[Hardware.ISensor]
+    usage: List[Hardware.ISensor]
+    voltage: List[Hardware.ISensor]
+    power: List[Hardware.ISensor]
+
+    def __init__(self, hardware: Hardware.IHardware):
+        sensors = list(hardware.Sensors)
+        self.sensor_count = len(sensors)
+        temperature_read_from_core = []
+        temperature_read_from_other = []
+        self.clock = []
+        self.load = []
+        self.usage = []
+        self.voltage = []
+        self.power = []
+
+        for sensor in sensors:
+            sensor_name = str(sensor.Name).upper()
+            if sensor.SensorType == SensorType.Temperature:
+                if "TJMAX" not in sensor_name:
+                    if "#" in sensor_name:
+                        temperature_read_from_core.append(sensor)
+                    else:
+                        temperature_read_from_other.append(sensor)
+            elif sensor.SensorType == SensorType.Clock:
+                if "#" in sensor_name:
+                    self.clock.append(sensor)
+            elif sensor.SensorType == SensorType.Load:
+                if "#" in sensor_name:
+                    self.load.append(sensor)
+                elif "TOTAL" in sensor_name:
+                    self.usage.append(sensor)
+            elif sensor.SensorType == SensorType.Voltage:
+                if "#" in sensor_name:
+                    self.voltage.append(sensor)
+            elif sensor.SensorType == SensorType.Power:
+                if "PACKAGE" in sensor_name:
+                    self.power.append(sensor)
+
+        self.temperature = temperature_read_from_core or temperature_read_from_other
 
 
 class CpuInformation(GeneralHardware):
+    # reported for a sensor that has no reading
+    invalid_value: float = 65535.0
+
     cpu_count: Annotated[int, GeneralHardware.SensorValue]
     cpu_name: Annotated[List[str], GeneralHardware.SensorValue]
-    temperature: Annotated[List[List[float]], GeneralHardware.SensorValue]
-    clock: Annotated[List[List[float]], GeneralHardware.SensorValue]
-    usage: Annotated[List[List[float]], GeneralHardware.SensorValue]
-    load: Annotated[List[List[float]], GeneralHardware.SensorValue]
-    voltage: Annotated[List[List[float]], GeneralHardware.SensorValue]
-    power: Annotated[List[float], GeneralHardware.SensorValue]
+    temperature: Annotated[List[array], GeneralHardware.SensorValue]
+    clock: Annotated[List[array], GeneralHardware.SensorValue]
+    usage: Annotated[List[array], GeneralHardware.SensorValue]
+    load: Annotated[List[array], GeneralHardware.SensorValue]
+    voltage: Annotated[List[array], GeneralHardware.SensorValue]
+    power: Annotated[array, GeneralHardware.SensorValue]
 
+    _session: LhmSession
     _available_cpu: List[Hardware.IHardware]
+    _sensor_indexes: List[_CpuSensorIndex]
 
     def __init__(self):
-        self.clear()
-        self.computer = Hardware.Computer()
-        self.computer.IsCpuEnabled = True
-        self.computer.Open()
+        self._session = LhmSession.acquire("Cpu")
 
         print("CPU Initialization:")
         self.cpu_name = []
         self._available_cpu = []
-        for hardware in self.computer.Hardware:
-            if hardware.HardwareType == HardwareType.Cpu:
-                print(f"\tFound: {hardware.Name}")
-                self._available_cpu.append(hardware)
-                self.cpu_name.append(hardware.Name)
+        for hardware in self._session.get_hardware(HardwareType.Cpu):
+            print(f"\tFound: {hardware.Name}")
+            self._available_cpu.append(hardware)
+            self.cpu_name.append(hardware.Name)
         self.cpu_count = len(self._available_cpu)
+        self._sensor_indexes = [
+            _CpuSensorIndex(hardware) for hardware in self._available_cpu
+        ]
+        self.clear()
 
-    @staticmethod
-    def _get_value(value, invalid_value=65535.0) -> float:
-        return value if value is not None else invalid_value
+    def _fill(self, buffer: array, sensors: List[Hardware.ISensor]):
+        invalid_value = self.invalid_value
+        for position, sensor in enumerate(sensors):
+            value = sensor.Value
+            buffer[position] = value if value is not None else invalid_value
 
     def clear(self):
-        self.temperature = []
-        self.clock = []
-        self.usage = []
-        self.load = []
-        self.voltage = []
-        self.power = []
+        # buffers are sized by the sensors of every CPU and overwritten by updates
+        indexes = self._sensor_indexes
+        self.temperature = [new_buffer(len(index.temperature)) for index in indexes]
+        self.clock = [new_buffer(len(index.clock)) for index in indexes]
+        self.usage = [new_buffer(len(index.usage)) for index in indexes]
+        self.load = [new_buffer(len(index.load)) for index in indexes]
+        self.voltage = [new_buffer(len(index.voltage)) for index in indexes]
+        self.power = new_buffer(len(indexes))
 
     def update(self):
-        self.clear()
+        resized = False
+        for cpu_idx, hardware in enumerate(self._available_cpu):
+            self._session.update(hardware)
+            if len(hardware.Sensors) != self._sensor_indexes[cpu_idx].sensor_count:
+                # sensors come and go with drivers, sort them again
+                self._sensor_indexes[cpu_idx] = _CpuSensorIndex(hardware)
+                resized = True
+        if resized:
+            self.clear()
 
-        for hardware in self._available_cpu:
-            hardware.Update()
-
-            total_power = 0
-            temperature_read_from_core = []
-            temperature_read_from_other = []
-            clock = []
-            load = []
-            usage = []
-            voltage = []
-
-            for sensor in hardware.Sensors:
-                sensor_name = str(sensor.Name).upper()
-                if sensor.SensorType == SensorType.Temperature:
-                    if "TJMAX" not in sensor_name:
-                        if "#" in sensor_name:
-                            temperature_read_from_core.append(
-                                self._get_value(sensor.Value)
-                            )
-                        else:
-                            temperature_read_from_other.append(
-                                self._get_value(sensor.Value)
-                            )
-                elif sensor.SensorType == SensorType.Clock:
-                    if "#" in sensor_name:
-                        clock.append(self._get_value(sensor.Value))
-                elif sensor.SensorType == SensorType.Load:
-                    if "#" in sensor_name:
-                        load.append(self._get_value(sensor.Value))
-                    elif "TOTAL" in sensor_name:
-                        usage.append(self._get_value(sensor.Value))
-                elif sensor.SensorType == SensorType.Voltage:
-                    if "#" in sensor_name:
-                        voltage.append(self._get_value(sensor.Value))
-                elif sensor.SensorType == SensorType.Power:
-                    if "PACKAGE" in sensor_name:
-                        total_power += self._get_value(sensor.Value)
-
-            self.power.append(total_power)
-            if temperature_read_from_core:
-                self.temperature.append(temperature_read_from_core)
-            else:
-                self.temperature.append(temperature_read_from_other)
-            self.clock.append(clock)
-            self.load.append(load)
-            self.usage.append(usage)
-            self.voltage.append(voltage)
+        fill = self._fill
+        for cpu_idx, index in enumerate(self._sensor_indexes):
+            power = 0.0
+            for sensor in index.power:
+                value = sensor.Value
+                power += value if value is not None else self.invalid_value
+            self.power[cpu_idx] = power
+            fill(self.temperature[cpu_idx], index.temperature)
+            fill(self.clock[cpu_idx], index.clock)
+            fill(self.load[cpu_idx], index.load)
+            fill(self.usage[cpu_idx], index.usage)
+            fill(self.voltage[cpu_idx], index.voltage)
 
     def dispose(self):
-        self.computer.Close()
+        self._session.release("Cpu")
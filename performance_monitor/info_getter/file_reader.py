@@ -0,0 +1,105 @@
+import os
+import re
+from typing import List, Optional
+
+
+def read_text(path: str) -> Optional[str]:
+    try:
+        with open(path, "r") as file:
+            return file.read().strip()
+    except OSError:
+        return None
+
+
+def read_int(path: str) -> Optional[int]:
+    text = read_text(path)
+    try:
+        return int(text) if text is not None else None
+    except ValueError:
+        return None
+
+
+def list_numbered(directory: str, prefix: str, suffix: str = "") -> List[int]:
+    # e.g. the n of every "temp<n>_input" in a hwmon directory, sorted
+    pattern = re.compile(rf"{re.escape(prefix)}(\d+){re.escape(suffix)}")
+    try:
+        names = os.listdir(directory)
+    except OSError:
+        return []
+    return sorted(
+        int(match.group(1)) for match in map(pattern.fullmatch, names) if match
+    )
+
+
+class FileReader:
+    # keeps a procfs or sysfs file open and rereads it from offset 0 with pread,
+    # one syscall per read instead of open, fstat, ioctl, read and close;
+    # a file whose device went away is reopened on the next read
+
+    __slots__ = ("path", "_fd", "_buffer")
+
+    path: str
+
+    _fd: Optional[int]
+    _buffer: bytearray
+
+    def __init__(self, path: str, size: int = 64):
+        self.path = path
+        self._fd = None
+        self._buffer = bytearray(size)
+
+    def _open(self) -> Optional[int]:
+        if self._fd is None:
+            try:
+                self._fd = os.open(self.path, os.O_RDONLY | os.O_CLOEXEC)
+            except OSError:
+                return None
+        return self._fd
+
+    def _pread(self, size: int) -> Optional[bytes]:
+        for _ in range(2):
+            fd = self._open()
+            if fd is None:
+                return None
+            try:
+                return os.pread(fd, size, 0)
+            except OSError:
+                # e.g. ENODEV after a hot unplug, try a fresh descriptor once
+                self.close()
+        return None
+
+    def read_int(self) -> Optional[int]:
+        # int() takes the bytes as they are, trailing newline included; for a
+        # value this short a fresh bytes object is cheaper than preadv into
+        # the buffer and slicing it
+        data = self._pread(32)
+        if not data:
+            return None
+        try:
+            return int(data)
+        except ValueError:
+            return None
+
+    def read(self) -> Optional[bytes]:
+        # the whole file, the buffer grows to fit and is kept for the next read
+        for _ in range(2):
+            fd = self._open()
+            if fd is None:
+                return None
+            try:
+                while True:
+                    size = os.preadv(fd, [self._buffer], 0)
+                    if size < len(self._buffer):
+                        return bytes(memoryview(self._buffer)[:size])
+                    self._buffer = bytearray(len(self._buffer) * 2)
+            except OSError:
+                self.close()
+        return None
+
+    def close(self):
+        if self._fd is not None:
+            try:
+                os.close(self._fd)
+            except OSError:
+                pass
+            self._fd = None
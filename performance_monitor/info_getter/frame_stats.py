@@ -0,0 +1,320 @@
+import math
+from array import array
+from bisect import bisect_right
+from collections import Counter, deque
+from dataclasses import dataclass
+from functools import partial
+from typing import (
+    Annotated,
+    Deque,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from .hardware import GeneralHardware
+
+# frame times in milliseconds between these bounds fall into log spaced buckets
+# about 2% wide, faster and slower frames are counted in the first and last one
+BUCKET_MIN_TIME = 0.05
+BUCKET_MAX_TIME = 2000.0
+BUCKET_RATIO = 1.02
+BUCKET_COUNT = (
+    math.ceil(math.log(BUCKET_MAX_TIME / BUCKET_MIN_TIME) / math.log(BUCKET_RATIO)) + 1
+)
+
+_bucket_starts = [
+    BUCKET_MIN_TIME * BUCKET_RATIO**index for index in range(BUCKET_COUNT)
+]
+# a frame is taken as the geometric middle of its bucket, at most 1% off
+_bucket_times = [start * math.sqrt(BUCKET_RATIO) for start in _bucket_starts]
+# one past the bucket of a frame time, 0 below the first bucket; a C call that
+# map() and Counter can run over a batch without a Python loop
+_bucket_end = partial(bisect_right, _bucket_starts)
+
+
+def bucket_index(frame_time: float) -> int:
+    return max(0, _bucket_end(frame_time) - 1)
+
+
+def bucket_starts() -> List[float]:
+    # lower bound of every bucket, for bucketing frame times in bulk elsewhere
+    return list(_bucket_starts)
+
+
+@dataclass(frozen=True)
+class FrameStats:
+    frames: int
+    # frames over the time they took, not an average of rates
+    fps: float
+    # rate of the slowest 1% and 0.1% of the frames
+    fps_1_low: float
+    fps_0_1_low: float
+    # frame times in milliseconds
+    frame_time_p50: float
+    frame_time_p99: float
+    # frames slower than stutter_ratio times the median
+    stutters: int
+
+
+class _FrameSlice:
+    # the frames of one slice of time, sparse since frame times cluster
+
+    __slots__ = ("counts", "count", "total")
+
+    counts: Dict[int, int]
+    count: int
+    total: float
+
+    def __init__(self):
+        self.counts = {}
+        self.count = 0
+        self.total = 0.0
+
+
+class FrameTimeHistogram:
+    # frame count per bucket of the slices of a window, quantiles and lows come
+    # from a walk over the buckets and never from sorting frames
+
+    __slots__ = ("counts", "count", "total")
+
+    counts: array
+    count: int
+    # exact sum of the frame times, for the mean
+    total: float
+
+    def __init__(self):
+        self.counts = array("q", [0]) * BUCKET_COUNT
+        self.count = 0
+        self.total = 0.0
+
+    def add_slice(self, frame_slice: _FrameSlice, sign: int = 1):
+        # sign -1 takes a slice out again once it leaves the window
+        if frame_slice.count == 0:
+            return
+        counts = self.counts
+        for index, count in frame_slice.counts.items():
+            counts[index] += sign * count
+        self.count += sign * frame_slice.count
+        self.total += sign * frame_slice.total
+
+    def quantile(self, q: float) -> float:
+        rank = q * (self.count - 1)
+        seen = 0
+        counts = self.counts
+        for index in range(BUCKET_COUNT):
+            count = counts[index]
+            if count <= 0:
+                continue
+            seen += count
+            if seen > rank:
+                return _bucket_times[index]
+        return 0.0
+
+    def tail_mean(self, fraction: float) -> float:
+        # mean frame time of the slowest fraction of the frames, at least one
+        wanted = self.count - int((1 - fraction) * (self.count - 1))
+        remaining = wanted
+        total = 0.0
+        counts = self.counts
+        for index in range(BUCKET_COUNT - 1, -1, -1):
+            count = counts[index]
+            if count <= 0:
+                continue
+            taken = min(count, remaining)
+            total += _bucket_times[index] * taken
+            remaining -= taken
+            if remaining <= 0:
+                break
+        return total / wanted
+
+    def count_above(self, frame_time: float) -> int:
+        return sum(self.counts[bucket_index(frame_time) + 1 :])
+
+    def stats(self, stutter_ratio: float) -> Optional[FrameStats]:
+        if self.count <= 0 or self.total <= 0:
+            return None
+        frame_time_p50 = self.quantile(0.5)
+        return FrameStats(
+            frames=self.count,
+            fps=1000 * self.count / self.total,
+            fps_1_low=1000 / self.tail_mean(0.01),
+            fps_0_1_low=1000 / self.tail_mean(0.001),
+            frame_time_p50=frame_time_p50,
+            frame_time_p99=self.quantile(0.99),
+            stutters=self.count_above(frame_time_p50 * stutter_ratio),
+        )
+
+
+class FrameTimeWindows:
+    # frame statistics over sliding windows: frames are counted into the slice
+    # of time that is open, a closed slice is added to the histogram of every
+    # window and taken out again when it is older than the window
+
+    window_times: Sequence[float]
+    slice_time: float
+    stutter_ratio: float
+
+    _window_slices: List[int]
+    _windows: List[FrameTimeHistogram]
+    _closed: Deque[_FrameSlice]
+    _open: _FrameSlice
+    _open_start: Optional[float]
+
+    def __init__(
+        self,
+        window_times: Sequence[float] = (1.0, 10.0),
+        slice_time: float = 0.25,
+        stutter_ratio: float = 2.0,
+    ):
+        if not window_times or slice_time <= 0:
+            raise ValueError(
+                "Frame time windows need a window and a positive slice time"
+            )
+        for window_time in window_times:
+            if window_time < slice_time:
+                raise ValueError(
+                    f"Frame time window of {window_time}s is shorter than a slice"
+                )
+        self.window_times = tuple(window_times)
+        self.slice_time = slice_time
+        self.stutter_ratio = stutter_ratio
+        # closed slices in every window besides the open one
+        self._window_slices = [
+            round(window_time / slice_time) - 1 for window_time in self.window_times
+        ]
+        self.reset()
+
+    def reset(self):
+        self._windows = [FrameTimeHistogram() for _ in self.window_times]
+        self._closed = deque()
+        self._open = _FrameSlice()
+        self._open_start = None
+
+    def _close_slice(self):
+        closed = self._closed
+        closed.append(self._open)
+        for window, slices in zip(self._windows, self._window_slices):
+            if slices <= 0:
+                continue
+            window.add_slice(self._open)
+            if len(closed) > slices:
+                window.add_slice(closed[-slices - 1], -1)
+        if len(closed) > max(self._window_slices):
+            closed.popleft()
+        self._open = _FrameSlice()
+
+    def _advance(self, now: float):
+        if self._open_start is None:
+            self._open_start = now
+            return
+        elapsed_slices = int((now - self._open_start) / self.slice_time)
+        if elapsed_slices <= 0:
+            return
+        if elapsed_slices > max(self._window_slices):
+            # a gap longer than every window leaves nothing to keep
+            self.reset()
+            self._open_start = now
+            return
+        for _ in range(elapsed_slices):
+            self._close_slice()
+        self._open_start += elapsed_slices * self.slice_time
+
+    def add(self, frame_times: Sequence[float], now: float):
+        # a whole batch is bucketed and counted in C, O(1) per frame
+        self._advance(now)
+        frame_slice = self._open
+        counts = frame_slice.counts
+        for bucket_end, count in Counter(map(_bucket_end, frame_times)).items():
+            index = max(0, bucket_end - 1)
+            counts[index] = counts.get(index, 0) + count
+        frame_slice.count += len(frame_times)
+        frame_slice.total += sum(frame_times)
+
+    def stats(self, now: float) -> List[Optional[FrameStats]]:
+        # every window as of now, the open slice included
+        self._advance(now)
+        stats = []
+        for window in self._windows:
+            window.add_slice(self._open)
+            stats.append(window.stats(self.stutter_ratio))
+            window.add_slice(self._open, -1)
+        return stats
+
+    def fps(self, now: float) -> Optional[float]:
+        # mean rate of the first window as of now, without a walk over buckets
+        self._advance(now)
+        window = self._windows[0]
+        count = window.count + self._open.count
+        total = window.total + self._open.total
+        if count <= 0 or total <= 0:
+            return None
+        return 1000 * count / total
+
+
+class FrameTimeHardware(GeneralHardware):
+    # the sensors every frame time getter reports from its FrameTimeWindows
+
+    # seconds of the sliding windows, fps and fps_1_low are of the first one
+    window_times: Tuple[float, ...] = (1.0, 10.0)
+    # windows move in steps of this many seconds
+    slice_time: float = 0.25
+    # a frame this many times slower than the recent ones counts as a stutter
+    stutter_ratio: float = 2.0
+
+    fps: Annotated[Optional[int], GeneralHardware.SensorValue]
+    fps_1_low: Annotated[Optional[int], GeneralHardware.SensorValue]
+    target_process: Annotated[Optional[str], GeneralHardware.SensorValue]
+    # one value per window of window_times, None while a window has no frames
+    windows: Annotated[List[float], GeneralHardware.SensorValue]
+    window_fps: Annotated[List[Optional[float]], GeneralHardware.SensorValue]
+    window_fps_1_low: Annotated[List[Optional[float]], GeneralHardware.SensorValue]
+    window_fps_0_1_low: Annotated[List[Optional[float]], GeneralHardware.SensorValue]
+    window_frame_time_p50: Annotated[
+        List[Optional[float]], GeneralHardware.SensorValue
+    ]
+    window_frame_time_p99: Annotated[
+        List[Optional[float]], GeneralHardware.SensorValue
+    ]
+    window_stutters: Annotated[List[int], GeneralHardware.SensorValue]
+    # the processes that presented frames in the first window, most recent
+    # first, and their mean fps over it
+    processes: Annotated[List[str], GeneralHardware.SensorValue]
+    process_fps: Annotated[List[float], GeneralHardware.SensorValue]
+
+    _windows: FrameTimeWindows
+
+    def _new_windows(self) -> FrameTimeWindows:
+        return FrameTimeWindows(self.window_times, self.slice_time, self.stutter_ratio)
+
+    def _init_windows(self):
+        self.windows = list(self.window_times)
+        self._windows = self._new_windows()
+        self.clear()
+
+    def clear(self):
+        self.fps_1_low = None
+        self.fps = None
+        self.window_fps = []
+        self.window_fps_1_low = []
+        self.window_fps_0_1_low = []
+        self.window_frame_time_p50 = []
+        self.window_frame_time_p99 = []
+        self.window_stutters = []
+        self.processes = []
+        self.process_fps = []
+
+    def _set_stats(self, stats: List[Optional[FrameStats]]):
+        self.clear()
+        for item in stats:
+            self.window_fps.append(item.fps if item else None)
+            self.window_fps_1_low.append(item.fps_1_low if item else None)
+            self.window_fps_0_1_low.append(item.fps_0_1_low if item else None)
+            self.window_frame_time_p50.append(item.frame_time_p50 if item else None)
+            self.window_frame_time_p99.append(item.frame_time_p99 if item else None)
+            self.window_stutters.append(item.stutters if item else 0)
+        if stats[0] is not None:
+            self.fps = int(stats[0].fps)
+            self.fps_1_low = int(stats[0].fps_1_low)
@@ -1,45 +1,51 @@
-import csv
 import os
-import statistics
 import subprocess
 import threading
 import time
 import ctypes
+from collections import OrderedDict
 from ctypes import wintypes
-from typing import Annotated, Optional
+from typing import Dict, List
 
 from ..third_party import PM_exe_path
-from .hardware import GeneralHardware
+from .frame_stats import FrameTimeHardware, FrameTimeWindows
+from .hardware import report
+from .present_mon import PresentMonParser
 
 
-class FrameTimeInformation(GeneralHardware):
-    fps: Annotated[Optional[int], GeneralHardware.SensorValue]
-    fps_1_low: Annotated[Optional[int], GeneralHardware.SensorValue]
-    target_process: Annotated[Optional[str], GeneralHardware.SensorValue]
+class FrameTimeInformation(FrameTimeHardware):
+    # bytes asked from the PresentMon pipe per read, a read returns what is there
+    pipe_read_size: int = 1 << 16
+    # processes whose frame times are kept, the least recently presenting one
+    # is dropped first
+    process_capacity: int = 8
 
-    _present_mon_process: subprocess.Popen[str]
+    _present_mon_process: subprocess.Popen[bytes]
     _collect_thread: threading.Thread
 
     _collect_thread_start_event: threading.Event
     _collect_thread_exit_event: threading.Event
+    # held while a new PresentMon is published, so the collector never waits
+    # for a restart that already happened
+    _process_lock: threading.Lock
 
     _data_lock: threading.Lock
-    _inner_fps: Optional[float]
-    _inner_1_low_fps: Optional[float]
-    _inner_samples: int
+    # one PresentMon session captures every process, its frames are split by
+    # process name into these windows
+    _processes: "OrderedDict[str, FrameTimeWindows]"
 
     def _reset_data(self):
-        self._inner_fps = None
-        self._inner_1_low_fps = None
-        self._inner_samples = 0
+        self._processes = OrderedDict()
 
     def __init__(self):
-        self.clear()
+        self.windows = list(self.window_times)
         self.target_process = None
+        self.clear()
 
         print("FrameTimeInformation initialization:")
         self._present_mon_process = None
         self._data_lock = threading.Lock()
+        self._process_lock = threading.Lock()
         self._collect_thread_start_event = threading.Event()
         self._collect_thread_exit_event = threading.Event()
         self._collect_thread = threading.Thread(
@@ -49,7 +55,8 @@ class FrameTimeInformation(GeneralHardware):
         print("\tFrameTime Collector Thread started")
         with self._data_lock:
             self._reset_data()
-        self._update_target_process(self._pick_target_process())
+        self._start_present_mon()
+        self.target_process = self._pick_target_process()
         print(f"\tMonitoring target process: {self.target_process}")
 
     __ptp_last_pid = None
@@ -102,139 +109,90 @@ class FrameTimeInformation(GeneralHardware):
             ctypes.windll.kernel32.CloseHandle(process_handle)
 
     def _collect_worker(self):
-        frame_times_ms: list[float] = []
-
-        def _update():
-            frame_times_ms.sort()
-            if frame_times_ms:
-                frame_ms = statistics.fmean(frame_times_ms)
-                low_1_percent = frame_times_ms[int(0.99 * (len(frame_times_ms) - 1)) :]
-                low_1_frame_ms = sum(low_1_percent) / len(low_1_percent)
-            else:
-                frame_ms = -1
-                low_1_frame_ms = -1
-
-            fps = 1000.0 / frame_ms if frame_ms > 0 else None
-            fps_1_low = 1000.0 / low_1_frame_ms if low_1_frame_ms > 0 else None
-            samples = (
-                len(frame_times_ms)
-                if (fps is not None) and (fps_1_low is not None)
-                else 0
-            )
-
-            with self._data_lock:
-                if samples == 0:
-                    self._reset_data()
-                elif self._inner_samples > 0:
-                    self._inner_fps = (
-                        self._inner_fps * self._inner_samples + fps * samples
-                    ) / (self._inner_samples + samples)
-                    self._inner_1_low_fps = (
-                        self._inner_1_low_fps * self._inner_samples
-                        + fps_1_low * samples
-                    ) / (self._inner_samples + samples)
-                    self._inner_samples += samples
-                else:
-                    self._inner_fps = fps
-                    self._inner_1_low_fps = fps_1_low
-                    self._inner_samples = samples
-
-            frame_times_ms.clear()
-
+        process = None
+        parser = None
         while True:
+            self._collect_thread_start_event.wait()
             if self._collect_thread_exit_event.is_set():
                 break
 
-            if not self._collect_thread_start_event.is_set():
-                self._collect_thread_start_event.wait()
-                continue
-
-            # wait for present_mon to start and output data
-            if (self._present_mon_process is None) or (
-                self._present_mon_process.stdout is None
-            ):
-                time.sleep(0.2)
-                continue
-
-            reader = csv.DictReader(self._present_mon_process.stdout)
-            # not ready yet
-            if not reader.fieldnames:
-                time.sleep(0.2)
+            present_mon_process = self._present_mon_process
+            if (present_mon_process is None) or (present_mon_process.stdout is None):
+                self._collect_thread_exit_event.wait(0.2)
                 continue
-
-            frame_time_column = None
-            for field in reader.fieldnames:
-                if "msbetweenpresents" in field.lower():
-                    frame_time_column = field
-                    break
-            if frame_time_column is None:
-                raise RuntimeError("Cannot find frame time column in PresentMon output")
-
-            window_start = time.monotonic()
-            frame_times_ms.clear()
+            if present_mon_process is not process:
+                # a partial row is kept across chunks of one PresentMon, a new
+                # one starts over with its header
+                process = present_mon_process
+                parser = PresentMonParser()
+
+            # the pipe is read in chunks of whatever PresentMon has written so
+            # far, parsed and timed per chunk instead of per frame
+            stdout = process.stdout
             try:
-                for row in reader:
-                    if (
-                        not self._collect_thread_start_event.is_set()
-                    ) or self._collect_thread_exit_event.is_set():
+                while (
+                    self._collect_thread_start_event.is_set()
+                    and not self._collect_thread_exit_event.is_set()
+                ):
+                    chunk = stdout.read1(self.pipe_read_size)
+                    if not chunk:
+                        # PresentMon exited
+                        self._wait_for_restart(process)
                         break
-
-                    value = row.get(frame_time_column)
-                    if value:
-                        try:
-                            frame_times_ms.append(float(value))
-                        except ValueError:
-                            pass
-
-                    now = time.monotonic()
-                    if now - window_start < 0.2:
+                    frame_times_by_process = parser.feed_processes(chunk)
+                    if not frame_times_by_process:
                         continue
-
-                    _update()
-                    window_start = now
+                    with self._data_lock:
+                        self._add_frame_times(frame_times_by_process)
+            except RuntimeError:
+                raise
             except Exception as _:
-                pass
-
-    def _update_target_process(self, target_process: Optional[str]):
-        if self.target_process == target_process:
-            return
-        self.target_process = target_process
+                # e.g. the pipe of a PresentMon that was just terminated
+                self._wait_for_restart(process)
+
+    def _wait_for_restart(self, process: subprocess.Popen):
+        # sleeps until update() starts another PresentMon or dispose() stops
+        with self._process_lock:
+            if self._present_mon_process is process:
+                self._collect_thread_start_event.clear()
+        self._collect_thread_start_event.wait()
+
+    def _add_frame_times(self, frame_times_by_process: Dict[str, List[float]]):
+        now = time.monotonic()
+        processes = self._processes
+        for process_name, frame_times_ms in frame_times_by_process.items():
+            windows = processes.get(process_name)
+            if windows is None:
+                windows = processes[process_name] = self._new_windows()
+                if len(processes) > self.process_capacity:
+                    processes.popitem(last=False)
+            else:
+                processes.move_to_end(process_name)
+            windows.add(frame_times_ms, now)
 
+    def _start_present_mon(self):
+        # a single capture of every process for the lifetime of the getter, a
+        # change of the target process only changes which frames are reported
         self._collect_thread_start_event.clear()
-        with self._data_lock:
-            self._reset_data()
-
         if self._present_mon_process is not None:
             self._present_mon_process.terminate()
             self._present_mon_process.wait()
             self._present_mon_process = None
 
-        if self.target_process is None:
-            return
-
-        self._present_mon_process = subprocess.Popen(
-            [
-                PM_exe_path,
-                "--process_name",
-                self.target_process,
-                "--output_stdout",
-                "--no_console_stats",
-                "--exclude_dropped",
-                "--v1_metrics",
-                "--stop_existing_session",
-            ],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.DEVNULL,
-            text=True,
-            encoding="utf-8",
-            errors="ignore",
-            bufsize=1,
-        )
-        self._collect_thread_start_event.set()
-
-    def clear(self):
-        self.fps_1_low = None
-        self.fps = None
+        with self._process_lock:
+            self._present_mon_process = subprocess.Popen(
+                [
+                    PM_exe_path,
+                    "--output_stdout",
+                    "--no_console_stats",
+                    "--exclude_dropped",
+                    "--v1_metrics",
+                    "--stop_existing_session",
+                ],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+            )
+            self._collect_thread_start_event.set()
 
     def dispose(self):
         if self._present_mon_process is not None:
@@ -249,14 +207,27 @@ class FrameTimeInformation(GeneralHardware):
     def update(self):
         if not self._collect_thread.is_alive():
             raise RuntimeError("FrameTime collection thread has stopped unexpectedly")
+        if self._present_mon_process.poll() is not None:
+            report("PresentMon exited, restarting it")
+            self._start_present_mon()
 
-        with self._data_lock:
-            self.fps = int(self._inner_fps) if self._inner_fps is not None else None
-            self.fps_1_low = (
-                int(self._inner_1_low_fps)
-                if self._inner_1_low_fps is not None
-                else None
-            )
-            self._reset_data()
+        # switching the target is instant, its frames are already collected
+        self.target_process = self._pick_target_process()
 
-        self._update_target_process(self._pick_target_process())
+        now = time.monotonic()
+        processes = []
+        process_fps = []
+        with self._data_lock:
+            windows = self._processes.get(self.target_process)
+            if windows is not None:
+                stats = windows.stats(now)
+            else:
+                stats = [None] * len(self.window_times)
+            for process_name in reversed(self._processes):
+                fps = self._processes[process_name].fps(now)
+                if fps is not None:
+                    processes.append(process_name)
+                    process_fps.append(fps)
+        self._set_stats(stats)
+        self.processes = processes
+        self.process_fps = process_fps
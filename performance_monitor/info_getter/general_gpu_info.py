@@ -1,46 +1,104 @@
-import clr
-from typing import Annotated, List
-
-from ..third_party import LHM_dll_path
-from .hardware import GeneralHardware
-
-clr.AddReference(LHM_dll_path)
-from LibreHardwareMonitor import Hardware  # type: ignore
-from LibreHardwareMonitor.Hardware import HardwareType, SensorType  # type: ignore
+from array import array
+from typing import Annotated, List, Optional
+
+from .hardware import GeneralHardware, new_buffer
+from .lhm_session import Hardware, HardwareType, LhmSession, SensorType
+
+
+class _GpuSensorIndex:
+    # the sensor feeding each field of one GPU, sorted once by name and type;
+    # when several match, the last one wins as it did when the names were
+    # checked on every update
+
+    __slots__ = (
+        "sensor_count",
+        "temperature",
+        "core_clock",
+        "memory_clock",
+        "usage",
+        "power",
+        "memory_total",
+        "memory_used",
+    )
+
+    sensor_count: int
+    temperature: Optional[Hardware.ISensor]
+    core_clock: Optional[Hardware.ISensor]
+    memory_clock: Optional[Hardware.ISensor]
+    usage: Optional[Hardware.ISensor]
+    power: Optional[Hardware.ISensor]
+    memory_total: Optional[Hardware.ISensor]
+    memory_used: Optional[Hardware.ISensor]
+
+    def __init__(self, gpu: Hardware.IHardware):
+        sensors = list(gpu.Sensors)
+        self.sensor_count = len(sensors)
+        self.temperature = self.core_clock = self.memory_clock = None
+        self.usage = self.power = self.memory_total = self.memory_used = None
+
+        for sensor in sensors:
+            sensor_name = str(sensor.Name).upper()
+            s_type = sensor.SensorType
+
+            if s_type == SensorType.Temperature and "GPU" in sensor_name:
+                self.temperature = sensor
+            elif s_type == SensorType.Clock:
+                if "CORE" in sensor_name:
+                    self.core_clock = sensor
+                elif "MEMORY" in sensor_name:
+                    self.memory_clock = sensor
+            elif s_type == SensorType.Load:
+                if "CORE" in sensor_name or "GPU" in sensor_name:
+                    self.usage = sensor
+            elif s_type == SensorType.Power:
+                if (
+                    "TOTAL" in sensor_name
+                    or "GPU" in sensor_name
+                    or "CORE" in sensor_name
+                ):
+                    self.power = sensor
+            elif s_type in (SensorType.SmallData, SensorType.Data):
+                if "MEMORY TOTAL" in sensor_name:
+                    self.memory_total = sensor
+                elif "MEMORY USED" in sensor_name:
+                    self.memory_used = sensor
 
 
 class GeneralGpuInformation(GeneralHardware):
     gpu_count: Annotated[int, GeneralHardware.SensorValue]
     gpu_names: Annotated[List[str], GeneralHardware.SensorValue]
-    available_memory: Annotated[List[int], GeneralHardware.SensorValue]
-    used_memory: Annotated[List[int], GeneralHardware.SensorValue]
-    memory_usage: Annotated[List[float], GeneralHardware.SensorValue]
-    usage: Annotated[List[float], GeneralHardware.SensorValue]
-    power: Annotated[List[float], GeneralHardware.SensorValue]
-    available_power: Annotated[List[float], GeneralHardware.SensorValue]
-    temperature: Annotated[List[float], GeneralHardware.SensorValue]
-    core_clock: Annotated[List[float], GeneralHardware.SensorValue]
-    memory_clock: Annotated[List[float], GeneralHardware.SensorValue]
-
+    available_memory: Annotated[array, GeneralHardware.SensorValue]
+    used_memory: Annotated[array, GeneralHardware.SensorValue]
+    memory_usage: Annotated[array, GeneralHardware.SensorValue]
+    usage: Annotated[array, GeneralHardware.SensorValue]
+    power: Annotated[array, GeneralHardware.SensorValue]
+    available_power: Annotated[array, GeneralHardware.SensorValue]
+    temperature: Annotated[array, GeneralHardware.SensorValue]
+    core_clock: Annotated[array, GeneralHardware.SensorValue]
+    memory_clock: Annotated[array, GeneralHardware.SensorValue]
+
+    _session: LhmSession
     _available_gpu: List[Hardware.IHardware]
+    _sensor_indexes: List[_GpuSensorIndex]
 
     def __init__(self):
-        self.clear()
-
-        self.computer = Hardware.Computer()
-        self.computer.IsGpuEnabled = True
-        self.computer.Open()
+        self._session = LhmSession.acquire("Gpu")
 
         print("General GPU Initialization:")
         self.gpu_names = []
         self._available_gpu = []
-        for hardware in self.computer.Hardware:
-            if hardware.HardwareType != HardwareType.GpuNvidia:
-                self._available_gpu.append(hardware)
-                self.gpu_names.append(hardware.Name)
-                print(f"\tFound: {hardware.Name}")
+        # the session is shared with the CPU getter, so pick the GPUs by type;
+        # NVIDIA cards are left to the NVML getter
+        for hardware in self._session.get_hardware(
+            HardwareType.GpuAmd, HardwareType.GpuIntel
+        ):
+            self._available_gpu.append(hardware)
+            self.gpu_names.append(hardware.Name)
+            print(f"\tFound: {hardware.Name}")
 
         self.gpu_count = len(self._available_gpu)
+        self._sensor_indexes = [_GpuSensorIndex(gpu) for gpu in self._available_gpu]
+        self.clear()
 
     @staticmethod
     def _safe_value(value, default=0):
@@ -51,79 +109,58 @@ class GeneralGpuInformation(GeneralHardware):
         return int(value_mib * 1024 * 1024)
 
     def clear(self):
-        self.available_memory = []
-        self.used_memory = []
-        self.memory_usage = []
-        self.usage = []
-        self.power = []
-        self.available_power = []
-        self.temperature = []
-        self.core_clock = []
-        self.memory_clock = []
+        # buffers are sized by the discovered GPUs and overwritten by updates
+        gpu_count = self.gpu_count
+        # byte counts stay integers
+        self.available_memory = new_buffer(gpu_count, "q")
+        self.used_memory = new_buffer(gpu_count, "q")
+        self.memory_usage = new_buffer(gpu_count)
+        self.usage = new_buffer(gpu_count)
+        self.power = new_buffer(gpu_count)
+        self.available_power = new_buffer(gpu_count)
+        self.temperature = new_buffer(gpu_count)
+        self.core_clock = new_buffer(gpu_count)
+        self.memory_clock = new_buffer(gpu_count)
 
     def update(self):
-        self.clear()
-
-        for gpu in self._available_gpu:
-            gpu.Update()
-
-            available_memory = 0
-            used_memory = 0
-            usage = 0
-            power = 0
-            temperature = 0
-            core_clock = 0
-            memory_clock = 0
-
-            for sensor in gpu.Sensors:
-                sensor_name = str(sensor.Name).upper()
-                s_type = sensor.SensorType
-
-                if s_type == SensorType.Temperature and "GPU" in sensor_name:
-                    temperature = self._safe_value(sensor.Value)
-                elif s_type == SensorType.Clock:
-                    if "CORE" in sensor_name:
-                        core_clock = self._safe_value(sensor.Value)
-                    elif "MEMORY" in sensor_name:
-                        memory_clock = self._safe_value(sensor.Value)
-                elif s_type == SensorType.Load:
-                    if "CORE" in sensor_name or "GPU" in sensor_name:
-                        usage = self._safe_value(sensor.Value)
-                    elif "MEMORY" in sensor_name:
-                        memory_usage = self._safe_value(sensor.Value)
-                elif s_type == SensorType.Power:
-                    if (
-                        "TOTAL" in sensor_name
-                        or "GPU" in sensor_name
-                        or "CORE" in sensor_name
-                    ):
-                        power = self._safe_value(sensor.Value)
-                elif s_type in (SensorType.SmallData, SensorType.Data):
-                    if "MEMORY TOTAL" in sensor_name:
-                        available_memory = self._to_bytes_from_mib(
-                            self._safe_value(sensor.Value)
-                        )
-                    elif "MEMORY USED" in sensor_name:
-                        used_memory = self._to_bytes_from_mib(
-                            self._safe_value(sensor.Value)
-                        )
+        safe_value = self._safe_value
+
+        for gpu_idx, gpu in enumerate(self._available_gpu):
+            self._session.update(gpu)
+            index = self._sensor_indexes[gpu_idx]
+            if len(gpu.Sensors) != index.sensor_count:
+                index = self._sensor_indexes[gpu_idx] = _GpuSensorIndex(gpu)
+
+            available_memory = self._to_bytes_from_mib(
+                safe_value(index.memory_total and index.memory_total.Value)
+            )
+            used_memory = self._to_bytes_from_mib(
+                safe_value(index.memory_used and index.memory_used.Value)
+            )
+            power = safe_value(index.power and index.power.Value)
 
             if available_memory > 0 and used_memory >= 0:
                 memory_usage = (used_memory / available_memory) * 100
             else:
                 memory_usage = 0
 
-            self.available_memory.append(available_memory)
-            self.used_memory.append(used_memory)
-            self.memory_usage.append(memory_usage)
-            self.usage.append(usage)
-            self.power.append(power)
+            self.available_memory[gpu_idx] = available_memory
+            self.used_memory[gpu_idx] = used_memory
+            self.memory_usage[gpu_idx] = memory_usage
+            self.usage[gpu_idx] = safe_value(index.usage and index.usage.Value)
+            self.power[gpu_idx] = power
             # todo: support available power if possible, currently set as 0
-            self.available_power.append(power)
-            self.temperature.append(temperature)
-            self.core_clock.append(core_clock)
-            self.memory_clock.append(memory_clock)
+            self.available_power[gpu_idx] = power
+            self.temperature[gpu_idx] = safe_value(
+                index.temperature and index.temperature.Value
+            )
+            self.core_clock[gpu_idx] = safe_value(
+                index.core_clock and index.core_clock.Value
+            )
+            self.memory_clock[gpu_idx] = safe_value(
+                index.memory_clock and index.memory_clock.Value
+            )
 
     def dispose(self):
-        if hasattr(self, "computer"):
-            self.computer.Close()
+        if hasattr(self, "_session"):
+            self._session.release("Gpu")
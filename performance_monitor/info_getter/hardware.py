@@ -1,10 +1,166 @@
 import abc
-from typing import Annotated, get_origin as get_origin_cls
+import itertools
+import sys
+from array import array
+from collections.abc import Mapping
+from operator import attrgetter
+from typing import (
+    Annotated,
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    Tuple,
+    get_args,
+    get_origin as get_origin_cls,
+)
+
+
+def new_buffer(size: int, typecode: str = "d") -> array:
+    # a sensor buffer, sized once and overwritten in place by updates; doubles
+    # unless the sensor counts something, e.g. "q" for bytes
+    return array(typecode, [0]) * size
+
+
+def _buffer_kind(value_cls: Any) -> int:
+    # 1 for an array sensor, 2 for a list of arrays, 0 for anything else
+    if value_cls is array:
+        return 1
+    if get_origin_cls(value_cls) is list and get_args(value_cls) == (array,):
+        return 2
+    return 0
+
+
+class SensorLayout:
+    # the sensor keys of one GeneralHardware class in a fixed order, shared by
+    # every record the class emits
+
+    __slots__ = ("keys", "indexes", "buffers", "_read")
+
+    keys: Tuple[str, ...]
+    indexes: Dict[str, int]
+    # (index, kind) of the keys whose values are buffers, see _buffer_kind
+    buffers: Tuple[Tuple[int, int], ...]
+
+    # reads the values of the keys off a getter in one call
+    _read: Callable[[Any], Tuple[Any, ...]]
+
+    def __init__(
+        self, keys: Tuple[str, ...], buffers: Tuple[Tuple[int, int], ...] = ()
+    ):
+        self.keys = keys
+        self.indexes = {key: index for index, key in enumerate(keys)}
+        self.buffers = buffers
+        if len(keys) > 1:
+            self._read = attrgetter(*keys)
+        else:
+            # attrgetter of a single key does not return a tuple
+            self._read = lambda getter: tuple(getattr(getter, key) for key in keys)
+
+    def read(self, getter: Any) -> Tuple[Any, ...]:
+        row = self._read(getter)
+        if not self.buffers:
+            return row
+        # the getter overwrites its buffers on the next update, a record keeps copies
+        row = list(row)
+        for index, kind in self.buffers:
+            value = row[index]
+            row[index] = value[:] if kind == 1 else [item[:] for item in value]
+        return tuple(row)
+
+
+class SensorRecord(Mapping):
+    # the sensor values of one update as a tuple in layout order, read like a
+    # dict and only turned into one when serialized
+
+    __slots__ = ("layout", "row")
+
+    layout: SensorLayout
+    row: Tuple[Any, ...]
+
+    def __init__(self, layout: SensorLayout, row: Tuple[Any, ...]):
+        self.layout = layout
+        self.row = row
+
+    def __getitem__(self, key: str) -> Any:
+        return self.row[self.layout.indexes[key]]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.layout.indexes
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.layout.keys)
+
+    def __len__(self) -> int:
+        return len(self.row)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, SensorRecord) and other.layout is self.layout:
+            return self.row == other.row
+        return super().__eq__(other)
+
+    def __repr__(self) -> str:
+        return f"SensorRecord({self.as_dict()!r})"
+
+    def items(self) -> Iterator[Tuple[str, Any]]:
+        return zip(self.layout.keys, self.row)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return dict(zip(self.layout.keys, self.row))
+
+
+def json_default(value: Any) -> Any:
+    # default= of json.dumps for snapshots that hold sensor records
+    if isinstance(value, SensorRecord):
+        return value.as_dict()
+    if isinstance(value, array):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+# the number of the last message reported, the dashboard draws its next frame
+# in full when this changes, as the message was printed over the last one;
+# numbers come from a counter, which update threads can share without a lock
+report_count: int = 0
+_report_numbers = itertools.count(1)
+
+
+def report(message: str):
+    # for messages of getters and combiners while they are running, on stderr
+    # so they can be sent elsewhere than the dashboard
+    global report_count
+    report_count = next(_report_numbers)
+    print(message, file=sys.stderr, flush=True)
 
 
 class GeneralHardware(abc.ABC):
     SensorValue: str = "SensorValue"
 
+    # seconds between two updates, 0 means on every tick of the combiner
+    update_interval: float = 0.0
+
+    # resolved once per class when it is defined
+    _sensor_layout: SensorLayout = SensorLayout(())
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        keys = []
+        buffers = []
+        for base_cls in cls.__mro__:
+            if not issubclass(base_cls, GeneralHardware):
+                break
+            for key, value_cls in base_cls.__annotations__.items():
+                if (
+                    get_origin_cls(value_cls) is Annotated
+                    and GeneralHardware.SensorValue in value_cls.__metadata__
+                    and key not in keys
+                ):
+                    kind = _buffer_kind(get_args(value_cls)[0])
+                    if kind:
+                        buffers.append((len(keys), kind))
+                    keys.append(key)
+        cls._sensor_layout = SensorLayout(tuple(keys), tuple(buffers))
+
     @abc.abstractmethod
     def clear(self): ...
 
@@ -14,16 +170,13 @@ class GeneralHardware(abc.ABC):
     @abc.abstractmethod
     def update(self): ...
 
-    def sensors(self):
-        sensors_dict = {}
-        for cls in self.__class__.__mro__:
-            if not issubclass(cls, GeneralHardware):
-                break
-            for key, value_cls in cls.__annotations__.items():
-                if (
-                    get_origin_cls(value_cls) is Annotated
-                    and GeneralHardware.SensorValue in value_cls.__metadata__
-                ):
-                    sensors_dict[key] = getattr(self, key)
+    @classmethod
+    def sensor_keys(cls) -> Tuple[str, ...]:
+        return cls._sensor_layout.keys
 
-        return {"type": self.__class__.__name__, "sensors": sensors_dict}
+    def sensors(self):
+        layout = self._sensor_layout
+        return {
+            "type": self.__class__.__name__,
+            "sensors": SensorRecord(layout, layout.read(self)),
+        }
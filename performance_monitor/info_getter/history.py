@@ -0,0 +1,138 @@
+import math
+import threading
+from array import array
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+
+def flatten_sensors(prefix: str, value: Any) -> Iterator[Tuple[str, float]]:
+    # yields ("cpu.temperature[0][3]", 71.0) pairs for every numeric sensor value,
+    # strings are skipped and None becomes NaN
+    if isinstance(value, bool):
+        yield prefix, float(value)
+    elif isinstance(value, (int, float)):
+        yield prefix, value
+    elif value is None:
+        yield prefix, math.nan
+    elif isinstance(value, (list, tuple, array)):
+        for index, item in enumerate(value):
+            yield from flatten_sensors(f"{prefix}[{index}]", item)
+    elif isinstance(value, dict):
+        for key, item in value.items():
+            yield from flatten_sensors(f"{prefix}.{key}", item)
+
+
+def flatten_info(info: Dict[str, Dict[str, Any]]) -> Iterator[Tuple[str, float]]:
+    for name, getter_info in info.items():
+        for key, value in getter_info["sensors"].items():
+            yield from flatten_sensors(f"{name}.{key}", value)
+
+
+def match_sensor(path: str, pattern: str) -> bool:
+    # "cpu.temperature" matches "cpu.temperature[0][3]" but not "cpu.temperature_max"
+    return path == pattern or (
+        path.startswith(pattern) and path[len(pattern)] in "[."
+    )
+
+
+class Ring:
+    # row bookkeeping for fixed-capacity columns that wrap around,
+    # rows are appended with growing timestamps
+
+    capacity: int
+    times: array
+    count: int
+
+    def __init__(self, capacity: int):
+        if capacity <= 0:
+            raise ValueError("Ring capacity must be positive")
+        self.capacity = capacity
+        self.times = self.new_column()
+        self.count = 0
+
+    def __len__(self) -> int:
+        return min(self.count, self.capacity)
+
+    def new_column(self, typecode: str = "d") -> array:
+        return array(typecode, [math.nan]) * self.capacity
+
+    def next_index(self, timestamp: float) -> int:
+        # claims the slot of the next row, the caller fills its columns
+        index = self.count % self.capacity
+        self.times[index] = timestamp
+        self.count += 1
+        return index
+
+    def range_since(self, since: Optional[float]) -> Tuple[int, int]:
+        # logical positions run from the oldest (0) to the newest (len - 1) row,
+        # timestamps grow with the position so the start is found by bisection
+        size = len(self)
+        first = self.count - size
+        low, high = 0, size
+        if since is not None:
+            while low < high:
+                middle = (low + high) // 2
+                if self.times[(first + middle) % self.capacity] < since:
+                    low = middle + 1
+                else:
+                    high = middle
+        return first + low, first + size
+
+    def slice(self, column: array, start: int, stop: int) -> array:
+        # copies the logical range [start, stop) out of the ring in at most two slices
+        if start >= stop:
+            return array(column.typecode)
+        physical_start = start % self.capacity
+        physical_stop = physical_start + (stop - start)
+        if physical_stop <= self.capacity:
+            return column[physical_start:physical_stop]
+        return column[physical_start:] + column[: physical_stop - self.capacity]
+
+
+class HistoryStore:
+    # fixed-capacity ring buffers, one preallocated column per sensor path
+
+    _ring: Ring
+    _columns: Dict[str, array]
+    _lock: threading.Lock
+
+    def __init__(self, capacity: int):
+        self._ring = Ring(capacity)
+        self._columns = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._ring)
+
+    def append(self, timestamp: float, info: Dict[str, Dict[str, Any]]):
+        with self._lock:
+            index = self._ring.next_index(timestamp)
+
+            columns = self._columns
+            written = set()
+            for path, value in flatten_info(info):
+                column = columns.get(path)
+                if column is None:
+                    column = columns[path] = self._ring.new_column()
+                column[index] = value
+                written.add(path)
+            if len(written) != len(columns):
+                for path, column in columns.items():
+                    if path not in written:
+                        column[index] = math.nan
+
+    def sensors(self) -> List[str]:
+        with self._lock:
+            return list(self._columns)
+
+    def query(
+        self, patterns: Sequence[str], since: Optional[float] = None
+    ) -> Tuple[array, Dict[str, array]]:
+        with self._lock:
+            start, stop = self._ring.range_since(since)
+            times = self._ring.slice(self._ring.times, start, stop)
+            values = {
+                path: self._ring.slice(column, start, stop)
+                for path, column in self._columns.items()
+                if any(match_sensor(path, pattern) for pattern in patterns)
+            }
+        return times, values
@@ -1,18 +1,115 @@
+import time
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Protocol
 from . import GeneralHardware
+from .hardware import report
+from .record import Replay
+
+
+def parse_update_intervals(items: Optional[List[str]]) -> Dict[str, float]:
+    # parses "name=seconds" items as given on the command line
+    intervals = {}
+    for item in items or []:
+        name, sep, value = item.partition("=")
+        try:
+            if not sep:
+                raise ValueError
+            intervals[name.strip()] = max(0.0, float(value))
+        except ValueError:
+            raise ValueError(f"Invalid update interval: {item}, expected NAME=SECONDS")
+    return intervals
+
+
+@dataclass
+class UpdateStats:
+    tick_time: float = 0.0
+    getter_times: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def serial_time(self) -> float:
+        # how long the same updates would have taken one after another
+        return sum(self.getter_times.values())
+
+    @property
+    def speedup(self) -> float:
+        return self.serial_time / self.tick_time if self.tick_time > 0 else 1.0
+
+    def server_timing(self) -> str:
+        # formatted as a Server-Timing header value, durations in milliseconds
+        return ", ".join(
+            [f"tick;dur={self.tick_time * 1000:.2f}"]
+            + [
+                f"{name};dur={duration * 1000:.2f}"
+                for name, duration in self.getter_times.items()
+            ]
+        )
+
+
+class Sink(Protocol):
+    def append(self, timestamp: float, info: Dict[str, Dict[str, Any]]): ...
+
+
+class _LastRecord:
+    # stands in for a getter on the combiner while an update of the getter is
+    # still running: sensors are read from the record of its last completed
+    # update, anything else from the getter itself
+
+    _getter: GeneralHardware
+    _sensors: Any
+
+    def __init__(self, getter: GeneralHardware, record: Dict[str, Any]):
+        self._getter = getter
+        self._sensors = record["sensors"]
+
+    def __getattr__(self, name: str) -> Any:
+        if name in self._sensors:
+            return self._sensors[name]
+        return getattr(self._getter, name)
 
 
 class Combiner(ABC):
     available_getters: List[GeneralHardware]
+    getters: Dict[str, GeneralHardware]
+    update_stats: UpdateStats
+
+    # getters due within this many seconds are updated in the current tick
+    schedule_slack: float = 0.05
+
+    _update_intervals: Dict[str, float]
+    _next_update_time: Dict[str, float]
+
+    _executor: Optional[ThreadPoolExecutor]
+    _running_updates: Dict[str, Future]
+    # sensors of every getter as of its last completed update, kept when
+    # updates run on the executor, where one can overrun its timeout
+    _records: Dict[str, Dict[str, Any]]
+    _sinks: List[Sink]
+    _replay: Optional[Replay]
 
     def __init__(
         self,
         getters_dict: Dict[str, Optional[GeneralHardware]],
+        update_intervals: Optional[Dict[str, float]] = None,
+        update_workers: int = 0,
+        update_timeout: Optional[float] = None,
+        replay: Optional[Replay] = None,
     ):
+        # a replay stands in for every getter, nothing touches the hardware
+        self._replay = replay
+        if replay is not None:
+            getters_dict = replay.getters_dict(getters_dict)
+
+        update_intervals = update_intervals or {}
+        for name in update_intervals:
+            if name not in getters_dict:
+                raise ValueError(f"Unknown getter for update interval: {name}")
+
         print("Collecting Meta Information...")
 
         self.available_getters = []
+        self.getters = {}
         for name, getter_cls in getters_dict.items():
             if getter_cls is None:
                 setattr(self, name, None)
@@ -20,17 +117,147 @@ class Combiner(ABC):
             getter = getter_cls()
             setattr(self, name, getter)
             self.available_getters.append(getter)
+            self.getters[name] = getter
+
+        self._update_intervals = {
+            name: update_intervals.get(name, getter.update_interval)
+            for name, getter in self.getters.items()
+        }
+        self._next_update_time = {name: 0.0 for name in self.getters}
+
+        # most updates wait on native calls that release the GIL, so running
+        # them side by side brings a tick close to the slowest getter
+        self._executor = (
+            ThreadPoolExecutor(
+                max_workers=update_workers, thread_name_prefix="getter-update"
+            )
+            if update_workers > 0
+            else None
+        )
+        self.update_timeout = update_timeout
+        self._running_updates = {}
+        self._records = (
+            {name: getter.sensors() for name, getter in self.getters.items()}
+            if self._executor is not None
+            else {}
+        )
+        self.update_stats = UpdateStats()
+        self._sinks = []
 
         print("Initialization Complete.")
 
     @abstractmethod
     def get_info(self) -> Any: ...
 
-    def _update(self):
-        for getter in self.available_getters:
-            getter.update()
+    def _timed_update(self, name: str, getter: GeneralHardware) -> float:
+        start = time.perf_counter()
+        getter.update()
+        duration = time.perf_counter() - start
+        if self._executor is not None:
+            # taken on the thread that ran the update, so a record is never
+            # read from a getter in the middle of one
+            self._records[name] = getter.sensors()
+        return duration
+
+    def getter_sensors(self, name: str) -> Dict[str, Any]:
+        # the sensors of a getter, those of its last completed update while
+        # another one is still running
+        if self._executor is None:
+            return self.getters[name].sensors()
+        return self._records[name]
+
+    def _is_running(self, name: str) -> bool:
+        # an update that overran its timeout is still running, the getter is
+        # skipped until it is done instead of piling up more calls
+        running = self._running_updates.get(name)
+        if running is None:
+            return False
+        if not running.done():
+            return True
+        del self._running_updates[name]
+        setattr(self, name, self.getters[name])
+        if running.exception() is not None:
+            report(f"Update of {name} failed, due to {running.exception()}")
+        return False
+
+    def _get_due_getters(self, now: float) -> Dict[str, GeneralHardware]:
+        due_getters = {}
+        for name, getter in self.getters.items():
+            if now + self.schedule_slack < self._next_update_time[name]:
+                continue
+            if self._is_running(name):
+                continue
+            due_getters[name] = getter
+        return due_getters
+
+    def add_sink(self, sink: Sink):
+        # sinks receive the sensors of every getter after each tick
+        self._sinks.append(sink)
+
+    def _run_updates(
+        self, getters: Dict[str, GeneralHardware], now: float
+    ) -> Dict[str, float]:
+        # updates the getters, side by side on the executor when there is one,
+        # and returns how long each update took; an update that does not end
+        # within the timeout is left running and its getter keeps its values
+        getter_times = {}
+        if self._executor is None or len(getters) <= 1:
+            for name, getter in getters.items():
+                getter_times[name] = self._timed_update(name, getter)
+                self._next_update_time[name] = now + self._update_intervals[name]
+        else:
+            futures = {
+                name: self._executor.submit(self._timed_update, name, getter)
+                for name, getter in getters.items()
+            }
+            wait(futures.values(), timeout=self.update_timeout)
+            for name, future in futures.items():
+                if not future.done():
+                    report(f"Update of {name} timed out, keeping its last values")
+                    self._running_updates[name] = future
+                    # the fields the dashboard reads must not change under it, a
+                    # getter without a completed update has nothing to show yet
+                    setattr(
+                        self,
+                        name,
+                        (
+                            _LastRecord(getters[name], self._records[name])
+                            if self._next_update_time[name] > 0.0
+                            else None
+                        ),
+                    )
+                    continue
+                getter_times[name] = future.result()
+                self._next_update_time[name] = now + self._update_intervals[name]
+        return getter_times
+
+    def _update(self, with_sensors: bool = False) -> Optional[Dict[str, Dict[str, Any]]]:
+        # only getters that are due are updated, the others keep their last values,
+        # the sensors of all getters are collected for the sinks or when asked for
+        start = time.perf_counter()
+        now = time.monotonic()
+        fresh = self._replay.advance() if self._replay is not None else True
+        due_getters = self._get_due_getters(now)
+        getter_times = self._run_updates(due_getters, now)
+        self.update_stats = UpdateStats(time.perf_counter() - start, getter_times)
+
+        if not (with_sensors or self._sinks):
+            return None
+        info = {name: self.getter_sensors(name) for name in self.getters}
+        if fresh:
+            # a replay keeps the recorded time and feeds every record once
+            timestamp = (
+                self._replay.timestamp if self._replay is not None else time.time()
+            )
+            for sink in self._sinks:
+                sink.append(timestamp, info)
+        return info
 
     def dispose(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
         for getter in self.available_getters:
             getter.dispose()
+        if self._replay is not None:
+            self._replay.close()
         print("All resources released.")
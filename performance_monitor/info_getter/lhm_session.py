@@ -0,0 +1,94 @@
+import clr
+import threading
+import time
+from typing import Dict, List, Optional
+
+from ..third_party import LHM_dll_path
+
+clr.AddReference(LHM_dll_path)
+from LibreHardwareMonitor import Hardware  # type: ignore
+from LibreHardwareMonitor.Hardware import HardwareType, SensorType  # type: ignore
+
+# the getters take the .NET types from here, once the assembly is loaded
+__all__ = ["Hardware", "HardwareType", "LhmSession", "SensorType"]
+
+
+class LhmSession:
+    # one opened Hardware.Computer shared by every LibreHardwareMonitor getter;
+    # each getter acquires the hardware groups it needs and releases them on
+    # dispose, the computer is closed with the last release
+
+    # an update this recent is reused, so a hardware read by several getters
+    # is updated once per tick of the combiner
+    update_slack: float = 0.05
+
+    _instance: Optional["LhmSession"] = None
+    _instance_lock = threading.Lock()
+
+    computer: Hardware.Computer
+
+    _references: Dict[str, int]
+    _update_times: Dict[str, float]
+    _update_locks: Dict[str, threading.Lock]
+    _lock: threading.Lock
+    _opened: bool
+
+    def __init__(self):
+        self.computer = Hardware.Computer()
+        self._references = {}
+        self._update_times = {}
+        self._update_locks = {}
+        self._lock = threading.Lock()
+        self._opened = False
+
+    @classmethod
+    def acquire(cls, group: str) -> "LhmSession":
+        # group is a Computer switch without its prefix and suffix, e.g. "Cpu" for IsCpuEnabled
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            session = cls._instance
+            with session._lock:
+                if not session._references.get(group):
+                    # the computer adds the group's hardware when it is already open
+                    setattr(session.computer, f"Is{group}Enabled", True)
+                session._references[group] = session._references.get(group, 0) + 1
+                if not session._opened:
+                    session.computer.Open()
+                    session._opened = True
+            return session
+
+    def release(self, group: str):
+        with LhmSession._instance_lock:
+            with self._lock:
+                self._references[group] -= 1
+                if self._references[group] > 0:
+                    return
+                del self._references[group]
+                if self._references:
+                    setattr(self.computer, f"Is{group}Enabled", False)
+                    return
+                self.computer.Close()
+                self._opened = False
+            LhmSession._instance = None
+
+    def get_hardware(self, *hardware_types: HardwareType) -> List[Hardware.IHardware]:
+        return [
+            hardware
+            for hardware in self.computer.Hardware
+            if hardware.HardwareType in hardware_types
+        ]
+
+    def update(self, hardware: Hardware.IHardware):
+        key = str(hardware.Identifier)
+        with self._lock:
+            lock = self._update_locks.get(key)
+            if lock is None:
+                lock = self._update_locks[key] = threading.Lock()
+        # updates of different hardware may still run side by side
+        with lock:
+            now = time.monotonic()
+            if now - self._update_times.get(key, float("-inf")) < self.update_slack:
+                return
+            hardware.Update()
+            self._update_times[key] = time.monotonic()
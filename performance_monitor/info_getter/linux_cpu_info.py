@@ -0,0 +1,297 @@
+import os
+import re
+import time
+from array import array
+from typing import Annotated, Dict, List, Tuple
+
+from .file_reader import FileReader, list_numbered, read_int, read_text
+from .hardware import GeneralHardware, new_buffer
+
+# hwmon drivers that report the temperatures of the CPU package and its cores
+CPU_HWMON_NAMES = ("coretemp", "k10temp", "zenpower", "cpu_thermal")
+
+
+class LinuxCpuInformation(GeneralHardware):
+    # the CpuInformation contract on top of /proc and sysfs, every file is
+    # found and opened once here so an update only rereads the files it needs
+
+    cpu_count: Annotated[int, GeneralHardware.SensorValue]
+    cpu_name: Annotated[List[str], GeneralHardware.SensorValue]
+    temperature: Annotated[List[array], GeneralHardware.SensorValue]
+    clock: Annotated[List[array], GeneralHardware.SensorValue]
+    usage: Annotated[List[array], GeneralHardware.SensorValue]
+    load: Annotated[List[array], GeneralHardware.SensorValue]
+    voltage: Annotated[List[array], GeneralHardware.SensorValue]
+    power: Annotated[array, GeneralHardware.SensorValue]
+
+    root: str
+
+    # logical cpu numbers of every thread, per package
+    _threads: List[List[int]]
+    # cpufreq file of the first thread of every core, per package
+    _clock_readers: List[List[FileReader]]
+    # temperature files of the cores, or of the package when there are none
+    _temperature_readers: List[List[FileReader]]
+    _voltage_readers: List[List[FileReader]]
+    # (energy_uj, max_energy_range_uj) of the RAPL package domains, per package
+    _energy_readers: List[List[Tuple[FileReader, int]]]
+    _stat_reader: FileReader
+
+    # busy and total jiffies by logical cpu number, of this and the last update
+    _busy_times: array
+    _total_times: array
+    _prev_busy_times: array
+    _prev_total_times: array
+    _has_prev_times: bool
+    _prev_energy: Dict[str, int]
+    _prev_energy_time: float
+
+    def __init__(self, root: str = "/"):
+        self.root = root
+
+        print("Linux CPU Initialization:")
+        packages = self._discover_packages()
+        self.cpu_count = len(packages)
+        self._threads = [threads for _, threads, _ in packages]
+
+        model_names = self._read_model_names()
+        self.cpu_name = []
+        for package_id, threads, _ in packages:
+            name = model_names.get(threads[0], f"CPU {package_id}")
+            self.cpu_name.append(name)
+            print(f"\tFound: {name}, {len(threads)} threads")
+
+        self._clock_readers = [
+            [
+                FileReader(path)
+                for path in (
+                    self._path(f"sys/devices/system/cpu/cpu{cpu}/cpufreq/scaling_cur_freq")
+                    for cpu in first_threads
+                )
+                if os.path.exists(path)
+            ]
+            for _, _, first_threads in packages
+        ]
+        package_ids = [package_id for package_id, _, _ in packages]
+        temperature_paths, voltage_paths = self._discover_hwmon(package_ids)
+        self._temperature_readers = [
+            [FileReader(path) for path in core_paths or other_paths]
+            for core_paths, other_paths in temperature_paths
+        ]
+        self._voltage_readers = [
+            [FileReader(path) for path in paths] for paths in voltage_paths
+        ]
+        self._energy_readers = [
+            [(FileReader(path), max_range) for path, max_range in paths]
+            for paths in self._discover_rapl(package_ids)
+        ]
+        # about 150 bytes per thread, the buffer grows if that is not enough
+        self._stat_reader = FileReader(
+            self._path("proc/stat"),
+            size=4096 + 160 * sum(len(threads) for threads in self._threads),
+        )
+
+        thread_slots = 1 + max(
+            (max(threads) for threads in self._threads), default=-1
+        )
+        self._busy_times = array("q", [0]) * thread_slots
+        self._total_times = array("q", [0]) * thread_slots
+        self._prev_busy_times = array("q", [0]) * thread_slots
+        self._prev_total_times = array("q", [0]) * thread_slots
+        self._has_prev_times = False
+        self._prev_energy = {}
+        self.clear()
+        self._prev_energy_time = 0.0
+        self.update()
+
+    def _path(self, relative_path: str) -> str:
+        return os.path.join(self.root, relative_path)
+
+    def _discover_packages(self) -> List[Tuple[int, List[int], List[int]]]:
+        # (package id, threads, first thread of every core) sorted by package id
+        cpu_dir = self._path("sys/devices/system/cpu")
+        threads: Dict[int, List[int]] = {}
+        first_threads: Dict[int, Dict[int, int]] = {}
+        for cpu in list_numbered(cpu_dir, "cpu"):
+            if read_int(os.path.join(cpu_dir, f"cpu{cpu}", "online")) == 0:
+                continue
+            topology_dir = os.path.join(cpu_dir, f"cpu{cpu}", "topology")
+            package_id = read_int(os.path.join(topology_dir, "physical_package_id"))
+            core_id = read_int(os.path.join(topology_dir, "core_id"))
+            package_id = package_id if package_id is not None and package_id >= 0 else 0
+            core_id = core_id if core_id is not None else cpu
+            threads.setdefault(package_id, []).append(cpu)
+            first_threads.setdefault(package_id, {}).setdefault(core_id, cpu)
+        return [
+            (package_id, threads[package_id], list(first_threads[package_id].values()))
+            for package_id in sorted(threads)
+        ]
+
+    def _read_model_names(self) -> Dict[int, str]:
+        model_names = {}
+        cpu = None
+        for line in (read_text(self._path("proc/cpuinfo")) or "").splitlines():
+            key, _, value = line.partition(":")
+            key = key.strip()
+            if key == "processor":
+                cpu = int(value)
+            elif key == "model name" and cpu is not None:
+                model_names[cpu] = value.strip()
+        return model_names
+
+    def _discover_hwmon(
+        self, package_ids: List[int]
+    ) -> Tuple[List[Tuple[List[str], List[str]]], List[List[str]]]:
+        temperature_paths = [([], []) for _ in package_ids]
+        voltage_paths = [[] for _ in package_ids]
+
+        hwmon_dir = self._path("sys/class/hwmon")
+        # k10temp and friends have one device per package, in package order
+        driver_index: Dict[str, int] = {}
+        for hwmon in list_numbered(hwmon_dir, "hwmon"):
+            device_dir = os.path.join(hwmon_dir, f"hwmon{hwmon}")
+            driver = read_text(os.path.join(device_dir, "name"))
+            if driver not in CPU_HWMON_NAMES:
+                continue
+            index = driver_index.get(driver, 0)
+            driver_index[driver] = index + 1
+
+            labels = {}
+            for number in list_numbered(device_dir, "temp", "_input"):
+                label = read_text(os.path.join(device_dir, f"temp{number}_label"))
+                labels[number] = label or f"temp{number}"
+            # coretemp names its package in a label, the others go by device order
+            package_index = min(index, len(package_ids) - 1)
+            for label in labels.values():
+                match = re.fullmatch(r"Package id (\d+)", label)
+                if match and int(match.group(1)) in package_ids:
+                    package_index = package_ids.index(int(match.group(1)))
+            if package_index < 0:
+                continue
+
+            core_paths, other_paths = temperature_paths[package_index]
+            for number, label in labels.items():
+                path = os.path.join(device_dir, f"temp{number}_input")
+                if label.startswith(("Core", "Tccd")):
+                    core_paths.append(path)
+                else:
+                    other_paths.append(path)
+            for number in list_numbered(device_dir, "in", "_input"):
+                voltage_paths[package_index].append(
+                    os.path.join(device_dir, f"in{number}_input")
+                )
+            print(f"\tFound: {driver} sensors for {self.cpu_name[package_index]}")
+        return temperature_paths, voltage_paths
+
+    def _discover_rapl(self, package_ids: List[int]) -> List[List[Tuple[str, int]]]:
+        energy_paths = [[] for _ in package_ids]
+        powercap_dir = self._path("sys/class/powercap")
+        for zone in list_numbered(powercap_dir, "intel-rapl:"):
+            zone_dir = os.path.join(powercap_dir, f"intel-rapl:{zone}")
+            match = re.fullmatch(r"package-(\d+)", read_text(os.path.join(zone_dir, "name")) or "")
+            if not match or int(match.group(1)) not in package_ids:
+                continue
+            path = os.path.join(zone_dir, "energy_uj")
+            if read_int(path) is None:
+                # energy counters are root only on recent kernels
+                print(f"\tCould not read {path}, package power is not available")
+                continue
+            max_range = read_int(os.path.join(zone_dir, "max_energy_range_uj")) or 0
+            energy_paths[package_ids.index(int(match.group(1)))].append((path, max_range))
+        return energy_paths
+
+    def _read_cpu_times(self):
+        # one read of /proc/stat gives the busy and total jiffies of every thread,
+        # parsed from the bytes without decoding them
+        busy_times, total_times = self._busy_times, self._total_times
+        thread_slots = len(busy_times)
+        for line in (self._stat_reader.read() or b"").splitlines():
+            if not line.startswith(b"cpu") or not line[3:4].isdigit():
+                continue
+            name, *values = line.split()
+            cpu = int(name[3:])
+            if cpu >= thread_slots:
+                continue
+            # user nice system idle iowait irq softirq steal, guest time is in user
+            times = [int(value) for value in values[:8]]
+            total = sum(times)
+            busy_times[cpu] = total - times[3] - times[4]
+            total_times[cpu] = total
+
+    @staticmethod
+    def _read_into(buffer: array, readers: List[FileReader], scale: float = 1000):
+        # a file that could not be read keeps its last value
+        for position, reader in enumerate(readers):
+            value = reader.read_int()
+            if value is not None:
+                buffer[position] = value / scale
+
+    def clear(self):
+        # buffers are sized by the discovered files and overwritten by updates
+        self.temperature = [
+            new_buffer(len(readers)) for readers in self._temperature_readers
+        ]
+        self.clock = [new_buffer(len(readers)) for readers in self._clock_readers]
+        self.usage = [new_buffer(1) for _ in self._threads]
+        self.load = [new_buffer(len(threads)) for threads in self._threads]
+        self.voltage = [new_buffer(len(readers)) for readers in self._voltage_readers]
+        self.power = new_buffer(len(self._threads))
+
+    def update(self):
+        self._read_cpu_times()
+        busy_times, total_times = self._busy_times, self._total_times
+        prev_busy_times = self._prev_busy_times
+        prev_total_times = self._prev_total_times
+        has_prev_times = self._has_prev_times
+        now = time.monotonic()
+        elapsed = now - self._prev_energy_time if self._prev_energy_time else 0.0
+        self._prev_energy_time = now
+
+        for cpu_idx, threads in enumerate(self._threads):
+            load = self.load[cpu_idx]
+            load_sum = 0.0
+            for position, cpu in enumerate(threads):
+                busy = busy_times[cpu] - prev_busy_times[cpu]
+                total = total_times[cpu] - prev_total_times[cpu]
+                value = 100 * busy / total if has_prev_times and total > 0 else 0.0
+                load[position] = value
+                load_sum += value
+            self.usage[cpu_idx][0] = load_sum / len(threads)
+
+            power = 0.0
+            for reader, max_range in self._energy_readers[cpu_idx]:
+                energy = reader.read_int()
+                if energy is None:
+                    continue
+                prev_energy = self._prev_energy.get(reader.path)
+                self._prev_energy[reader.path] = energy
+                if prev_energy is None or elapsed <= 0:
+                    continue
+                delta = energy - prev_energy
+                if delta < 0:
+                    # the counter wrapped around
+                    delta += max_range
+                power += delta / 1e6 / elapsed
+            self.power[cpu_idx] = power
+
+            self._read_into(self.clock[cpu_idx], self._clock_readers[cpu_idx])
+            self._read_into(
+                self.temperature[cpu_idx], self._temperature_readers[cpu_idx]
+            )
+            self._read_into(self.voltage[cpu_idx], self._voltage_readers[cpu_idx])
+
+        # this update's times become the base of the next one
+        self._busy_times, self._prev_busy_times = prev_busy_times, busy_times
+        self._total_times, self._prev_total_times = prev_total_times, total_times
+        self._has_prev_times = True
+
+    def dispose(self):
+        self._stat_reader.close()
+        for readers in (
+            self._clock_readers + self._temperature_readers + self._voltage_readers
+        ):
+            for reader in readers:
+                reader.close()
+        for readers in self._energy_readers:
+            for reader, _ in readers:
+                reader.close()
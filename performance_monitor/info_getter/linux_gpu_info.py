@@ -0,0 +1,205 @@
+import os
+from array import array
+from typing import Annotated, List, Optional
+
+from .file_reader import FileReader, list_numbered, read_text
+from .hardware import GeneralHardware, new_buffer
+
+# NVIDIA cards are left to the NVML getter
+GPU_VENDOR_NAMES = {0x1002: "AMD", 0x8086: "Intel"}
+
+
+def parse_dpm_clock(data: Optional[bytes]) -> Optional[float]:
+    # "0: 500Mhz\n1: 1800Mhz *\n", the active level is marked with a star
+    if not data:
+        return None
+    for line in data.splitlines():
+        if line.endswith(b"*"):
+            fields = line.split()
+            if len(fields) >= 2 and fields[1][-3:].lower() == b"mhz":
+                try:
+                    return float(fields[1][:-3])
+                except ValueError:
+                    return None
+    return None
+
+
+class _DrmDevice:
+    # the readers of one card, a reader is None when the driver lacks the file
+
+    __slots__ = (
+        "name",
+        "busy",
+        "vram_total",
+        "vram_used",
+        "core_clock",
+        "core_clock_mhz",
+        "memory_clock",
+        "power",
+        "power_cap",
+        "temperature",
+    )
+
+    name: str
+    busy: Optional[FileReader]
+    vram_total: Optional[FileReader]
+    vram_used: Optional[FileReader]
+    # pp_dpm_sclk tables (AMD) or plain MHz values (Intel)
+    core_clock: Optional[FileReader]
+    core_clock_mhz: Optional[FileReader]
+    memory_clock: Optional[FileReader]
+    power: Optional[FileReader]
+    power_cap: Optional[FileReader]
+    temperature: Optional[FileReader]
+
+    def readers(self) -> List[FileReader]:
+        return [
+            reader
+            for reader in (getattr(self, key) for key in self.__slots__[1:])
+            if reader is not None
+        ]
+
+
+def _reader(path: str, size: int = 64) -> Optional[FileReader]:
+    return FileReader(path, size=size) if os.path.exists(path) else None
+
+
+class LinuxGpuInformation(GeneralHardware):
+    # the GeneralGpuInformation contract on top of /sys/class/drm,
+    # cards are discovered once and their files stay open between ticks
+
+    gpu_count: Annotated[int, GeneralHardware.SensorValue]
+    gpu_names: Annotated[List[str], GeneralHardware.SensorValue]
+    available_memory: Annotated[array, GeneralHardware.SensorValue]
+    used_memory: Annotated[array, GeneralHardware.SensorValue]
+    memory_usage: Annotated[array, GeneralHardware.SensorValue]
+    usage: Annotated[array, GeneralHardware.SensorValue]
+    power: Annotated[array, GeneralHardware.SensorValue]
+    available_power: Annotated[array, GeneralHardware.SensorValue]
+    temperature: Annotated[array, GeneralHardware.SensorValue]
+    core_clock: Annotated[array, GeneralHardware.SensorValue]
+    memory_clock: Annotated[array, GeneralHardware.SensorValue]
+
+    root: str
+
+    _devices: List[_DrmDevice]
+
+    def __init__(self, root: str = "/"):
+        self.root = root
+
+        print("Linux GPU Initialization:")
+        self._devices = self._discover_devices()
+        self.gpu_count = len(self._devices)
+        self.gpu_names = [device.name for device in self._devices]
+        for name in self.gpu_names:
+            print(f"\tFound: {name}")
+        self.clear()
+
+    def _discover_devices(self) -> List[_DrmDevice]:
+        devices = []
+        drm_dir = os.path.join(self.root, "sys/class/drm")
+        # only "card0", not connectors like "card0-DP-1"
+        for card in list_numbered(drm_dir, "card"):
+            card_dir = os.path.join(drm_dir, f"card{card}")
+            device_dir = os.path.join(card_dir, "device")
+            vendor = read_text(os.path.join(device_dir, "vendor"))
+            try:
+                vendor_id = int(vendor, 16) if vendor else None
+            except ValueError:
+                vendor_id = None
+            if vendor_id not in GPU_VENDOR_NAMES:
+                continue
+
+            device = _DrmDevice()
+            product_name = read_text(os.path.join(device_dir, "product_name"))
+            device_id = read_text(os.path.join(device_dir, "device")) or "unknown"
+            device.name = (
+                product_name or f"{GPU_VENDOR_NAMES[vendor_id]} GPU ({device_id})"
+            )
+            device.busy = _reader(os.path.join(device_dir, "gpu_busy_percent"))
+            device.vram_total = _reader(os.path.join(device_dir, "mem_info_vram_total"))
+            device.vram_used = _reader(os.path.join(device_dir, "mem_info_vram_used"))
+            device.core_clock = _reader(os.path.join(device_dir, "pp_dpm_sclk"), 1024)
+            device.core_clock_mhz = _reader(os.path.join(card_dir, "gt_cur_freq_mhz"))
+            device.memory_clock = _reader(os.path.join(device_dir, "pp_dpm_mclk"), 1024)
+
+            device.power = device.power_cap = device.temperature = None
+            hwmon_dir = os.path.join(device_dir, "hwmon")
+            for hwmon in list_numbered(hwmon_dir, "hwmon"):
+                sensor_dir = os.path.join(hwmon_dir, f"hwmon{hwmon}")
+                device.power = _reader(
+                    os.path.join(sensor_dir, "power1_average")
+                ) or _reader(os.path.join(sensor_dir, "power1_input"))
+                device.power_cap = _reader(os.path.join(sensor_dir, "power1_cap"))
+                # amdgpu has edge, junction and mem, edge is what LHM calls GPU Core
+                numbers = list_numbered(sensor_dir, "temp", "_input")
+                for number in numbers:
+                    label = read_text(os.path.join(sensor_dir, f"temp{number}_label"))
+                    if label in (None, "edge"):
+                        device.temperature = _reader(
+                            os.path.join(sensor_dir, f"temp{number}_input")
+                        )
+                        break
+                if device.temperature is None and numbers:
+                    device.temperature = _reader(
+                        os.path.join(sensor_dir, f"temp{numbers[0]}_input")
+                    )
+                break
+            devices.append(device)
+        return devices
+
+    @staticmethod
+    def _read(reader: Optional[FileReader], default: int = 0) -> int:
+        if reader is None:
+            return default
+        value = reader.read_int()
+        return value if value is not None else default
+
+    def clear(self):
+        # buffers are sized by the discovered GPUs and overwritten by updates
+        gpu_count = self.gpu_count
+        # byte counts stay integers
+        self.available_memory = new_buffer(gpu_count, "q")
+        self.used_memory = new_buffer(gpu_count, "q")
+        self.memory_usage = new_buffer(gpu_count)
+        self.usage = new_buffer(gpu_count)
+        self.power = new_buffer(gpu_count)
+        self.available_power = new_buffer(gpu_count)
+        self.temperature = new_buffer(gpu_count)
+        self.core_clock = new_buffer(gpu_count)
+        self.memory_clock = new_buffer(gpu_count)
+
+    def update(self):
+        for gpu_idx, device in enumerate(self._devices):
+            available_memory = self._read(device.vram_total)
+            used_memory = self._read(device.vram_used)
+            # hwmon reports microwatts and millidegrees
+            power = self._read(device.power) / 1e6
+            power_cap = self._read(device.power_cap) / 1e6
+
+            if device.core_clock is not None:
+                core_clock = parse_dpm_clock(device.core_clock.read()) or 0
+            else:
+                core_clock = self._read(device.core_clock_mhz)
+            memory_clock = (
+                parse_dpm_clock(device.memory_clock.read()) or 0
+                if device.memory_clock is not None
+                else 0
+            )
+
+            self.available_memory[gpu_idx] = available_memory
+            self.used_memory[gpu_idx] = used_memory
+            self.memory_usage[gpu_idx] = (
+                used_memory / available_memory * 100 if available_memory > 0 else 0
+            )
+            self.usage[gpu_idx] = self._read(device.busy)
+            self.power[gpu_idx] = power
+            self.available_power[gpu_idx] = power_cap if power_cap > 0 else power
+            self.temperature[gpu_idx] = self._read(device.temperature) / 1000
+            self.core_clock[gpu_idx] = core_clock
+            self.memory_clock[gpu_idx] = memory_clock
+
+    def dispose(self):
+        for device in self._devices:
+            for reader in device.readers():
+                reader.close()
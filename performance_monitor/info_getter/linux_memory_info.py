@@ -0,0 +1,65 @@
+import os
+from typing import Annotated, Dict
+
+from .file_reader import FileReader
+from .hardware import GeneralHardware
+
+
+class LinuxMemoryInformation(GeneralHardware):
+    update_interval: float = 2.0
+
+    physical_memory_usage: Annotated[float, GeneralHardware.SensorValue]
+    total_physical_memory: Annotated[int, GeneralHardware.SensorValue]
+    total_swap_memory: Annotated[int, GeneralHardware.SensorValue]
+    used_physical_memory: Annotated[int, GeneralHardware.SensorValue]
+    used_swap_memory: Annotated[int, GeneralHardware.SensorValue]
+
+    root: str
+
+    _meminfo_reader: FileReader
+
+    def __init__(self, root: str = "/"):
+        self.clear()
+        self.root = root
+        self._meminfo_reader = FileReader(os.path.join(root, "proc/meminfo"), size=4096)
+
+        print("Linux Memory Initialization:")
+        self.update()
+        print(f"\tTotal Physical Memory: {self.total_physical_memory}")
+        print(f"\tTotal Swap Memory: {self.total_swap_memory}")
+
+    def _read_meminfo(self) -> Dict[bytes, int]:
+        # values are in KiB, e.g. "MemAvailable:   31876544 kB"
+        meminfo = {}
+        for line in (self._meminfo_reader.read() or b"").splitlines():
+            key, _, value = line.partition(b":")
+            fields = value.split()
+            if fields:
+                meminfo[key] = int(fields[0]) * 1024
+        return meminfo
+
+    def clear(self):
+        self.physical_memory_usage = 0
+        self.total_physical_memory = 0
+        self.total_swap_memory = 0
+        self.used_physical_memory = 0
+        self.used_swap_memory = 0
+
+    def update(self):
+        self.clear()
+
+        meminfo = self._read_meminfo()
+        total = meminfo.get(b"MemTotal", 0)
+        available = meminfo.get(b"MemAvailable", meminfo.get(b"MemFree", 0))
+        swap_total = meminfo.get(b"SwapTotal", 0)
+
+        self.total_physical_memory = total
+        self.used_physical_memory = total - available
+        self.physical_memory_usage = (
+            round((total - available) / total * 100, 1) if total else 0
+        )
+        self.total_swap_memory = swap_total
+        self.used_swap_memory = swap_total - meminfo.get(b"SwapFree", swap_total)
+
+    def dispose(self):
+        self._meminfo_reader.close()
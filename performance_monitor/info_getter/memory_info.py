@@ -5,6 +5,8 @@ from .hardware import GeneralHardware
 
 
 class MemoryInformation(GeneralHardware):
+    update_interval: float = 2.0
+
     physical_memory_usage: Annotated[float, GeneralHardware.SensorValue]
     total_physical_memory: Annotated[int, GeneralHardware.SensorValue]
     total_swap_memory: Annotated[int, GeneralHardware.SensorValue]
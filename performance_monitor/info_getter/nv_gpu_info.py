@@ -1,33 +1,38 @@
+import time
 import pynvml
+from array import array
 from typing import Annotated, Tuple, List
 
-from .hardware import GeneralHardware
+from .hardware import GeneralHardware, new_buffer
 
 
 class NvidiaGpuInformation(GeneralHardware):
     PYNVML_AVAILABLE: bool = True
+    # the enforced power limit only changes when the user changes it
+    power_limit_interval: float = 30.0
 
     gpu_count: Annotated[int, GeneralHardware.SensorValue]
     gpu_names: Annotated[List[str], GeneralHardware.SensorValue]
-    available_memory: Annotated[List[int], GeneralHardware.SensorValue]
-    used_memory: Annotated[List[int], GeneralHardware.SensorValue]
-    memory_usage: Annotated[List[float], GeneralHardware.SensorValue]
-    usage: Annotated[List[float], GeneralHardware.SensorValue]
-    power: Annotated[List[float], GeneralHardware.SensorValue]
-    available_power: Annotated[List[float], GeneralHardware.SensorValue]
-    temperature: Annotated[List[float], GeneralHardware.SensorValue]
-    core_clock: Annotated[List[float], GeneralHardware.SensorValue]
-    memory_clock: Annotated[List[float], GeneralHardware.SensorValue]
+    available_memory: Annotated[array, GeneralHardware.SensorValue]
+    used_memory: Annotated[array, GeneralHardware.SensorValue]
+    memory_usage: Annotated[array, GeneralHardware.SensorValue]
+    usage: Annotated[array, GeneralHardware.SensorValue]
+    power: Annotated[array, GeneralHardware.SensorValue]
+    available_power: Annotated[array, GeneralHardware.SensorValue]
+    temperature: Annotated[array, GeneralHardware.SensorValue]
+    core_clock: Annotated[array, GeneralHardware.SensorValue]
+    memory_clock: Annotated[array, GeneralHardware.SensorValue]
 
     _handles: List[Tuple[str, pynvml.struct_c_nvmlDevice_t]]
+    _power_limits_time: float
 
     def __init__(self):
-        self.clear()
-
         print("Nvidia GPU Initialization:")
         self.gpu_count = 0
         self.gpu_names = []
         self._handles = []
+        self._power_limits_time = float("-inf")
+        self.clear()
         try:
             pynvml.nvmlInit()
         except Exception as e:
@@ -43,37 +48,51 @@ class NvidiaGpuInformation(GeneralHardware):
             self._handles.append(gpu_handle)
             self.gpu_names.append(gpu_name)
             print(f"\tFound: {gpu_name}")
+        self.clear()
 
     def clear(self):
-        self.available_memory = []
-        self.used_memory = []
-        self.memory_usage = []
-        self.usage = []
-        self.power = []
-        self.available_power = []
-        self.temperature = []
-        self.core_clock = []
-        self.memory_clock = []
+        # buffers are sized by the discovered GPUs and overwritten by updates
+        gpu_count = self.gpu_count
+        # byte counts stay integers
+        self.available_memory = new_buffer(gpu_count, "q")
+        self.used_memory = new_buffer(gpu_count, "q")
+        self.memory_usage = new_buffer(gpu_count)
+        self.usage = new_buffer(gpu_count)
+        self.power = new_buffer(gpu_count)
+        self.available_power = new_buffer(gpu_count)
+        self.temperature = new_buffer(gpu_count)
+        self.core_clock = new_buffer(gpu_count)
+        self.memory_clock = new_buffer(gpu_count)
 
     def update(self):
-        self.clear()
         if not NvidiaGpuInformation.PYNVML_AVAILABLE:
             return
 
         try:
-            for gpu_handle in self._handles:
+            now = time.monotonic()
+            if now - self._power_limits_time >= self.power_limit_interval:
+                for gpu_idx, gpu_handle in enumerate(self._handles):
+                    self.available_power[gpu_idx] = (
+                        pynvml.nvmlDeviceGetEnforcedPowerLimit(gpu_handle) / 1000
+                    )
+                self._power_limits_time = now
+
+            for gpu_idx, gpu_handle in enumerate(self._handles):
                 mem_info = pynvml.nvmlDeviceGetMemoryInfo(gpu_handle)
-                self.available_memory.append(mem_info.total)
-                self.used_memory.append(mem_info.used)
-                self.memory_usage.append((mem_info.used / mem_info.total) * 100)
-                self.usage.append(pynvml.nvmlDeviceGetUtilizationRates(gpu_handle).gpu)
-                self.power.append(pynvml.nvmlDeviceGetPowerUsage(gpu_handle) / 1000)
-                self.available_power.append(
-                    pynvml.nvmlDeviceGetEnforcedPowerLimit(gpu_handle) / 1000
+                self.available_memory[gpu_idx] = mem_info.total
+                self.used_memory[gpu_idx] = mem_info.used
+                self.memory_usage[gpu_idx] = (mem_info.used / mem_info.total) * 100
+                self.usage[gpu_idx] = pynvml.nvmlDeviceGetUtilizationRates(
+                    gpu_handle
+                ).gpu
+                self.power[gpu_idx] = pynvml.nvmlDeviceGetPowerUsage(gpu_handle) / 1000
+                self.temperature[gpu_idx] = pynvml.nvmlDeviceGetTemperatureV(
+                    gpu_handle, 0
+                )
+                self.core_clock[gpu_idx] = pynvml.nvmlDeviceGetClockInfo(gpu_handle, 0)
+                self.memory_clock[gpu_idx] = pynvml.nvmlDeviceGetClockInfo(
+                    gpu_handle, 2
                 )
-                self.temperature.append(pynvml.nvmlDeviceGetTemperatureV(gpu_handle, 0))
-                self.core_clock.append(pynvml.nvmlDeviceGetClockInfo(gpu_handle, 0))
-                self.memory_clock.append(pynvml.nvmlDeviceGetClockInfo(gpu_handle, 2))
         except Exception as _:
             NvidiaGpuInformation.PYNVML_AVAILABLE = False
             self.gpu_count = 0
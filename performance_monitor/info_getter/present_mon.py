@@ -0,0 +1,137 @@
+from typing import Dict, List, Optional, Tuple
+
+
+class PresentMonParser:
+    # turns the CSV that PresentMon writes to stdout into frame times in
+    # milliseconds, fed with raw chunks of the pipe; the header locates the
+    # MsBetweenPresents column once, then whole chunks are split at once and
+    # only that column is converted, a partial last row waits for the next chunk
+
+    column_name: str = "msbetweenpresents"
+    process_column_name: str = "application"
+    time_column_name: str = "timeinseconds"
+
+    column: Optional[int]
+    process_column: Optional[int]
+    time_column: Optional[int]
+    column_count: int
+
+    _pending: bytes
+
+    def __init__(self):
+        self.column = None
+        self.process_column = None
+        self.time_column = None
+        self.column_count = 0
+        self._pending = b""
+
+    def _parse_header(self, header: bytes):
+        names = [
+            name.strip().lower()
+            for name in header.decode("utf-8", errors="ignore").split(",")
+        ]
+        for index, name in enumerate(names):
+            if name == self.process_column_name:
+                self.process_column = index
+            elif name == self.time_column_name:
+                self.time_column = index
+        for index, name in enumerate(names):
+            if self.column_name in name:
+                self.column = index
+                self.column_count = len(names)
+                return
+        raise RuntimeError("Cannot find frame time column in PresentMon output")
+
+    def take_rows(self, chunk: bytes) -> bytes:
+        # the complete rows of the chunk after the header, b"" when there are
+        # none, for callers that convert the columns themselves
+        data = self._pending + chunk if self._pending else chunk
+        end = data.rfind(b"\n") + 1
+        self._pending = data[end:]
+        if end == 0:
+            return b""
+        body = data[:end]
+        if b"\r" in body:
+            body = body.replace(b"\r", b"")
+
+        if self.column is None:
+            header, _, body = body.partition(b"\n")
+            self._parse_header(header)
+        return body
+
+    def _split_fields(self, body: bytes) -> Optional[List[bytes]]:
+        # rows of the same width line up after joining them, a column is then
+        # every column_count-th field; the last newline leaves an empty field
+        rows = body.count(b"\n")
+        fields = body.replace(b"\n", b",").split(b",")
+        if len(fields) == rows * self.column_count + 1:
+            return fields
+        return None
+
+    def _parse_rows(self, body: bytes) -> Tuple[List[bytes], List[float]]:
+        # the slow path for chunks with rows of an unexpected width
+        column = self.column
+        process_column = self.process_column
+        last_column = max(column, process_column or 0)
+        processes = []
+        frame_times = []
+        for line in body.split(b"\n"):
+            fields = line.split(b",", last_column + 1)
+            if len(fields) > last_column:
+                try:
+                    frame_times.append(float(fields[column]))
+                except ValueError:
+                    continue
+                processes.append(
+                    fields[process_column] if process_column is not None else b""
+                )
+        return processes, frame_times
+
+    def feed(self, chunk: bytes) -> List[float]:
+        body = self.take_rows(chunk)
+        if not body:
+            return []
+        fields = self._split_fields(body)
+        if fields is not None:
+            try:
+                return list(map(float, fields[self.column : -1 : self.column_count]))
+            except ValueError:
+                pass
+        return self._parse_rows(body)[1]
+
+    def feed_processes(self, chunk: bytes) -> Dict[str, List[float]]:
+        # frame times of the chunk grouped by the lower case name of the
+        # process that presented them, for a capture of every process
+        body = self.take_rows(chunk)
+        if not body:
+            return {}
+        if self.process_column is None:
+            raise RuntimeError("Cannot find process column in PresentMon output")
+
+        processes = None
+        fields = self._split_fields(body)
+        if fields is not None:
+            count = self.column_count
+            try:
+                frame_times = list(map(float, fields[self.column : -1 : count]))
+                processes = fields[self.process_column : -1 : count]
+            except ValueError:
+                pass
+        if processes is None:
+            processes, frame_times = self._parse_rows(body)
+
+        by_name: Dict[bytes, List[float]] = {}
+        for process, frame_time in zip(processes, frame_times):
+            process_frame_times = by_name.get(process)
+            if process_frame_times is None:
+                process_frame_times = by_name[process] = []
+            process_frame_times.append(frame_time)
+        # names are decoded once per process instead of once per row
+        grouped: Dict[str, List[float]] = {}
+        for process, process_frame_times in by_name.items():
+            name = process.decode("utf-8", errors="ignore").strip().lower()
+            if name in grouped:
+                grouped[name].extend(process_frame_times)
+            else:
+                grouped[name] = process_frame_times
+        return grouped
@@ -0,0 +1,220 @@
+import json
+import os
+import struct
+import threading
+import time
+import zlib
+from functools import partial
+from typing import Annotated, Any, BinaryIO, Dict, Iterator, Optional, Tuple, Type
+
+from .hardware import GeneralHardware, json_default, report
+
+# file layout: magic, the dictionary record (u32 size + JSON), then records of
+# (f64 timestamp, u32 size, zlib data) compressed against that dictionary
+RECORD_MAGIC = b"PMREC\x01"
+_dictionary_header = struct.Struct("<I")
+_record_header = struct.Struct("<dI")
+
+
+def _read_dictionary(file: BinaryIO) -> bytes:
+    if file.read(len(RECORD_MAGIC)) != RECORD_MAGIC:
+        raise ValueError(f"Not a sensor record file: {file.name}")
+    header = file.read(_dictionary_header.size)
+    if len(header) < _dictionary_header.size:
+        raise ValueError(f"Truncated sensor record file: {file.name}")
+    (size,) = _dictionary_header.unpack(header)
+    dictionary = file.read(size)
+    if len(dictionary) < size:
+        raise ValueError(f"Truncated sensor record file: {file.name}")
+    return dictionary
+
+
+def _complete_length(file: BinaryIO, file_size: int) -> int:
+    # the offset after the last complete record, read from past the dictionary
+    end = file.tell()
+    while end + _record_header.size <= file_size:
+        _, size = _record_header.unpack(file.read(_record_header.size))
+        if end + _record_header.size + size > file_size:
+            break
+        end += _record_header.size + size
+        file.seek(end)
+    return end
+
+
+def read_records(path: str) -> Iterator[Tuple[float, Dict[str, Dict[str, Any]]]]:
+    with open(path, "rb", buffering=1 << 20) as file:
+        dictionary = _read_dictionary(file)
+        while True:
+            header = file.read(_record_header.size)
+            if len(header) < _record_header.size:
+                # end of the log, or a record cut short by a crash
+                return
+            timestamp, size = _record_header.unpack(header)
+            data = file.read(size)
+            if len(data) < size:
+                return
+            decompressor = zlib.decompressobj(zdict=dictionary)
+            payload = decompressor.decompress(data) + decompressor.flush()
+            yield timestamp, json.loads(payload)
+
+
+class RecordWriter:
+    # append-only sink, every tick of the combiner becomes one record;
+    # snapshots share nearly all of their keys, so the first snapshot of the
+    # file is used as a zlib dictionary and each record stays a few hundred bytes
+
+    path: str
+    flush_interval: float
+
+    _file: Optional[BinaryIO]
+    _dictionary: Optional[bytes]
+    _last_flush_time: float
+    _lock: threading.Lock
+
+    def __init__(
+        self, path: str, flush_interval: float = 5.0, buffer_size: int = 1 << 20
+    ):
+        self.path = path
+        self.flush_interval = flush_interval
+        self._dictionary = None
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            # appending to an earlier recording reuses its dictionary; a record
+            # cut short by a crash is dropped, as reading stops at it and
+            # everything appended after it would be lost
+            with open(path, "r+b") as file:
+                self._dictionary = _read_dictionary(file)
+                file.truncate(_complete_length(file, os.fstat(file.fileno()).st_size))
+        self._file = open(path, "ab", buffering=buffer_size)
+        self._last_flush_time = time.monotonic()
+        self._lock = threading.Lock()
+
+    def append(self, timestamp: float, info: Dict[str, Dict[str, Any]]):
+        payload = json.dumps(info, separators=(",", ":"), default=json_default).encode("utf-8")
+        with self._lock:
+            if self._file is None:
+                return
+            if self._dictionary is None:
+                self._dictionary = payload
+                self._file.write(
+                    RECORD_MAGIC + _dictionary_header.pack(len(payload)) + payload
+                )
+            compressor = zlib.compressobj(level=1, zdict=self._dictionary)
+            data = compressor.compress(payload) + compressor.flush()
+            self._file.write(_record_header.pack(timestamp, len(data)) + data)
+
+            # writes are buffered, a crash loses at most flush_interval seconds
+            now = time.monotonic()
+            if now - self._last_flush_time >= self.flush_interval:
+                self._file.flush()
+                self._last_flush_time = now
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class ReplayHardware(GeneralHardware):
+    # stands in for a getter of the recording, sensor values come from the replay
+
+    _replay: "Replay"
+    _name: str
+
+    def __init__(self, replay: "Replay", name: str):
+        self._replay = replay
+        self._name = name
+        self.update()
+
+    def clear(self):
+        pass
+
+    def dispose(self):
+        pass
+
+    def update(self):
+        for key, value in self._replay.info[self._name]["sensors"].items():
+            setattr(self, key, value)
+
+
+class Replay:
+    # plays a recording back in its own time scale, speed 0 steps one record per tick
+
+    path: str
+    speed: float
+    timestamp: float
+    info: Dict[str, Dict[str, Any]]
+
+    _records: Iterator[Tuple[float, Dict[str, Dict[str, Any]]]]
+    _next: Optional[Tuple[float, Dict[str, Dict[str, Any]]]]
+    _start_timestamp: float
+    _start_time: Optional[float]
+    _lock: threading.Lock
+
+    def __init__(self, path: str, speed: float = 1.0):
+        self.path = path
+        self.speed = speed
+        self._records = read_records(path)
+        first = next(self._records, None)
+        if first is None:
+            raise ValueError(f"No records in {path}")
+        self.timestamp, self.info = first
+        self._next = next(self._records, None)
+        self._start_timestamp = self.timestamp
+        self._start_time = None
+        self._lock = threading.Lock()
+
+    @property
+    def finished(self) -> bool:
+        return self._next is None
+
+    def getter_cls(self, name: str) -> Type[ReplayHardware]:
+        # a class named after the recorded getter with the recorded sensor keys,
+        # so types and field selections look the same as with the hardware
+        info = self.info[name]
+        annotations = {
+            key: Annotated[Any, GeneralHardware.SensorValue] for key in info["sensors"]
+        }
+        return type(
+            info["type"],
+            (ReplayHardware,),
+            {"__annotations__": annotations, "__module__": __name__},
+        )
+
+    def getters_dict(
+        self, getters_dict: Dict[str, Optional[Type[GeneralHardware]]]
+    ) -> Dict[str, Optional[Any]]:
+        # getters missing from the recording are disabled
+        return {
+            name: partial(self.getter_cls(name), self, name) if name in self.info else None
+            for name in getters_dict
+        }
+
+    def advance(self) -> bool:
+        # moves to the latest record that is due, returns whether it is a new one
+        with self._lock:
+            if self._start_time is None:
+                self._start_time = time.monotonic()
+                return True
+            if self._next is None:
+                return False
+
+            if self.speed > 0:
+                elapsed = time.monotonic() - self._start_time
+                target = self._start_timestamp + elapsed * self.speed
+            else:
+                target = self._next[0]
+
+            advanced = False
+            while self._next is not None and self._next[0] <= target:
+                self.timestamp, self.info = self._next
+                self._next = next(self._records, None)
+                advanced = True
+            if self._next is None:
+                report(f"Replay of {self.path} finished, keeping the last snapshot")
+            return advanced
+
+    def close(self):
+        with self._lock:
+            self._records.close()
+            self._next = None
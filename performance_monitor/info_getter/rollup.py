@@ -0,0 +1,248 @@
+import math
+import threading
+from array import array
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .history import Ring, flatten_info, match_sensor
+
+
+class P2Quantile:
+    # streaming quantile estimate with five markers (Jain & Chlamtac's P-square),
+    # constant memory and O(1) per value
+
+    __slots__ = ("p", "count", "heights", "positions", "desired", "increments")
+
+    def __init__(self, p: float):
+        self.p = p
+        self.increments = (0.0, p / 2, p, (1 + p) / 2, 1.0)
+        self.heights = [0.0] * 5
+        self.positions = [0, 1, 2, 3, 4]
+        self.desired = [0.0] * 5
+        self.count = 0
+
+    def reset(self):
+        self.count = 0
+
+    def add(self, value: float):
+        heights = self.heights
+        if self.count < 5:
+            heights[self.count] = value
+            self.count += 1
+            if self.count == 5:
+                heights.sort()
+                self.positions[:] = [0, 1, 2, 3, 4]
+                p = self.p
+                self.desired[:] = [0.0, 2 * p, 4 * p, 2 + 2 * p, 4.0]
+            return
+        self.count += 1
+
+        if value < heights[0]:
+            heights[0] = value
+            cell = 0
+        elif value >= heights[4]:
+            heights[4] = value
+            cell = 3
+        else:
+            cell = 0
+            while value >= heights[cell + 1]:
+                cell += 1
+
+        positions = self.positions
+        desired = self.desired
+        for i in range(cell + 1, 5):
+            positions[i] += 1
+        for i in range(5):
+            desired[i] += self.increments[i]
+
+        for i in (1, 2, 3):
+            delta = desired[i] - positions[i]
+            if (delta >= 1 and positions[i + 1] - positions[i] > 1) or (
+                delta <= -1 and positions[i - 1] - positions[i] < -1
+            ):
+                step = 1 if delta > 0 else -1
+                height = self._parabolic(i, step)
+                if not heights[i - 1] < height < heights[i + 1]:
+                    height = heights[i] + step * (
+                        heights[i + step] - heights[i]
+                    ) / (positions[i + step] - positions[i])
+                heights[i] = height
+                positions[i] += step
+
+    def _parabolic(self, i: int, step: int) -> float:
+        heights = self.heights
+        positions = self.positions
+        return heights[i] + step / (positions[i + 1] - positions[i - 1]) * (
+            (positions[i] - positions[i - 1] + step)
+            * (heights[i + 1] - heights[i])
+            / (positions[i + 1] - positions[i])
+            + (positions[i + 1] - positions[i] - step)
+            * (heights[i] - heights[i - 1])
+            / (positions[i] - positions[i - 1])
+        )
+
+    def value(self) -> float:
+        if self.count == 0:
+            return math.nan
+        if self.count <= 5:
+            # too few values for the markers, use the exact quantile
+            ordered = sorted(self.heights[: self.count])
+            return ordered[min(self.count - 1, int(self.p * self.count))]
+        return self.heights[2]
+
+
+class _Series:
+    # the open bucket of one sensor in one tier, and its finished buckets
+
+    __slots__ = ("minimum", "maximum", "total", "count", "last", "quantile", "columns")
+
+    def __init__(self, ring: Ring):
+        self.quantile = P2Quantile(0.95)
+        self.columns = tuple(ring.new_column("d") for _ in RollupTier.stats)
+        self.reset()
+
+    def reset(self):
+        self.minimum = math.inf
+        self.maximum = -math.inf
+        self.total = 0.0
+        self.count = 0
+        self.last = math.nan
+        self.quantile.reset()
+
+    def add(self, value: float):
+        if value != value:
+            # NaN means the sensor had no value in this sample
+            return
+        if value < self.minimum:
+            self.minimum = value
+        if value > self.maximum:
+            self.maximum = value
+        self.total += value
+        self.count += 1
+        self.last = value
+        self.quantile.add(value)
+
+    def flush(self, index: int):
+        minimum, maximum, mean, last, p95 = self.columns
+        if self.count:
+            minimum[index] = self.minimum
+            maximum[index] = self.maximum
+            mean[index] = self.total / self.count
+            last[index] = self.last
+            p95[index] = self.quantile.value()
+        else:
+            for column in self.columns:
+                column[index] = math.nan
+        self.reset()
+
+
+class RollupTier:
+    stats: Tuple[str, ...] = ("min", "max", "mean", "last", "p95")
+
+    resolution: float
+    retention: float
+
+    _ring: Ring
+    _series: Dict[str, _Series]
+    _bucket: Optional[int]
+
+    def __init__(self, resolution: float, retention: float):
+        if resolution <= 0 or retention < resolution:
+            raise ValueError(f"Invalid rollup tier: {resolution}s for {retention}s")
+        self.resolution = resolution
+        self.retention = retention
+        self._ring = Ring(int(retention // resolution))
+        self._series = {}
+        self._bucket = None
+
+    def add(self, timestamp: float, values: List[Tuple[str, float]]):
+        bucket = int(timestamp // self.resolution)
+        if self._bucket is not None and bucket != self._bucket:
+            index = self._ring.next_index(self._bucket * self.resolution)
+            for series in self._series.values():
+                series.flush(index)
+        self._bucket = bucket
+
+        for path, value in values:
+            series = self._series.get(path)
+            if series is None:
+                series = self._series[path] = _Series(self._ring)
+            series.add(value)
+
+    def query(
+        self, patterns: Sequence[str], since: Optional[float], stats: Sequence[str]
+    ) -> Tuple[array, Dict[str, Dict[str, array]]]:
+        # only finished buckets are returned, times are the bucket starts
+        start, stop = self._ring.range_since(since)
+        times = self._ring.slice(self._ring.times, start, stop)
+        indexes = [self.stats.index(stat) for stat in stats]
+        values = {
+            path: {
+                self.stats[i]: self._ring.slice(series.columns[i], start, stop)
+                for i in indexes
+            }
+            for path, series in self._series.items()
+            if any(match_sensor(path, pattern) for pattern in patterns)
+        }
+        return times, values
+
+
+def parse_rollup_tiers(spec: str) -> List[Tuple[float, float]]:
+    # parses "1:3600,60:86400" into (resolution, retention) pairs in seconds
+    tiers = []
+    for item in spec.split(","):
+        if not item.strip():
+            continue
+        resolution, sep, retention = item.partition(":")
+        try:
+            if not sep:
+                raise ValueError
+            tiers.append((float(resolution), float(retention)))
+        except ValueError:
+            raise ValueError(
+                f"Invalid rollup tier: {item}, expected RESOLUTION:RETENTION"
+            )
+    return tiers
+
+
+class RollupStore:
+    # min/max/mean/last/p95 per sensor at several resolutions, every tier has
+    # a fixed number of buckets so memory does not grow with the session
+
+    tiers: List[RollupTier]
+
+    _lock: threading.Lock
+
+    def __init__(self, tiers: Sequence[Tuple[float, float]]):
+        self.tiers = sorted(
+            (RollupTier(resolution, retention) for resolution, retention in tiers),
+            key=lambda tier: tier.resolution,
+        )
+        self._lock = threading.Lock()
+
+    def append(self, timestamp: float, info: Dict[str, Dict[str, Any]]):
+        values = list(flatten_info(info))
+        with self._lock:
+            for tier in self.tiers:
+                tier.add(timestamp, values)
+
+    def sensors(self) -> List[str]:
+        with self._lock:
+            return list(self.tiers[0]._series) if self.tiers else []
+
+    def pick_tier(self, resolution: float) -> Optional[RollupTier]:
+        # the coarsest tier that is still at least as fine as asked for
+        picked = None
+        for tier in self.tiers:
+            if tier.resolution <= resolution:
+                picked = tier
+        return picked
+
+    def query(
+        self,
+        tier: RollupTier,
+        patterns: Sequence[str],
+        since: Optional[float] = None,
+        stats: Sequence[str] = RollupTier.stats,
+    ) -> Tuple[array, Dict[str, Dict[str, array]]]:
+        with self._lock:
+            return tier.query(patterns, since, stats)
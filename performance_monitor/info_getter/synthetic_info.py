@@ -0,0 +1,364 @@
+import math
+import random
+import time
+from array import array
+from dataclasses import dataclass, fields
+from typing import Annotated, Dict, List, Optional
+
+from .frame_stats import FrameTimeHardware
+from .hardware import GeneralHardware, new_buffer
+
+
+@dataclass(frozen=True)
+class SyntheticTopology:
+    cpus: int = 1
+    threads: int = 16
+    gpus: int = 1
+    seed: int = 0
+
+    @classmethod
+    def from_options(cls, options: Dict[str, str]) -> "SyntheticTopology":
+        names = {item.name for item in fields(cls)}
+        values = {}
+        for key, value in options.items():
+            if key not in names:
+                raise ValueError(f"Unknown synthetic backend option: {key}")
+            try:
+                values[key] = int(value)
+            except ValueError:
+                raise ValueError(f"Invalid synthetic backend option: {key}={value}")
+            if values[key] < 0:
+                raise ValueError(f"Invalid synthetic backend option: {key}={value}")
+        return cls(**values)
+
+
+def _wave(now: float, period: float, phase: float) -> float:
+    # between 0 and 1
+    return 0.5 + 0.5 * math.sin(2 * math.pi * (now / period + phase))
+
+
+def _clamp(value: float, lowest: float, highest: float) -> float:
+    return lowest if value < lowest else highest if value > highest else value
+
+
+def _follow(current: float, target: float, elapsed: float, tau: float) -> float:
+    # first order lag, temperatures trail the load like a heat sink would
+    return current + (target - current) * (1 - math.exp(-elapsed / tau))
+
+
+class _SyntheticHardware(GeneralHardware):
+    topology: SyntheticTopology
+
+    _random: random.Random
+    _last_time: float
+
+    def __init__(self, **options: str):
+        self.topology = SyntheticTopology.from_options(options)
+        # every getter has its own stream, so adding one does not shift the others
+        self._random = random.Random(f"{self.topology.seed}-{type(self).__name__}")
+        self._last_time = time.monotonic()
+
+    def _elapsed(self) -> float:
+        now = time.monotonic()
+        elapsed = now - self._last_time
+        self._last_time = now
+        return elapsed
+
+    def dispose(self):
+        pass
+
+
+class SyntheticTimeInformation(_SyntheticHardware):
+    time: Annotated[float, GeneralHardware.SensorValue]
+    boot_time: Annotated[float, GeneralHardware.SensorValue]
+
+    _boot_timestamp: float
+
+    def __init__(self, **options: str):
+        super().__init__(**options)
+        self.clear()
+        self._boot_timestamp = time.time() - 3600.0
+
+    def clear(self):
+        self.time = 0.0
+        self.boot_time = 0.0
+
+    def update(self):
+        self.time = time.time()
+        self.boot_time = self.time - self._boot_timestamp
+
+
+class SyntheticCpuInformation(_SyntheticHardware):
+    cpu_count: Annotated[int, GeneralHardware.SensorValue]
+    cpu_name: Annotated[List[str], GeneralHardware.SensorValue]
+    temperature: Annotated[List[array], GeneralHardware.SensorValue]
+    clock: Annotated[List[array], GeneralHardware.SensorValue]
+    usage: Annotated[List[array], GeneralHardware.SensorValue]
+    load: Annotated[List[array], GeneralHardware.SensorValue]
+    voltage: Annotated[List[array], GeneralHardware.SensorValue]
+    power: Annotated[array, GeneralHardware.SensorValue]
+
+    _thread_count: int
+    _core_count: int
+    _thread_phases: List[List[float]]
+    _thread_periods: List[List[float]]
+    _temperatures: List[array]
+
+    def __init__(self, **options: str):
+        super().__init__(**options)
+
+        threads = self._thread_count = max(1, self.topology.threads)
+        # two threads per core as with SMT
+        self._core_count = max(1, threads // 2)
+        self.cpu_count = self.topology.cpus
+        self.cpu_name = [
+            f"Synthetic CPU {cpu_idx} ({self._core_count}C/{threads}T)"
+            for cpu_idx in range(self.cpu_count)
+        ]
+        self._thread_phases = [
+            [self._random.random() for _ in range(threads)]
+            for _ in range(self.cpu_count)
+        ]
+        self._thread_periods = [
+            [self._random.uniform(5.0, 15.0) for _ in range(threads)]
+            for _ in range(self.cpu_count)
+        ]
+        self._temperatures = [
+            array("d", [40.0]) * self._core_count for _ in range(self.cpu_count)
+        ]
+        self.clear()
+
+        print("Synthetic CPU Initialization:")
+        for name in self.cpu_name:
+            print(f"\tFound: {name}")
+
+    def clear(self):
+        # buffers are sized by the topology and overwritten by updates
+        cpu_range = range(self.cpu_count)
+        self.temperature = [new_buffer(self._core_count) for _ in cpu_range]
+        self.clock = [new_buffer(self._core_count) for _ in cpu_range]
+        self.usage = [new_buffer(1) for _ in cpu_range]
+        self.load = [new_buffer(self._thread_count) for _ in cpu_range]
+        self.voltage = [new_buffer(self._core_count) for _ in cpu_range]
+        self.power = new_buffer(self.cpu_count)
+
+    def update(self):
+        elapsed = self._elapsed()
+        now = time.monotonic()
+        gauss = self._random.gauss
+
+        for cpu_idx in range(self.cpu_count):
+            # a slow package wide trend plus a faster wave and noise per thread
+            trend = _wave(now, 60.0, cpu_idx / max(1, self.cpu_count))
+            load = self.load[cpu_idx]
+            periods = self._thread_periods[cpu_idx]
+            phases = self._thread_phases[cpu_idx]
+            for thread_idx in range(self._thread_count):
+                load[thread_idx] = _clamp(
+                    100
+                    * (
+                        0.1
+                        + 0.5 * trend
+                        + 0.3 * _wave(now, periods[thread_idx], phases[thread_idx])
+                    )
+                    + gauss(0, 5),
+                    0.0,
+                    100.0,
+                )
+
+            temperatures = self._temperatures[cpu_idx]
+            temperature = self.temperature[cpu_idx]
+            clock = self.clock[cpu_idx]
+            voltage = self.voltage[cpu_idx]
+            for core_idx in range(self._core_count):
+                # the busier of the two threads of the core
+                first = core_idx * 2
+                core_load = (
+                    max(load[first], load[first + 1])
+                    if first + 1 < self._thread_count
+                    else load[first]
+                )
+                temperatures[core_idx] = _follow(
+                    temperatures[core_idx], 35 + 0.6 * core_load, elapsed, 8.0
+                )
+                temperature[core_idx] = round(temperatures[core_idx], 1)
+                # boost with load, back off above 90 degrees
+                core_clock = (
+                    3000
+                    + 20 * core_load
+                    - 40 * max(0.0, temperatures[core_idx] - 90)
+                    + gauss(0, 15)
+                )
+                clock[core_idx] = core_clock
+                voltage[core_idx] = 0.75 + core_clock / 5000 * 0.6
+
+            average_load = sum(load) / len(load)
+            self.usage[cpu_idx][0] = average_load
+            self.power[cpu_idx] = 15 + 1.5 * self._core_count * average_load / 16
+
+
+class SyntheticGpuInformation(_SyntheticHardware):
+    gpu_count: Annotated[int, GeneralHardware.SensorValue]
+    gpu_names: Annotated[List[str], GeneralHardware.SensorValue]
+    available_memory: Annotated[array, GeneralHardware.SensorValue]
+    used_memory: Annotated[array, GeneralHardware.SensorValue]
+    memory_usage: Annotated[array, GeneralHardware.SensorValue]
+    usage: Annotated[array, GeneralHardware.SensorValue]
+    power: Annotated[array, GeneralHardware.SensorValue]
+    available_power: Annotated[array, GeneralHardware.SensorValue]
+    temperature: Annotated[array, GeneralHardware.SensorValue]
+    core_clock: Annotated[array, GeneralHardware.SensorValue]
+    memory_clock: Annotated[array, GeneralHardware.SensorValue]
+
+    total_memory: int = 24 * 1024 * 1024 * 1024
+    power_limit: float = 450.0
+
+    _phases: List[float]
+    _temperatures: List[float]
+    _used_memory: List[float]
+
+    def __init__(self, **options: str):
+        super().__init__(**options)
+        self.gpu_count = self.topology.gpus
+        self.clear()
+        self.gpu_names = [f"Synthetic GPU {gpu_idx}" for gpu_idx in range(self.gpu_count)]
+        self._phases = [self._random.random() for _ in range(self.gpu_count)]
+        self._temperatures = [35.0] * self.gpu_count
+        self._used_memory = [
+            self._random.uniform(0.1, 0.5) * self.total_memory
+            for _ in range(self.gpu_count)
+        ]
+
+        print("Synthetic GPU Initialization:")
+        for name in self.gpu_names:
+            print(f"\tFound: {name}")
+
+    def clear(self):
+        # buffers are sized by the discovered GPUs and overwritten by updates
+        gpu_count = self.gpu_count
+        # byte counts stay integers
+        self.available_memory = new_buffer(gpu_count, "q")
+        self.used_memory = new_buffer(gpu_count, "q")
+        self.memory_usage = new_buffer(gpu_count)
+        self.usage = new_buffer(gpu_count)
+        self.power = new_buffer(gpu_count)
+        self.available_power = new_buffer(gpu_count)
+        self.temperature = new_buffer(gpu_count)
+        self.core_clock = new_buffer(gpu_count)
+        self.memory_clock = new_buffer(gpu_count)
+
+    def update(self):
+        elapsed = self._elapsed()
+        now = time.monotonic()
+        gauss = self._random.gauss
+
+        for gpu_idx in range(self.gpu_count):
+            # mostly busy with short idle dips, like a game or a training job
+            usage = _clamp(
+                100 * (0.55 + 0.45 * _wave(now, 20.0, self._phases[gpu_idx]) ** 0.3)
+                - 60 * (_wave(now, 3.7, self._phases[gpu_idx]) > 0.97)
+                + gauss(0, 3),
+                0.0,
+                100.0,
+            )
+            self._temperatures[gpu_idx] = _follow(
+                self._temperatures[gpu_idx], 35 + 0.5 * usage, elapsed, 15.0
+            )
+            # device memory drifts as a random walk
+            self._used_memory[gpu_idx] = _clamp(
+                self._used_memory[gpu_idx]
+                + gauss(0, 0.002) * self.total_memory * max(elapsed, 0.1),
+                0.05 * self.total_memory,
+                0.95 * self.total_memory,
+            )
+            used_memory = int(self._used_memory[gpu_idx])
+
+            self.available_memory[gpu_idx] = self.total_memory
+            self.used_memory[gpu_idx] = used_memory
+            self.memory_usage[gpu_idx] = used_memory / self.total_memory * 100
+            self.usage[gpu_idx] = usage
+            self.power[gpu_idx] = min(self.power_limit, 30 + 3.8 * usage + gauss(0, 5))
+            self.available_power[gpu_idx] = self.power_limit
+            self.temperature[gpu_idx] = round(self._temperatures[gpu_idx], 1)
+            self.core_clock[gpu_idx] = 300 + 22 * usage + gauss(0, 10)
+            self.memory_clock[gpu_idx] = 10501.0 if usage > 5 else 405.0
+
+
+class SyntheticMemoryInformation(_SyntheticHardware):
+    physical_memory_usage: Annotated[float, GeneralHardware.SensorValue]
+    total_physical_memory: Annotated[int, GeneralHardware.SensorValue]
+    total_swap_memory: Annotated[int, GeneralHardware.SensorValue]
+    used_physical_memory: Annotated[int, GeneralHardware.SensorValue]
+    used_swap_memory: Annotated[int, GeneralHardware.SensorValue]
+
+    def __init__(self, **options: str):
+        super().__init__(**options)
+        self.clear()
+
+    def clear(self):
+        # 64 GiB per socket
+        self.total_physical_memory = max(1, self.topology.cpus) * 64 * 1024**3
+        self.total_swap_memory = 16 * 1024**3
+        self.physical_memory_usage = 0
+        self.used_physical_memory = 0
+        self.used_swap_memory = 0
+
+    def update(self):
+        self.clear()
+        usage = _clamp(
+            45 + 20 * _wave(time.monotonic(), 300.0, 0.0) + self._random.gauss(0, 1),
+            0.0,
+            100.0,
+        )
+        self.physical_memory_usage = round(usage, 1)
+        self.used_physical_memory = int(self.total_physical_memory * usage / 100)
+        self.used_swap_memory = int(self.total_swap_memory * 0.05)
+
+
+class SyntheticNetworkInformation(_SyntheticHardware):
+    upload: Annotated[float, GeneralHardware.SensorValue]
+    download: Annotated[float, GeneralHardware.SensorValue]
+
+    def __init__(self, **options: str):
+        super().__init__(**options)
+        self.clear()
+
+    def clear(self):
+        self.upload = 0
+        self.download = 0
+
+    def update(self):
+        self.clear()
+        # background traffic with the odd download burst
+        burst = self._random.random() < 0.05
+        self.upload = self._random.expovariate(1 / 20e3)
+        self.download = self._random.expovariate(1 / (50e6 if burst else 100e3))
+
+
+class SyntheticFrameTimeInformation(_SyntheticHardware, FrameTimeHardware):
+    def __init__(self, **options: str):
+        super().__init__(**options)
+        self._init_windows()
+        self.target_process = "synthetic.exe"
+
+    def update(self):
+        # frames for the time since the last update, the longest window at most
+        elapsed = min(self._elapsed(), max(self.window_times))
+        now = time.monotonic()
+        gauss = self._random.gauss
+        random = self._random.random
+        fps = 120 + 24 * _wave(now, 45.0, 0.0)
+        frame_times = []
+        frames_time = 0.0
+        while frames_time < elapsed * 1000:
+            frame_time = max(0.5, gauss(1000 / fps, 0.4))
+            # a stutter now and then drags the lows down
+            if random() < 0.002:
+                frame_time *= 4
+            frame_times.append(frame_time)
+            frames_time += frame_time
+        self._windows.add(frame_times, now)
+        self._set_stats(self._windows.stats(now))
+        if self.fps is not None:
+            self.processes = [self.target_process]
+            self.process_fps = [self.window_fps[0]]
@@ -9,8 +9,12 @@ class TimeInformation(GeneralHardware):
     time: Annotated[float, GeneralHardware.SensorValue]
     boot_time: Annotated[float, GeneralHardware.SensorValue]
 
+    _boot_timestamp: float
+
     def __init__(self):
         self.clear()
+        # the boot timestamp does not change while we are running
+        self._boot_timestamp = psutil.boot_time()
 
     def clear(self):
         self.time = 0.0
@@ -23,4 +27,4 @@ class TimeInformation(GeneralHardware):
         self.clear()
 
         self.time = datetime.now().timestamp()
-        self.boot_time = self.time - psutil.boot_time()
+        self.boot_time = self.time - self._boot_timestamp
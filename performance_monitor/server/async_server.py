@@ -0,0 +1,251 @@
+import asyncio
+from http import HTTPStatus
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+from .combiner import Combiner, Snapshot
+from .selection import Selection, SelectionError
+from .handler import (
+    Response,
+    get_bad_request_response,
+    get_error_response,
+    get_history_response,
+    get_json_response,
+    get_request_selection,
+    get_snapshot_response,
+    get_stream_event,
+    get_stream_timeout,
+    is_delta_stream,
+    stream_headers,
+)
+
+
+class BadRequest(Exception):
+    pass
+
+
+class AsyncMetricsServer:
+    max_header_count: int = 100
+    max_body_size: int = 64 * 1024
+
+    _server: Optional[asyncio.AbstractServer]
+    _refresh_futures: Dict[Optional[Selection], asyncio.Future]
+    _published_event: Optional[asyncio.Event]
+
+    def __init__(
+        self,
+        combiner: Combiner,
+        endpoint_path: str = "/info",
+        stream_path: str = "/stream",
+        history_path: str = "/history",
+        max_connections: int = 1024,
+        keep_alive_timeout: float = 15.0,
+    ):
+        self.combiner = combiner
+        self.endpoint_path = endpoint_path
+        self.stream_path = stream_path
+        self.history_path = history_path
+        self.max_connections = max_connections
+        self.keep_alive_timeout = keep_alive_timeout
+
+        self.connection_count = 0
+        self._server = None
+        self._refresh_futures = {}
+        self._published_event = None
+
+    async def _get_snapshot(self, selection: Optional[Selection] = None) -> Snapshot:
+        snapshot = self.combiner.get_fresh_snapshot(selection)
+        if snapshot is not None:
+            return snapshot
+
+        # sampling blocks on the hardware, run it in the executor and share
+        # one in-flight refresh between every request that arrives meanwhile
+        future = self._refresh_futures.get(selection)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(None, self.combiner.get_snapshot, selection)
+            future.add_done_callback(
+                lambda _: self._refresh_futures.pop(selection, None)
+            )
+            self._refresh_futures[selection] = future
+        return await asyncio.shield(future)
+
+    def _on_published(self):
+        # wake every subscriber once, and give the next round a fresh event
+        event, self._published_event = self._published_event, asyncio.Event()
+        event.set()
+
+    async def _stream(self, writer: asyncio.StreamWriter, delta: bool):
+        head = ["HTTP/1.1 200 OK", "Connection: close"]
+        head.extend(f"{key}: {value}" for key, value in stream_headers)
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1"))
+        await writer.drain()
+
+        timeout = get_stream_timeout(self.combiner)
+        last_sequence = 0
+        while True:
+            snapshot = self.combiner.get_fresh_snapshot()
+            if snapshot is None or snapshot.sequence <= last_sequence:
+                event = self._published_event
+                try:
+                    await asyncio.wait_for(event.wait(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    pass
+                snapshot = await self._get_snapshot()
+                if snapshot.sequence <= last_sequence:
+                    continue
+            writer.write(get_stream_event(snapshot, last_sequence, delta))
+            # a slow subscriber waits here, then jumps to the latest snapshot
+            await writer.drain()
+            last_sequence = snapshot.sequence
+
+    async def _read_request(
+        self, reader: asyncio.StreamReader
+    ) -> Optional[Tuple[str, str, str, Dict[str, str], bytes]]:
+        request_line = await reader.readline()
+        if not request_line:
+            return None
+        try:
+            method, path, version = request_line.decode("latin-1").split()
+        except ValueError:
+            raise BadRequest("Malformed request line")
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            if len(headers) >= self.max_header_count:
+                raise BadRequest("Too many headers")
+            key, sep, value = line.decode("latin-1").partition(":")
+            if not sep:
+                raise BadRequest("Malformed header")
+            headers[key.strip().lower()] = value.strip()
+
+        if "chunked" in headers.get("transfer-encoding", "").lower():
+            raise BadRequest("Chunked request body is not supported")
+        try:
+            content_length = int(headers.get("content-length", 0))
+        except ValueError:
+            raise BadRequest("Malformed Content-Length")
+        if content_length < 0 or content_length > self.max_body_size:
+            raise BadRequest("Unacceptable Content-Length")
+        body = await reader.readexactly(content_length) if content_length else b""
+
+        return method, path, version, headers, body
+
+    async def _dispatch(
+        self, method: str, path: str, headers: Dict[str, str], body: bytes
+    ) -> Response:
+        url = urlsplit(path)
+        if url.path == self.history_path and method == "GET":
+            # a query walks up to --history samples, keep it off the loop
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                None, get_history_response, self.combiner, url.query
+            )
+        if url.path != self.endpoint_path:
+            return get_json_response({"err_msg": "Not Found"}, status_code=404)
+        if method != "POST":
+            return get_json_response({"err_msg": "Method Not Allowed"}, status_code=405)
+
+        try:
+            selection = get_request_selection(self.combiner, url.query, body)
+            snapshot = await self._get_snapshot(selection)
+        except SelectionError as exception:
+            return get_bad_request_response(exception)
+        except Exception as exception:
+            return get_error_response(exception)
+        return get_snapshot_response(snapshot, headers.get("if-none-match"))
+
+    @staticmethod
+    def _encode_response(response: Response, keep_alive: bool) -> bytes:
+        status = HTTPStatus(response.status_code)
+        lines = [f"HTTP/1.1 {status.value} {status.phrase}"]
+        lines.extend(f"{key}: {value}" for key, value in response.headers)
+        if response.status_code != 304 and not any(
+            key == "Content-Length" for key, _ in response.headers
+        ):
+            lines.append(f"Content-Length: {len(response.body)}")
+        lines.append("Connection: keep-alive" if keep_alive else "Connection: close")
+        head = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+        return head + response.body
+
+    async def _serve_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ):
+        while True:
+            try:
+                request = await asyncio.wait_for(
+                    self._read_request(reader), timeout=self.keep_alive_timeout
+                )
+            except BadRequest as exception:
+                response = get_bad_request_response(exception)
+                writer.write(self._encode_response(response, keep_alive=False))
+                await writer.drain()
+                return
+            except (asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError):
+                # idle keep-alive connection, truncated request or oversized line
+                return
+            if request is None:
+                return
+
+            method, path, version, headers, body = request
+            connection = headers.get("connection", "").lower()
+            if version == "HTTP/1.0":
+                keep_alive = connection == "keep-alive"
+            else:
+                keep_alive = connection != "close"
+
+            url = urlsplit(path)
+            if method == "GET" and url.path == self.stream_path:
+                await self._stream(writer, is_delta_stream(url.query))
+                return
+
+            response = await self._dispatch(method, path, headers, body)
+            writer.write(self._encode_response(response, keep_alive))
+            # pipelined requests are answered in order, and a client that stops
+            # reading stalls here instead of growing the write buffer
+            await writer.drain()
+            if not keep_alive:
+                return
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ):
+        try:
+            if self.connection_count >= self.max_connections:
+                response = get_json_response({"err_msg": "Too Many Connections"}, 503)
+                response.headers.append(("Retry-After", "1"))
+                writer.write(self._encode_response(response, keep_alive=False))
+                await writer.drain()
+                return
+
+            self.connection_count += 1
+            try:
+                await self._serve_connection(reader, writer)
+            finally:
+                self.connection_count -= 1
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def start(self, host: str, port: int):
+        loop = asyncio.get_running_loop()
+        self._published_event = asyncio.Event()
+        self.combiner.add_listener(
+            lambda _: loop.call_soon_threadsafe(self._on_published)
+        )
+        self._server = await asyncio.start_server(
+            self._handle_connection, host, port, backlog=self.max_connections
+        )
+
+    async def serve_forever(self, host: str, port: int):
+        await self.start(host, port)
+        async with self._server:
+            await self._server.serve_forever()
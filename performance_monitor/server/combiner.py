@@ -1,36 +1,321 @@
+import json
 import threading
-from typing import Any, Dict, List
+import time
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from ..info_getter import (
-    TimeInformation,
-    CpuInformation,
-    GeneralGpuInformation,
-    NvidiaGpuInformation,
-    MemoryInformation,
-    NetworkInformation,
-    FrameTimeInformation,
+    GETTER_NAMES,
     Combiner as BaseCombiner,
+    HistoryStore,
+    RollupStore,
+    Replay,
+    UpdateStats,
+    default_backend,
+    get_getters_dict,
+    json_default,
+    report,
 )
+from .selection import Selection
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    sequence: int
+    timestamp: float
+    data: Tuple[Dict[str, Any], ...]
+    payload: bytes
+    etag: str
+    # sensors that differ from the snapshot published before this one as
+    # (getter index, sensors), None when there is nothing to diff against
+    changes: Optional[Tuple[Tuple[int, Dict[str, Any]], ...]] = None
+    base_sequence: int = 0
+    # Server-Timing value of the tick that produced this snapshot
+    timing: str = ""
+
+    def age(self) -> float:
+        return time.monotonic() - self.timestamp
+
+    # stream events are encoded lazily, once per snapshot for all subscribers
+
+    @cached_property
+    def event(self) -> bytes:
+        return (
+            f"id: {self.sequence}\nevent: snapshot\ndata: ".encode("utf-8")
+            + self.payload
+            + b"\n\n"
+        )
+
+    @cached_property
+    def delta_event(self) -> Optional[bytes]:
+        if self.changes is None:
+            return None
+        delta = {
+            "base": self.base_sequence,
+            "changes": [
+                {"index": index, "sensors": sensors} for index, sensors in self.changes
+            ],
+        }
+        data = json.dumps(delta, default=json_default)
+        return f"id: {self.sequence}\nevent: delta\ndata: {data}\n\n".encode("utf-8")
+
+
+def get_changes(
+    previous: Optional[Snapshot], data: Tuple[Dict[str, Any], ...]
+) -> Optional[Tuple[Tuple[int, Dict[str, Any]], ...]]:
+    if previous is None or len(previous.data) != len(data):
+        return None
+    changes = []
+    for index, (prev_info, info) in enumerate(zip(previous.data, data)):
+        prev_sensors = prev_info["sensors"]
+        sensors = info["sensors"]
+        # records of one getter share their layout and compare as tuples
+        if sensors == prev_sensors:
+            continue
+        changed = {
+            key: value
+            for key, value in sensors.items()
+            if key not in prev_sensors or prev_sensors[key] != value
+        }
+        if changed:
+            changes.append((index, changed))
+    return tuple(changes)
 
 
 class Combiner(BaseCombiner):
     _lock: threading.Lock
+    _snapshot: Optional[Snapshot]
+    _sequence: int
+    _epoch: str
+    _published: threading.Condition
+    _listeners: List[Callable[[Snapshot], None]]
+    _selections: Dict[Tuple[Tuple[str, ...], Tuple[str, ...]], Optional[Selection]]
+    # guards planning into _selections, apart from _lock, which a sample holds
+    # while it waits on the hardware
+    _selections_lock: threading.Lock
+    max_selections: int = 256
 
-    def __init__(self):
+    history: Optional[HistoryStore]
+    rollups: Optional[RollupStore]
+
+    _sampler_thread: Optional[threading.Thread]
+    _sampler_exit_event: threading.Event
+
+    def __init__(
+        self,
+        max_age: float = 0.0,
+        update_intervals: Optional[Dict[str, float]] = None,
+        update_workers: int = 0,
+        update_timeout: Optional[float] = None,
+        history_capacity: int = 0,
+        rollup_tiers: Optional[List[Tuple[float, float]]] = None,
+        replay: Optional[Replay] = None,
+        backend: Optional[str] = None,
+        backend_options: Optional[Dict[str, str]] = None,
+    ):
         super().__init__(
-            getters_dict={
-                "time": TimeInformation,
-                "cpu": CpuInformation,
-                "gpu": GeneralGpuInformation,
-                "nv_gpu": NvidiaGpuInformation,
-                "memory": MemoryInformation,
-                "network": NetworkInformation,
-                "frame_time": FrameTimeInformation,
-            }
+            # a replay brings its own getters, no backend is loaded for it
+            getters_dict=(
+                dict.fromkeys(GETTER_NAMES)
+                if replay is not None
+                else get_getters_dict(
+                    backend or default_backend(), GETTER_NAMES, options=backend_options
+                )
+            ),
+            update_intervals=update_intervals,
+            update_workers=update_workers,
+            update_timeout=update_timeout,
+            replay=replay,
         )
+        self.max_age = max_age
         self._lock = threading.Lock()
+        self._snapshot = None
+        self._sequence = 0
+        # sequences restart with the process, the epoch keeps old etags from matching
+        self._epoch = f"{time.time_ns():x}"
+        self._published = threading.Condition()
+        self._listeners = []
+        self._selections = {}
+        self._selections_lock = threading.Lock()
+
+        self.history = None
+        if history_capacity > 0:
+            self.history = HistoryStore(history_capacity)
+            self.add_sink(self.history)
+
+        self.rollups = None
+        if rollup_tiers:
+            self.rollups = RollupStore(rollup_tiers)
+            self.add_sink(self.rollups)
+
+        self._sampler_thread = None
+        self._sampler_exit_event = threading.Event()
+
+    def _sample(self) -> Snapshot:
+        # must be called with self._lock held
+        data = tuple(self._update(with_sensors=True).values())
+        self._sequence += 1
+        snapshot = Snapshot(
+            sequence=self._sequence,
+            timestamp=time.monotonic(),
+            data=data,
+            # encoded once here, every request for this snapshot reuses the bytes
+            payload=json.dumps(data, default=json_default).encode("utf-8"),
+            etag=f'"{self._epoch}-{self._sequence}"',
+            changes=get_changes(self._snapshot, data),
+            base_sequence=self._snapshot.sequence if self._snapshot else 0,
+            timing=self.update_stats.server_timing(),
+        )
+        # publishing is a single reference swap, readers never see a half-built snapshot
+        self._snapshot = snapshot
+        with self._published:
+            self._published.notify_all()
+        for listener in self._listeners:
+            listener(snapshot)
+        return snapshot
+
+    def _is_fresh(self, snapshot: Optional[Snapshot]) -> bool:
+        return snapshot is not None and snapshot.age() <= self.max_age
+
+    def get_selection(
+        self, getter_names: Tuple[str, ...], field_names: Tuple[str, ...]
+    ) -> Optional[Selection]:
+        # plans are cached per distinct query, None stands for everything
+        key = (getter_names, field_names)
+        selections = self._selections
+        if key in selections:
+            return selections[key]
+
+        with self._selections_lock:
+            # another request may have planned it while we were waiting
+            if key in self._selections:
+                return self._selections[key]
+            selection = None
+            if getter_names or field_names:
+                selection = Selection(self.getters, getter_names, field_names)
+                if selection.complete:
+                    selection = None
+            if len(self._selections) >= self.max_selections:
+                self._selections = {}
+            self._selections[key] = selection
+            return selection
+
+    def _project(self, snapshot: Snapshot, selection: Selection) -> Snapshot:
+        projected = selection.get_cached(snapshot.sequence)
+        if projected is not None:
+            return projected
+        data = selection.project(snapshot.data)
+        projected = Snapshot(
+            sequence=snapshot.sequence,
+            timestamp=snapshot.timestamp,
+            data=data,
+            payload=json.dumps(data, default=json_default).encode("utf-8"),
+            etag=f'"{self._epoch}-{snapshot.sequence}-{selection.tag}"',
+            timing=snapshot.timing,
+        )
+        selection.set_cached(snapshot.sequence, projected)
+        return projected
+
+    def _sample_selection(self, selection: Selection) -> Snapshot:
+        # must be called with self._lock held, only the selected getters are
+        # updated, on the executor and within the timeout like any tick, and
+        # the result is not published as the latest snapshot
+        start = time.perf_counter()
+        getters = {
+            name: getter
+            for name, getter in selection.named_getters
+            if not self._is_running(name)
+        }
+        getter_times = self._run_updates(getters, time.monotonic())
+        stats = UpdateStats(time.perf_counter() - start, getter_times)
+        self._sequence += 1
+        data = selection.project_getters(self.getter_sensors)
+        return Snapshot(
+            sequence=self._sequence,
+            timestamp=time.monotonic(),
+            data=data,
+            payload=json.dumps(data, default=json_default).encode("utf-8"),
+            etag=f'"{self._epoch}-{self._sequence}-{selection.tag}"',
+            timing=stats.server_timing(),
+        )
+
+    def get_fresh_snapshot(
+        self, selection: Optional[Selection] = None
+    ) -> Optional[Snapshot]:
+        # never blocks, returns None when the caller has to refresh with get_snapshot
+        snapshot = self._snapshot
+        if not self._is_fresh(snapshot):
+            return None
+        return snapshot if selection is None else self._project(snapshot, selection)
+
+    def get_snapshot(self, selection: Optional[Selection] = None) -> Snapshot:
+        snapshot = self.get_fresh_snapshot(selection)
+        if snapshot is not None:
+            return snapshot
+
+        with self._lock:
+            # another request may have refreshed it while we were waiting
+            snapshot = self.get_fresh_snapshot(selection)
+            if snapshot is not None:
+                return snapshot
+            if selection is None:
+                return self._sample()
+            return self._sample_selection(selection)
+
+    def wait_snapshot(
+        self, after_sequence: int, timeout: Optional[float] = None
+    ) -> Optional[Snapshot]:
+        # blocks until a snapshot newer than after_sequence is published,
+        # subscribers always get the latest one and skip what they missed
+        with self._published:
+            self._published.wait_for(
+                lambda: self._snapshot is not None
+                and self._snapshot.sequence > after_sequence,
+                timeout=timeout,
+            )
+        snapshot = self._snapshot
+        if snapshot is None or snapshot.sequence <= after_sequence:
+            return None
+        return snapshot
+
+    def add_listener(self, listener: Callable[[Snapshot], None]):
+        # listeners run on the sampling thread and must return quickly
+        self._listeners = self._listeners + [listener]
+
+    def remove_listener(self, listener: Callable[[Snapshot], None]):
+        self._listeners = [item for item in self._listeners if item is not listener]
 
     def get_info(self) -> List[Dict[str, Any]]:
+        return list(self.get_snapshot().data)
+
+    def _sampler_worker(self, period: float):
+        while not self._sampler_exit_event.is_set():
+            start = time.monotonic()
+            try:
+                with self._lock:
+                    self._sample()
+            except Exception as e:
+                report(f"Sampling failed, due to {e}")
+            self._sampler_exit_event.wait(max(0.0, period - (time.monotonic() - start)))
+
+    def start_sampler(self, period: float):
+        if self._sampler_thread is not None:
+            return
+        self._sampler_exit_event.clear()
+        self._sampler_thread = threading.Thread(
+            target=self._sampler_worker, args=(period,), daemon=True
+        )
+        self._sampler_thread.start()
+
+    def stop_sampler(self):
+        if self._sampler_thread is None:
+            return
+        self._sampler_exit_event.set()
+        self._sampler_thread.join(timeout=5.0)
+        self._sampler_thread = None
+
+    def dispose(self):
+        self.stop_sampler()
         with self._lock:
-            self._update()
-            return list(getter.sensors() for getter in self.available_getters)
+            super().dispose()
@@ -1,43 +1,255 @@
 from http.server import BaseHTTPRequestHandler
 import json
+import math
+import time
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
 
-from .combiner import Combiner
+from .combiner import Combiner, Snapshot
+from .selection import Selection, SelectionError, parse_selection
+
+
+class Response(NamedTuple):
+    status_code: int
+    headers: List[Tuple[str, str]]
+    body: bytes
+
+
+def get_json_response(data, status_code: int = 200) -> Response:
+    payload = json.dumps(data).encode("utf-8")
+    return Response(
+        status_code,
+        [("Content-Type", "application/json"), ("Content-Length", str(len(payload)))],
+        payload,
+    )
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    # If-None-Match holds "*" or a list of tags, weak ones as W/"..." compare
+    # like strong ones for a GET
+    if not if_none_match:
+        return False
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*":
+            return True
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag == etag:
+            return True
+    return False
+
+
+def get_snapshot_response(
+    snapshot: Snapshot, if_none_match: Optional[str] = None
+) -> Response:
+    headers = [
+        ("ETag", snapshot.etag),
+        ("X-Snapshot-Sequence", str(snapshot.sequence)),
+    ]
+    if snapshot.timing:
+        headers.append(("Server-Timing", snapshot.timing))
+    if etag_matches(if_none_match, snapshot.etag):
+        return Response(304, headers, b"")
+    headers.append(("Content-Type", "application/json"))
+    headers.append(("Content-Length", str(len(snapshot.payload))))
+    return Response(200, headers, snapshot.payload)
+
+
+def get_error_response(exception: Exception) -> Response:
+    return get_json_response({"err_msg": str(exception)}, status_code=500)
+
+
+def get_bad_request_response(exception: Exception) -> Response:
+    return get_json_response({"err_msg": str(exception)}, status_code=400)
+
+
+def get_request_selection(
+    combiner: Combiner, query: str, body: bytes
+) -> Optional[Selection]:
+    # raises SelectionError for unknown getters, fields or a malformed body
+    return combiner.get_selection(*parse_selection(parse_qs(query), body))
+
+
+stream_headers = [
+    ("Content-Type", "text/event-stream"),
+    ("Cache-Control", "no-cache"),
+]
+
+
+def is_delta_stream(query: str) -> bool:
+    values = parse_qs(query).get("delta", [])
+    return bool(values) and values[-1].lower() in ("1", "true", "yes")
+
+
+def get_stream_event(snapshot: Snapshot, last_sequence: int, delta: bool) -> bytes:
+    # a delta is only valid on top of the frame published right before it,
+    # subscribers that skipped frames (or just joined) get a full snapshot to resync
+    if delta and last_sequence == snapshot.base_sequence:
+        delta_event = snapshot.delta_event
+        if delta_event is not None:
+            return delta_event
+    return snapshot.event
+
+
+def get_stream_timeout(combiner: Combiner) -> float:
+    # without a running sampler nothing gets published, subscribers then
+    # refresh by themselves at the max-age pace
+    return combiner.max_age if combiner.max_age > 0 else 1.0
+
+
+def _get_column_list(column) -> List[Optional[float]]:
+    return [None if math.isnan(value) else value for value in column]
+
+
+def _get_list_param(params: Dict[str, List[str]], key: str) -> List[str]:
+    return [item for value in params.get(key, []) for item in value.split(",") if item]
+
+
+def get_history_response(combiner: Combiner, query: str) -> Response:
+    if combiner.history is None and combiner.rollups is None:
+        return get_json_response({"err_msg": "History is disabled"}, status_code=404)
+
+    params = parse_qs(query)
+    try:
+        since = float(params["since"][-1]) if "since" in params else None
+        resolution = (
+            float(params["resolution"][-1]) if "resolution" in params else None
+        )
+    except ValueError:
+        return get_bad_request_response(ValueError("Malformed since or resolution"))
+    # zero or negative values are relative to now, e.g. since=-600
+    if since is not None and since <= 0:
+        since += time.time()
+
+    # raw samples unless a coarser resolution is asked for and a rollup tier fits
+    tier = None
+    if combiner.rollups is not None:
+        if resolution is not None:
+            tier = combiner.rollups.pick_tier(resolution)
+        if tier is None and combiner.history is None:
+            tier = combiner.rollups.tiers[0]
+
+    patterns = _get_list_param(params, "sensor")
+    if not patterns:
+        store = combiner.history if tier is None else combiner.rollups
+        return get_json_response({"sensors": store.sensors()})
+
+    if tier is None:
+        times, values = combiner.history.query(patterns, since)
+        return get_json_response(
+            {
+                "times": times.tolist(),
+                "sensors": {
+                    path: _get_column_list(column) for path, column in values.items()
+                },
+            }
+        )
+
+    stats = _get_list_param(params, "stat") or tier.stats
+    for stat in stats:
+        if stat not in tier.stats:
+            return get_bad_request_response(ValueError(f"Unknown stat: {stat}"))
+    times, values = combiner.rollups.query(tier, patterns, since, stats)
+    return get_json_response(
+        {
+            "resolution": tier.resolution,
+            "times": times.tolist(),
+            "sensors": {
+                path: {
+                    stat: _get_column_list(column) for stat, column in columns.items()
+                }
+                for path, columns in values.items()
+            },
+        }
+    )
+
+
+def send_response(handler: BaseHTTPRequestHandler, response: Response):
+    handler.send_response(response.status_code)
+    for key, value in response.headers:
+        handler.send_header(key, value)
+    handler.end_headers()
+    if response.body:
+        handler.wfile.write(response.body)
 
 
 def send_json_response(
     handler: BaseHTTPRequestHandler, data: dict, status_code: int = 200
 ):
-    payload = json.dumps(data).encode("utf-8")
-    handler.send_response(status_code)
-    handler.send_header("Content-Type", "application/json")
-    handler.send_header("Content-Length", str(len(payload)))
-    handler.end_headers()
-    handler.wfile.write(payload)
+    send_response(handler, get_json_response(data, status_code))
 
 
 class MetricsHandler(BaseHTTPRequestHandler):
     combiner: Combiner | None = None
     endpoint_path = "/info"
+    stream_path = "/stream"
+    history_path = "/history"
 
     def do_POST(self):
-        if self.path != self.endpoint_path:
+        url = urlsplit(self.path)
+        if url.path != self.endpoint_path:
             self.send_error(404, "Not Found")
             return
 
         content_length = int(self.headers.get("Content-Length", 0))
-        if content_length > 0:
-            self.rfile.read(content_length)
+        body = self.rfile.read(content_length) if content_length > 0 else b""
 
         try:
             if self.combiner is None:
                 raise RuntimeError("Combiner is not initialized")
-            data = self.combiner.get_info()
-            return_code = 200
+            selection = get_request_selection(self.combiner, url.query, body)
+            snapshot = self.combiner.get_snapshot(selection)
+        except SelectionError as exception:
+            send_response(self, get_bad_request_response(exception))
+            return
         except Exception as exception:
-            data = {"err_msg": str(exception)}
-            return_code = 500
+            send_response(self, get_error_response(exception))
+            return
 
-        send_json_response(self, data, status_code=return_code)
+        send_response(
+            self, get_snapshot_response(snapshot, self.headers.get("If-None-Match"))
+        )
 
     def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path == self.stream_path:
+            self._stream(is_delta_stream(url.query))
+            return
+        if url.path == self.history_path:
+            if self.combiner is None:
+                send_response(
+                    self,
+                    get_error_response(RuntimeError("Combiner is not initialized")),
+                )
+                return
+            send_response(self, get_history_response(self.combiner, url.query))
+            return
         self.send_error(405, "Method Not Allowed")
+
+    def _stream(self, delta: bool):
+        if self.combiner is None:
+            send_response(
+                self, get_error_response(RuntimeError("Combiner is not initialized"))
+            )
+            return
+
+        self.send_response(200)
+        for key, value in stream_headers:
+            self.send_header(key, value)
+        self.end_headers()
+
+        timeout = get_stream_timeout(self.combiner)
+        last_sequence = 0
+        try:
+            while True:
+                snapshot = self.combiner.wait_snapshot(last_sequence, timeout)
+                if snapshot is None:
+                    snapshot = self.combiner.get_snapshot()
+                    if snapshot.sequence <= last_sequence:
+                        continue
+                self.wfile.write(get_stream_event(snapshot, last_sequence, delta))
+                self.wfile.flush()
+                last_sequence = snapshot.sequence
+        except (ConnectionError, OSError):
+            pass
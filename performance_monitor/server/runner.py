@@ -4,26 +4,37 @@ from http.server import ThreadingHTTPServer
 
 from .combiner import Combiner
 from .handler import MetricsHandler
+from ..info_getter import (
+    RecordWriter,
+    Replay,
+    default_backend,
+    get_backend_names,
+    parse_backend_options,
+    parse_rollup_tiers,
+    parse_update_intervals,
+)
 
 
-if __name__ == "__main__":
-    arguments = argparse.ArgumentParser()
-    arguments.add_argument("-p", "--port", type=int, default=54321)
-    arguments.add_argument("--host", type=str, default="127.0.0.1")
-    arguments.add_argument("--path", type=str, default="/info")
-    args = arguments.parse_args()
-
-    combiner = Combiner()
-    atexit.register(combiner.dispose)
-    path = args.path if args.path.startswith("/") else f"/{args.path}"
-
+def serve_threading(
+    combiner: Combiner,
+    host: str,
+    port: int,
+    path: str,
+    stream_path: str,
+    history_path: str,
+):
     MetricsHandler.combiner = combiner
     MetricsHandler.endpoint_path = path
+    MetricsHandler.stream_path = stream_path
+    MetricsHandler.history_path = history_path
 
-    server = ThreadingHTTPServer((args.host, args.port), MetricsHandler)
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
     atexit.register(server.server_close)
 
-    print(f"Serving POST {path} at http://{args.host}:{args.port}")
+    print(f"Serving POST {path} at http://{host}:{port}")
+    print(f"Streaming GET {stream_path} at http://{host}:{port}")
+    if combiner.history is not None or combiner.rollups is not None:
+        print(f"Serving GET {history_path} at http://{host}:{port}")
     try:
         server.serve_forever()
     except KeyboardInterrupt:
@@ -31,3 +42,115 @@ if __name__ == "__main__":
     finally:
         server.shutdown()
         server.server_close()
+
+
+def serve_asyncio(
+    combiner: Combiner,
+    host: str,
+    port: int,
+    path: str,
+    stream_path: str,
+    history_path: str,
+    max_connections: int,
+):
+    # asyncio is a third of the import time, only load it for this engine
+    import asyncio
+    from .async_server import AsyncMetricsServer
+
+    server = AsyncMetricsServer(
+        combiner,
+        endpoint_path=path,
+        stream_path=stream_path,
+        history_path=history_path,
+        max_connections=max_connections,
+    )
+
+    print(f"Serving POST {path} at http://{host}:{port} (asyncio)")
+    print(f"Streaming GET {stream_path} at http://{host}:{port} (asyncio)")
+    if combiner.history is not None or combiner.rollups is not None:
+        print(f"Serving GET {history_path} at http://{host}:{port} (asyncio)")
+    try:
+        asyncio.run(server.serve_forever(host, port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    arguments = argparse.ArgumentParser()
+    arguments.add_argument("-p", "--port", type=int, default=54321)
+    arguments.add_argument("--host", type=str, default="127.0.0.1")
+    arguments.add_argument("--path", type=str, default="/info")
+    arguments.add_argument("--stream-path", type=str, default="/stream")
+    arguments.add_argument("--history-path", type=str, default="/history")
+    arguments.add_argument("--history", type=float, default=600.0)
+    arguments.add_argument("--rollup", type=str, default="1:3600,60:86400")
+    arguments.add_argument("-sp", "--sample-period", type=float, default=1.0)
+    arguments.add_argument("--max-age", type=float, default=None)
+    arguments.add_argument(
+        "--engine", type=str, choices=["threading", "asyncio"], default="threading"
+    )
+    arguments.add_argument("--max-connections", type=int, default=1024)
+    arguments.add_argument(
+        "--update-interval", type=str, action="append", metavar="NAME=SECONDS"
+    )
+    arguments.add_argument("--update-workers", type=int, default=0)
+    arguments.add_argument("--update-timeout", type=float, default=None)
+    arguments.add_argument("--record", type=str, default=None, metavar="FILE")
+    arguments.add_argument("--replay", type=str, default=None, metavar="FILE")
+    arguments.add_argument("--speed", type=float, default=1.0)
+    arguments.add_argument(
+        "--backend", type=str, choices=get_backend_names(), default=default_backend()
+    )
+    arguments.add_argument(
+        "--backend-option", type=str, action="append", metavar="KEY=VALUE"
+    )
+    args = arguments.parse_args()
+
+    # by default a snapshot may be served until the sampler is clearly late
+    max_age = args.max_age if args.max_age is not None else 2 * args.sample_period
+
+    # keep --history seconds of snapshots, 0 disables the history
+    history_capacity = (
+        int(args.history / args.sample_period)
+        if args.history > 0 and args.sample_period > 0
+        else 0
+    )
+
+    combiner = Combiner(
+        max_age=max_age,
+        history_capacity=history_capacity,
+        rollup_tiers=parse_rollup_tiers(args.rollup),
+        update_intervals=parse_update_intervals(args.update_interval),
+        update_workers=args.update_workers,
+        update_timeout=args.update_timeout,
+        replay=Replay(args.replay, speed=args.speed) if args.replay else None,
+        backend=args.backend,
+        backend_options=parse_backend_options(args.backend_option),
+    )
+    # handlers run in reverse, the recording is closed once the sampler stopped
+    if args.record:
+        recorder = RecordWriter(args.record)
+        combiner.add_sink(recorder)
+        atexit.register(recorder.close)
+    atexit.register(combiner.dispose)
+    if args.sample_period > 0:
+        combiner.start_sampler(args.sample_period)
+    path, stream_path, history_path = (
+        item if item.startswith("/") else f"/{item}"
+        for item in (args.path, args.stream_path, args.history_path)
+    )
+
+    if args.engine == "asyncio":
+        serve_asyncio(
+            combiner,
+            args.host,
+            args.port,
+            path,
+            stream_path,
+            history_path,
+            args.max_connections,
+        )
+    else:
+        serve_threading(
+            combiner, args.host, args.port, path, stream_path, history_path
+        )
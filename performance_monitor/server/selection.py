@@ -0,0 +1,133 @@
+import json
+import zlib
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from ..info_getter import GeneralHardware
+
+
+class SelectionError(ValueError):
+    pass
+
+
+class Selection:
+    # a projection plan: which getters to update and which sensors to serialize
+
+    key: Tuple[Tuple[str, ...], Tuple[str, ...]]
+    tag: str
+    entries: Tuple[Tuple[int, str, GeneralHardware, Optional[Tuple[str, ...]]], ...]
+    complete: bool
+
+    _cached: Tuple[int, Any]
+
+    def __init__(
+        self,
+        getters: Dict[str, GeneralHardware],
+        getter_names: Sequence[str],
+        field_names: Sequence[str],
+    ):
+        self.key = (tuple(getter_names), tuple(field_names))
+        self.tag = f"{zlib.crc32(repr(self.key).encode('utf-8')):08x}"
+
+        selected: Dict[str, Optional[List[str]]] = {}
+        for name in getter_names:
+            if name not in getters:
+                raise SelectionError(f"Unknown getter: {name}")
+            selected[name] = None
+        for field in field_names:
+            name, sep, key = field.partition(".")
+            if not sep or name not in getters:
+                raise SelectionError(f"Unknown field: {field}")
+            if key not in getters[name].sensor_keys():
+                raise SelectionError(f"Unknown field: {field}")
+            if name in selected and selected[name] is None:
+                # the whole getter is selected already
+                continue
+            keys = selected.setdefault(name, [])
+            if key not in keys:
+                keys.append(key)
+
+        entries = []
+        for index, (name, getter) in enumerate(getters.items()):
+            if name in selected:
+                keys = selected[name]
+                entries.append(
+                    (index, name, getter, None if keys is None else tuple(keys))
+                )
+        self.entries = tuple(entries)
+        self.complete = len(entries) == len(getters) and all(
+            keys is None for _, _, _, keys in entries
+        )
+
+        self._cached = (-1, None)
+
+    @property
+    def named_getters(self) -> List[Tuple[str, GeneralHardware]]:
+        return [(name, getter) for _, name, getter, _ in self.entries]
+
+    def project(self, data: Sequence[Dict[str, Any]]) -> Tuple[Dict[str, Any], ...]:
+        projected = []
+        for index, _, _, keys in self.entries:
+            info = data[index]
+            if keys is not None:
+                sensors = info["sensors"]
+                info = {
+                    "type": info["type"],
+                    "sensors": {key: sensors[key] for key in keys},
+                }
+            projected.append(info)
+        return tuple(projected)
+
+    def project_getters(
+        self, getter_sensors: Callable[[str], Dict[str, Any]]
+    ) -> Tuple[Dict[str, Any], ...]:
+        # getter_sensors returns the sensors of a getter by name, the records
+        # it returns may be shared and are not changed here
+        projected = []
+        for _, name, _, keys in self.entries:
+            info = getter_sensors(name)
+            if keys is not None:
+                sensors = info["sensors"]
+                info = {
+                    "type": info["type"],
+                    "sensors": {key: sensors[key] for key in keys},
+                }
+            projected.append(info)
+        return tuple(projected)
+
+    def get_cached(self, source_sequence: int) -> Any:
+        # the latest projection is kept so repeated polls of one snapshot
+        # are neither projected nor encoded again
+        cached_sequence, projected = self._cached
+        return projected if cached_sequence == source_sequence else None
+
+    def set_cached(self, source_sequence: int, projected: Any):
+        self._cached = (source_sequence, projected)
+
+
+def parse_selection(
+    query: Dict[str, List[str]], body: bytes
+) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    getter_names: List[str] = []
+    field_names: List[str] = []
+
+    for value in query.get("getters", []):
+        getter_names.extend(item for item in value.split(",") if item)
+    for value in query.get("fields", []):
+        field_names.extend(item for item in value.split(",") if item)
+
+    if body.strip():
+        try:
+            request = json.loads(body)
+        except ValueError:
+            raise SelectionError("Request body is not valid JSON")
+        if not isinstance(request, dict):
+            raise SelectionError("Request body must be a JSON object")
+        for key, names in (("getters", getter_names), ("fields", field_names)):
+            values = request.get(key, [])
+            if not isinstance(values, list) or not all(
+                isinstance(item, str) for item in values
+            ):
+                raise SelectionError(f'"{key}" must be a list of strings')
+            names.extend(values)
+
+    return tuple(getter_names), tuple(field_names)
@@ -0,0 +1,116 @@
+import os
+from typing import Dict, List, Optional, Sequence
+
+# the files the Linux getters read, written under a temporary directory that
+# stands in for "/"
+
+
+def write_file(root: str, path: str, content: str):
+    # in place, so a file a getter keeps open sees the new content
+    full_path = os.path.join(root, path)
+    os.makedirs(os.path.dirname(full_path), exist_ok=True)
+    with open(full_path, "w") as file:
+        file.write(content)
+
+
+def write_cpu_topology(
+    root: str,
+    packages: int = 1,
+    cores: int = 2,
+    threads_per_core: int = 2,
+    model_name: str = "Test CPU",
+    clock_khz: int = 3_000_000,
+):
+    # logical cpus are numbered like Linux does: the first thread of every
+    # core, then the siblings
+    thread_count = packages * cores * threads_per_core
+    cpuinfo = []
+    for cpu in range(thread_count):
+        core = cpu % (packages * cores)
+        cpu_dir = f"sys/devices/system/cpu/cpu{cpu}"
+        write_file(root, f"{cpu_dir}/topology/physical_package_id", f"{core // cores}\n")
+        write_file(root, f"{cpu_dir}/topology/core_id", f"{core % cores}\n")
+        write_file(root, f"{cpu_dir}/cpufreq/scaling_cur_freq", f"{clock_khz}\n")
+        cpuinfo.append(f"processor\t: {cpu}\nmodel name\t: {model_name}\n")
+    write_file(root, "proc/cpuinfo", "\n".join(cpuinfo))
+    write_cpu_times(root, [(0, 0)] * thread_count)
+
+
+def write_cpu_times(root: str, times: Sequence[Sequence[int]]):
+    # (busy, idle) jiffies per logical cpu, busy split over user and system
+    lines = [f"cpu  {sum(b for b, _ in times)} 0 0 {sum(i for _, i in times)} 0 0 0 0 0 0"]
+    for cpu, (busy, idle) in enumerate(times):
+        user = busy // 2
+        lines.append(f"cpu{cpu} {user} 0 {busy - user} {idle} 0 0 0 0 0 0")
+    lines.append("intr 12345 0 0")
+    lines.append("ctxt 67890")
+    write_file(root, "proc/stat", "\n".join(lines) + "\n")
+
+
+def write_hwmon(
+    root: str,
+    number: int,
+    name: str,
+    temperatures: Dict[str, int],
+    voltages: Sequence[int] = (),
+):
+    # temperatures by label in millidegrees, "" for a sensor without a label
+    hwmon_dir = f"sys/class/hwmon/hwmon{number}"
+    write_file(root, f"{hwmon_dir}/name", f"{name}\n")
+    for index, (label, value) in enumerate(temperatures.items(), start=1):
+        write_file(root, f"{hwmon_dir}/temp{index}_input", f"{value}\n")
+        if label:
+            write_file(root, f"{hwmon_dir}/temp{index}_label", f"{label}\n")
+    for index, value in enumerate(voltages):
+        write_file(root, f"{hwmon_dir}/in{index}_input", f"{value}\n")
+
+
+def write_rapl(root: str, package: int, energy_uj: int, max_range_uj: int):
+    zone_dir = f"sys/class/powercap/intel-rapl:{package}"
+    write_file(root, f"{zone_dir}/name", f"package-{package}\n")
+    write_file(root, f"{zone_dir}/energy_uj", f"{energy_uj}\n")
+    write_file(root, f"{zone_dir}/max_energy_range_uj", f"{max_range_uj}\n")
+
+
+def write_meminfo(root: str, values_kib: Dict[str, int]):
+    write_file(
+        root,
+        "proc/meminfo",
+        "".join(f"{key}:{value:>16} kB\n" for key, value in values_kib.items()),
+    )
+
+
+# an amdgpu card as it shows up under /sys/class/drm
+AMD_CARD_FILES = {
+    "vendor": "0x1002\n",
+    "device": "0x73bf\n",
+    "product_name": "Radeon RX 6800\n",
+    "gpu_busy_percent": "37\n",
+    "mem_info_vram_total": "17163091968\n",
+    "mem_info_vram_used": "1073741824\n",
+    "pp_dpm_sclk": "0: 500Mhz\n1: 2105Mhz *\n",
+    "pp_dpm_mclk": "0: 96Mhz\n1: 1000Mhz *\n",
+    "hwmon/hwmon0/power1_average": "123000000\n",
+    "hwmon/hwmon0/power1_cap": "255000000\n",
+    "hwmon/hwmon0/temp1_input": "55000\n",
+    "hwmon/hwmon0/temp1_label": "edge\n",
+    "hwmon/hwmon0/temp2_input": "61000\n",
+    "hwmon/hwmon0/temp2_label": "junction\n",
+}
+
+
+def write_card(
+    root: str,
+    card: int,
+    files: Optional[Dict[str, str]] = None,
+    card_files: Optional[Dict[str, str]] = None,
+):
+    # files go to the card's device directory, card_files next to it
+    for path, content in (AMD_CARD_FILES if files is None else files).items():
+        write_file(root, f"sys/class/drm/card{card}/device/{path}", content)
+    for path, content in (card_files or {}).items():
+        write_file(root, f"sys/class/drm/card{card}/{path}", content)
+
+
+def card_paths(root: str, card: int) -> List[str]:
+    return sorted(os.listdir(os.path.join(root, f"sys/class/drm/card{card}/device")))
@@ -0,0 +1,131 @@
+import sys
+import tempfile
+import tracemalloc
+import unittest
+
+from performance_monitor.info_getter import linux_cpu_info, linux_gpu_info, synthetic_info
+from performance_monitor.info_getter.linux_cpu_info import LinuxCpuInformation
+from performance_monitor.info_getter.linux_gpu_info import LinuxGpuInformation
+from performance_monitor.info_getter.synthetic_info import (
+    SyntheticCpuInformation,
+    SyntheticGpuInformation,
+)
+from tests.fake_root import (
+    write_card,
+    write_cpu_times,
+    write_cpu_topology,
+    write_hwmon,
+    write_rapl,
+)
+
+# buffer typecodes by field, byte counts stay integers
+GPU_BUFFERS = {
+    "available_memory": "q",
+    "used_memory": "q",
+    "memory_usage": "d",
+    "usage": "d",
+    "power": "d",
+    "available_power": "d",
+    "temperature": "d",
+    "core_clock": "d",
+    "memory_clock": "d",
+}
+# one buffer per package
+CPU_BUFFERS = ("temperature", "clock", "usage", "load", "voltage")
+
+
+def _retained_bytes(getter, module, keys, updates: int = 50) -> int:
+    # bytes allocated by the getter's module during updates and still alive
+    # while everything the updates exposed is held on to: buffers written in
+    # place add nothing, values built anew on every update add up
+    for _ in range(5):
+        getter.update()
+    held = []
+    filters = [tracemalloc.Filter(True, module.__file__)]
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot().filter_traces(filters)
+        for _ in range(updates):
+            getter.update()
+            # a tuple, a list could reuse one the update freed to the freelist
+            held.append(tuple(getattr(getter, key) for key in keys))
+        after = tracemalloc.take_snapshot().filter_traces(filters)
+    finally:
+        tracemalloc.stop()
+    return sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+
+
+class GpuUpdateAllocationTest(unittest.TestCase):
+    def assert_steady(self, getter, module):
+        buffers = [getattr(getter, key) for key in GPU_BUFFERS]
+        self.assertEqual(_retained_bytes(getter, module, GPU_BUFFERS), 0)
+        for (key, typecode), buffer in zip(GPU_BUFFERS.items(), buffers):
+            self.assertIs(getattr(getter, key), buffer, key)
+            self.assertEqual(buffer.typecode, typecode, key)
+            self.assertEqual(len(buffer), getter.gpu_count, key)
+
+    def test_synthetic_gpu(self):
+        getter = SyntheticGpuInformation(gpus="2")
+        self.assert_steady(getter, synthetic_info)
+
+    @unittest.skipUnless(sys.platform.startswith("linux"), "needs pread")
+    def test_linux_gpu(self):
+        with tempfile.TemporaryDirectory() as root:
+            write_card(root, 0)
+            write_card(root, 1)
+            getter = LinuxGpuInformation(root)
+            try:
+                self.assertEqual(getter.gpu_count, 2)
+                self.assert_steady(getter, linux_gpu_info)
+                self.assertEqual(getter.core_clock[0], 2105.0)
+                self.assertEqual(getter.usage[1], 37.0)
+                self.assertEqual(getter.used_memory[0], 1073741824)
+            finally:
+                getter.dispose()
+
+
+class CpuUpdateAllocationTest(unittest.TestCase):
+    def assert_steady(self, getter, module):
+        buffers = {key: list(getattr(getter, key)) for key in CPU_BUFFERS}
+        power = getter.power
+        self.assertEqual(
+            _retained_bytes(getter, module, CPU_BUFFERS + ("power",)), 0
+        )
+        for key, package_buffers in buffers.items():
+            self.assertEqual(len(package_buffers), getter.cpu_count, key)
+            for buffer, current in zip(package_buffers, getattr(getter, key)):
+                self.assertIs(current, buffer, key)
+                self.assertEqual(buffer.typecode, "d", key)
+        self.assertIs(getter.power, power)
+        self.assertEqual(len(power), getter.cpu_count)
+
+    def test_synthetic_cpu(self):
+        getter = SyntheticCpuInformation(cpus="2", threads="8")
+        self.assert_steady(getter, synthetic_info)
+
+    @unittest.skipUnless(sys.platform.startswith("linux"), "needs pread")
+    def test_linux_cpu(self):
+        with tempfile.TemporaryDirectory() as root:
+            write_cpu_topology(root, packages=2, cores=4)
+            write_cpu_times(root, [(100 * cpu, 1000) for cpu in range(16)])
+            for package in range(2):
+                write_hwmon(
+                    root,
+                    package,
+                    "coretemp",
+                    {f"Package id {package}": 60000, "Core 0": 55000, "Core 1": 56000},
+                    voltages=[1100],
+                )
+                write_rapl(root, package, 1_000_000, 262_143_328_850)
+            getter = LinuxCpuInformation(root)
+            try:
+                self.assertEqual(getter.cpu_count, 2)
+                self.assert_steady(getter, linux_cpu_info)
+                self.assertEqual(list(getter.clock[1]), [3000.0] * 4)
+                self.assertEqual(list(getter.temperature[0]), [55.0, 56.0])
+            finally:
+                getter.dispose()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,131 @@
+import errno
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+from performance_monitor.info_getter.file_reader import (
+    FileReader,
+    list_numbered,
+    read_int,
+    read_text,
+)
+from tests.fake_root import write_file
+
+
+class ReadTest(unittest.TestCase):
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self.root = self._directory.name
+
+    def tearDown(self):
+        self._directory.cleanup()
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.root, name)
+
+    def test_read_text(self):
+        write_file(self.root, "name", "coretemp\n")
+        self.assertEqual(read_text(self.path("name")), "coretemp")
+        self.assertIsNone(read_text(self.path("missing")))
+
+    def test_read_int(self):
+        write_file(self.root, "temp1_input", "45000\n")
+        write_file(self.root, "status", "okay\n")
+        self.assertEqual(read_int(self.path("temp1_input")), 45000)
+        self.assertIsNone(read_int(self.path("status")))
+        self.assertIsNone(read_int(self.path("missing")))
+
+    def test_list_numbered(self):
+        for name in ("temp10_input", "temp2_input", "temp1_input", "temp1_label", "in0_input"):
+            write_file(self.root, name, "0\n")
+        self.assertEqual(list_numbered(self.root, "temp", "_input"), [1, 2, 10])
+        self.assertEqual(list_numbered(self.root, "in", "_input"), [0])
+
+    def test_list_numbered_whole_names(self):
+        # connectors such as card0-DP-1 are not cards
+        for name in ("card0", "card0-DP-1", "card1", "renderD128"):
+            os.mkdir(self.path(name))
+        self.assertEqual(list_numbered(self.root, "card"), [0, 1])
+        self.assertEqual(list_numbered(self.path("missing"), "card"), [])
+
+
+@unittest.skipUnless(sys.platform.startswith("linux"), "needs pread")
+class FileReaderTest(unittest.TestCase):
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self.root = self._directory.name
+        self._readers = []
+
+    def tearDown(self):
+        for reader in self._readers:
+            reader.close()
+        self._directory.cleanup()
+
+    def reader(self, name: str, size: int = 64) -> FileReader:
+        reader = FileReader(os.path.join(self.root, name), size=size)
+        self._readers.append(reader)
+        return reader
+
+    def test_read_int_rereads(self):
+        write_file(self.root, "energy_uj", "1000\n")
+        reader = self.reader("energy_uj")
+        self.assertEqual(reader.read_int(), 1000)
+        write_file(self.root, "energy_uj", "25\n")
+        self.assertEqual(reader.read_int(), 25)
+
+    def test_read_int_invalid(self):
+        write_file(self.root, "empty", "")
+        write_file(self.root, "text", "N/A\n")
+        self.assertIsNone(self.reader("empty").read_int())
+        self.assertIsNone(self.reader("text").read_int())
+
+    def test_missing_file_is_opened_once_it_exists(self):
+        reader = self.reader("gpu_busy_percent")
+        self.assertIsNone(reader.read_int())
+        write_file(self.root, "gpu_busy_percent", "12\n")
+        self.assertEqual(reader.read_int(), 12)
+
+    def test_reopen_after_error(self):
+        write_file(self.root, "power1_average", "15000000\n")
+        reader = self.reader("power1_average")
+        self.assertEqual(reader.read_int(), 15000000)
+
+        pread = os.pread
+        failures = [OSError(errno.ENODEV, "No such device")]
+
+        def failing_pread(fd, size, offset):
+            if failures:
+                raise failures.pop()
+            return pread(fd, size, offset)
+
+        with mock.patch.object(os, "pread", failing_pread), mock.patch.object(
+            os, "open", wraps=os.open
+        ) as opened:
+            self.assertEqual(reader.read_int(), 15000000)
+        self.assertEqual(opened.call_count, 1)
+
+    def test_gives_up_after_second_error(self):
+        write_file(self.root, "power1_average", "15000000\n")
+        reader = self.reader("power1_average")
+        error = OSError(errno.ENODEV, "No such device")
+        with mock.patch.object(os, "pread", side_effect=error), mock.patch.object(
+            os, "preadv", side_effect=error
+        ):
+            self.assertIsNone(reader.read_int())
+            self.assertIsNone(reader.read())
+        # and reads again once the device is back
+        self.assertEqual(reader.read_int(), 15000000)
+
+    def test_read_grows_buffer(self):
+        content = "".join(f"cpu{cpu} 1 2 3 4 5 6 7 8 0 0\n" for cpu in range(64))
+        write_file(self.root, "stat", content)
+        reader = self.reader("stat", size=16)
+        self.assertEqual(reader.read(), content.encode())
+        write_file(self.root, "stat", "cpu0 1\n")
+        self.assertEqual(reader.read(), b"cpu0 1\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
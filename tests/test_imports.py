@@ -0,0 +1,34 @@
+import json
+import subprocess
+import sys
+import unittest
+
+# runtimes and dashboard dependencies that must wait until something uses them
+DEFERRED_MODULES = ("psutil", "pynvml", "clr", "wcwidth", "tabulate", "asyncio")
+
+
+def _loaded_after_import(*modules: str):
+    # a fresh interpreter, the test runner has already imported half of these
+    code = "\n".join(
+        [f"import {module}" for module in modules]
+        + [
+            "import json, sys",
+            f"print(json.dumps([m for m in {DEFERRED_MODULES!r} if m in sys.modules]))",
+        ]
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, check=True, text=True
+    ).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+class LazyImportTest(unittest.TestCase):
+    def test_info_getter(self):
+        self.assertEqual(_loaded_after_import("performance_monitor.info_getter"), [])
+
+    def test_server_runner(self):
+        self.assertEqual(_loaded_after_import("performance_monitor.server.runner"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,185 @@
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+from performance_monitor.info_getter import linux_cpu_info
+from performance_monitor.info_getter.linux_cpu_info import LinuxCpuInformation
+from tests.fake_root import (
+    write_cpu_times,
+    write_cpu_topology,
+    write_file,
+    write_hwmon,
+    write_rapl,
+)
+
+
+@unittest.skipUnless(sys.platform.startswith("linux"), "reads a Linux tree")
+class LinuxCpuInformationTest(unittest.TestCase):
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self.root = self._directory.name
+        self._getters = []
+
+    def tearDown(self):
+        for getter in self._getters:
+            getter.dispose()
+        self._directory.cleanup()
+
+    def getter(self) -> LinuxCpuInformation:
+        getter = LinuxCpuInformation(self.root)
+        self._getters.append(getter)
+        return getter
+
+    def test_topology(self):
+        write_cpu_topology(self.root, packages=2, cores=2, model_name="Test Xeon")
+        getter = self.getter()
+        self.assertEqual(getter.cpu_count, 2)
+        self.assertEqual(getter.cpu_name, ["Test Xeon", "Test Xeon"])
+        self.assertEqual([len(load) for load in getter.load], [4, 4])
+
+    def test_offline_threads_are_skipped(self):
+        write_cpu_topology(self.root, cores=2)
+        write_file(self.root, "sys/devices/system/cpu/cpu3/online", "0\n")
+        getter = self.getter()
+        self.assertEqual(len(getter.load[0]), 3)
+
+    def test_load_from_stat_deltas(self):
+        write_cpu_topology(self.root, cores=2)
+        write_cpu_times(self.root, [(1000, 1000)] * 4)
+        getter = self.getter()
+        # the first update has no earlier counters to compare with
+        self.assertEqual(list(getter.load[0]), [0.0] * 4)
+
+        write_cpu_times(self.root, [(1050, 1050), (1025, 1075), (1000, 1100), (1100, 1000)])
+        getter.update()
+        self.assertEqual(list(getter.load[0]), [50.0, 25.0, 0.0, 100.0])
+        self.assertEqual(getter.usage[0][0], 43.75)
+
+    def test_iowait_is_idle(self):
+        write_cpu_topology(self.root, cores=1, threads_per_core=1)
+        getter = self.getter()
+        # user nice system idle iowait irq softirq steal
+        write_file(self.root, "proc/stat", "cpu0 30 0 10 20 40 0 0 0 0 0\n")
+        getter.update()
+        self.assertEqual(getter.load[0][0], 40.0)
+
+    def test_clock_from_cpufreq(self):
+        write_cpu_topology(self.root, cores=2, clock_khz=3_000_000)
+        write_file(self.root, "sys/devices/system/cpu/cpu1/cpufreq/scaling_cur_freq", "2400000\n")
+        # a sibling thread shares the clock of its core
+        write_file(self.root, "sys/devices/system/cpu/cpu3/cpufreq/scaling_cur_freq", "800000\n")
+        getter = self.getter()
+        self.assertEqual(list(getter.clock[0]), [3000.0, 2400.0])
+
+        write_file(self.root, "sys/devices/system/cpu/cpu0/cpufreq/scaling_cur_freq", "4100000\n")
+        getter.update()
+        self.assertEqual(list(getter.clock[0]), [4100.0, 2400.0])
+
+    def test_coretemp_cores(self):
+        write_cpu_topology(self.root, cores=2)
+        write_hwmon(self.root, 0, "nvme", {"Composite": 38000})
+        write_hwmon(
+            self.root,
+            1,
+            "coretemp",
+            {"Package id 0": 60000, "Core 0": 55000, "Core 1": 57000},
+            voltages=[1200],
+        )
+        getter = self.getter()
+        self.assertEqual(list(getter.temperature[0]), [55.0, 57.0])
+        self.assertEqual(list(getter.voltage[0]), [1.2])
+
+        write_hwmon(
+            self.root,
+            1,
+            "coretemp",
+            {"Package id 0": 70000, "Core 0": 65000, "Core 1": 67000},
+        )
+        getter.update()
+        self.assertEqual(list(getter.temperature[0]), [65.0, 67.0])
+
+    def test_coretemp_package_ids(self):
+        write_cpu_topology(self.root, packages=2, cores=1)
+        # coretemp devices need not come in package order, their labels say
+        write_hwmon(self.root, 0, "coretemp", {"Package id 1": 61000, "Core 0": 51000})
+        write_hwmon(self.root, 1, "coretemp", {"Package id 0": 60000, "Core 0": 50000})
+        getter = self.getter()
+        self.assertEqual([list(values) for values in getter.temperature], [[50.0], [51.0]])
+
+    def test_k10temp_ccds(self):
+        write_cpu_topology(self.root, packages=2, cores=2)
+        for number, base in ((2, 40000), (5, 60000)):
+            write_hwmon(
+                self.root,
+                number,
+                "k10temp",
+                {"Tctl": base + 5000, "Tccd1": base, "Tccd2": base + 1000},
+            )
+        getter = self.getter()
+        # one device per package, in device order
+        self.assertEqual(
+            [list(values) for values in getter.temperature],
+            [[40.0, 41.0], [60.0, 61.0]],
+        )
+
+    def test_package_sensors_without_core_sensors(self):
+        write_cpu_topology(self.root, cores=2)
+        write_hwmon(self.root, 0, "zenpower", {"Tdie": 52000, "Tctl": 62000})
+        getter = self.getter()
+        self.assertEqual(list(getter.temperature[0]), [52.0, 62.0])
+
+    def test_cpu_thermal(self):
+        write_cpu_topology(self.root, cores=4, threads_per_core=1)
+        write_hwmon(self.root, 0, "cpu_thermal", {"": 48300})
+        getter = self.getter()
+        self.assertEqual(list(getter.temperature[0]), [48.3])
+
+    def test_without_sensors(self):
+        write_cpu_topology(self.root)
+        getter = self.getter()
+        self.assertEqual(list(getter.temperature[0]), [])
+        self.assertEqual(getter.power[0], 0.0)
+
+    def test_rapl_power(self):
+        write_cpu_topology(self.root)
+        write_rapl(self.root, 0, 10_000_000, 262_143_328_850)
+        with mock.patch.object(linux_cpu_info, "time") as clock:
+            clock.monotonic.return_value = 100.0
+            getter = self.getter()
+            # power needs two readings
+            self.assertEqual(getter.power[0], 0.0)
+
+            write_rapl(self.root, 0, 40_000_000, 262_143_328_850)
+            clock.monotonic.return_value = 102.0
+            getter.update()
+        self.assertEqual(getter.power[0], 15.0)
+
+    def test_rapl_wraparound(self):
+        write_cpu_topology(self.root)
+        write_rapl(self.root, 0, 262_142_328_850, 262_143_328_850)
+        with mock.patch.object(linux_cpu_info, "time") as clock:
+            clock.monotonic.return_value = 100.0
+            getter = self.getter()
+
+            write_rapl(self.root, 0, 3_000_000, 262_143_328_850)
+            clock.monotonic.return_value = 102.0
+            getter.update()
+        self.assertEqual(getter.power[0], 2.0)
+
+    def test_rapl_per_package(self):
+        write_cpu_topology(self.root, packages=2, cores=1)
+        write_rapl(self.root, 0, 0, 1_000_000_000)
+        write_rapl(self.root, 1, 0, 1_000_000_000)
+        with mock.patch.object(linux_cpu_info, "time") as clock:
+            clock.monotonic.return_value = 100.0
+            getter = self.getter()
+
+            write_rapl(self.root, 1, 5_000_000, 1_000_000_000)
+            clock.monotonic.return_value = 101.0
+            getter.update()
+        self.assertEqual(list(getter.power), [0.0, 5.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
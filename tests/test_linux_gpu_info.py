@@ -0,0 +1,110 @@
+import sys
+import tempfile
+import unittest
+
+from performance_monitor.info_getter.linux_gpu_info import (
+    LinuxGpuInformation,
+    parse_dpm_clock,
+)
+from tests.fake_root import AMD_CARD_FILES, write_card, write_file
+
+
+class ParseDpmClockTest(unittest.TestCase):
+    def test_active_level(self):
+        self.assertEqual(parse_dpm_clock(b"0: 500Mhz\n1: 1800Mhz *\n2: 2100Mhz\n"), 1800.0)
+        self.assertEqual(parse_dpm_clock(b"0: 96MHz *\n1: 1000MHz\n"), 96.0)
+
+    def test_no_active_level(self):
+        self.assertIsNone(parse_dpm_clock(b"0: 500Mhz\n1: 1800Mhz\n"))
+        self.assertIsNone(parse_dpm_clock(b""))
+        self.assertIsNone(parse_dpm_clock(None))
+
+    def test_malformed(self):
+        self.assertIsNone(parse_dpm_clock(b"0: fastMhz *\n"))
+        self.assertIsNone(parse_dpm_clock(b"0: 500 *\n"))
+
+
+@unittest.skipUnless(sys.platform.startswith("linux"), "needs pread")
+class LinuxGpuInformationTest(unittest.TestCase):
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self.root = self._directory.name
+        self._getters = []
+
+    def tearDown(self):
+        for getter in self._getters:
+            getter.dispose()
+        self._directory.cleanup()
+
+    def getter(self) -> LinuxGpuInformation:
+        getter = LinuxGpuInformation(self.root)
+        self._getters.append(getter)
+        getter.update()
+        return getter
+
+    def test_amd_card(self):
+        write_card(self.root, 0)
+        write_file(self.root, "sys/class/drm/card0-DP-1/status", "connected\n")
+        getter = self.getter()
+        self.assertEqual(getter.gpu_names, ["Radeon RX 6800"])
+        self.assertEqual(list(getter.available_memory), [17163091968])
+        self.assertEqual(list(getter.used_memory), [1073741824])
+        self.assertEqual(list(getter.usage), [37])
+        self.assertEqual(list(getter.power), [123.0])
+        self.assertEqual(list(getter.available_power), [255.0])
+        # edge, not junction
+        self.assertEqual(list(getter.temperature), [55.0])
+        self.assertEqual(list(getter.core_clock), [2105.0])
+        self.assertEqual(list(getter.memory_clock), [1000.0])
+
+    def test_update_rereads(self):
+        write_card(self.root, 0)
+        getter = self.getter()
+        write_file(self.root, "sys/class/drm/card0/device/pp_dpm_sclk", "0: 500Mhz *\n1: 2105Mhz\n")
+        write_file(self.root, "sys/class/drm/card0/device/gpu_busy_percent", "3\n")
+        getter.update()
+        self.assertEqual(list(getter.core_clock), [500.0])
+        self.assertEqual(list(getter.usage), [3])
+
+    def test_nvidia_is_left_to_nvml(self):
+        write_card(self.root, 0, {"vendor": "0x10de\n", "device": "0x2684\n"})
+        write_card(self.root, 1)
+        getter = self.getter()
+        self.assertEqual(getter.gpu_count, 1)
+        self.assertEqual(getter.gpu_names, ["Radeon RX 6800"])
+
+    def test_intel_card(self):
+        write_card(
+            self.root,
+            0,
+            {
+                "vendor": "0x8086\n",
+                "device": "0x56a0\n",
+                "hwmon/hwmon2/power1_input": "20000000\n",
+                "hwmon/hwmon2/temp1_input": "47000\n",
+            },
+            card_files={"gt_cur_freq_mhz": "1350\n"},
+        )
+        getter = self.getter()
+        self.assertEqual(getter.gpu_names, ["Intel GPU (0x56a0)"])
+        self.assertEqual(list(getter.core_clock), [1350])
+        self.assertEqual(list(getter.memory_clock), [0])
+        self.assertEqual(list(getter.power), [20.0])
+        # without a cap the power is its own limit
+        self.assertEqual(list(getter.available_power), [20.0])
+        self.assertEqual(list(getter.temperature), [47.0])
+        self.assertEqual(list(getter.available_memory), [0])
+        self.assertEqual(list(getter.memory_usage), [0])
+
+    def test_missing_values(self):
+        files = dict(AMD_CARD_FILES)
+        del files["pp_dpm_sclk"]
+        del files["gpu_busy_percent"]
+        write_card(self.root, 0, files)
+        getter = self.getter()
+        self.assertEqual(list(getter.core_clock), [0])
+        self.assertEqual(list(getter.usage), [0])
+
+
+if __name__ == "__main__":
+    unittest.main()
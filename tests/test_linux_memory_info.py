@@ -0,0 +1,57 @@
+import tempfile
+import unittest
+
+from performance_monitor.info_getter.linux_memory_info import LinuxMemoryInformation
+from tests.fake_root import write_meminfo
+
+
+class LinuxMemoryInformationTest(unittest.TestCase):
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self.root = self._directory.name
+
+    def tearDown(self):
+        self._directory.cleanup()
+
+    def test_meminfo(self):
+        write_meminfo(
+            self.root,
+            {
+                "MemTotal": 16_000_000,
+                "MemFree": 1_000_000,
+                "MemAvailable": 12_000_000,
+                "SwapTotal": 2_000_000,
+                "SwapFree": 1_500_000,
+            },
+        )
+        getter = LinuxMemoryInformation(self.root)
+        self.assertEqual(getter.total_physical_memory, 16_000_000 * 1024)
+        self.assertEqual(getter.used_physical_memory, 4_000_000 * 1024)
+        self.assertEqual(getter.physical_memory_usage, 25.0)
+        self.assertEqual(getter.total_swap_memory, 2_000_000 * 1024)
+        self.assertEqual(getter.used_swap_memory, 500_000 * 1024)
+
+    def test_update(self):
+        write_meminfo(self.root, {"MemTotal": 1000, "MemAvailable": 900})
+        getter = LinuxMemoryInformation(self.root)
+        write_meminfo(self.root, {"MemTotal": 1000, "MemAvailable": 333})
+        getter.update()
+        self.assertEqual(getter.used_physical_memory, 667 * 1024)
+        self.assertEqual(getter.physical_memory_usage, 66.7)
+
+    def test_free_without_available(self):
+        # kernels before 3.14 have no MemAvailable
+        write_meminfo(self.root, {"MemTotal": 1000, "MemFree": 400})
+        getter = LinuxMemoryInformation(self.root)
+        self.assertEqual(getter.used_physical_memory, 600 * 1024)
+        self.assertEqual(getter.total_swap_memory, 0)
+        self.assertEqual(getter.used_swap_memory, 0)
+
+    def test_missing_meminfo(self):
+        getter = LinuxMemoryInformation(self.root)
+        self.assertEqual(getter.total_physical_memory, 0)
+        self.assertEqual(getter.physical_memory_usage, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
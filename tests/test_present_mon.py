@@ -0,0 +1,57 @@
+import random
+import unittest
+
+from performance_monitor.info_getter.present_mon import PresentMonParser
+
+HEADER = b"Application,ProcessID,TimeInSeconds,msBetweenPresents,msUntilDisplayed\r\n"
+
+
+def _rows(count: int) -> bytes:
+    return b"".join(
+        b"game.exe,4242,%.4f,%.3f,2.5\r\n" % (index / 100, 1 + index / 1000)
+        for index in range(count)
+    )
+
+
+class PresentMonParserTest(unittest.TestCase):
+    def test_whole_output(self):
+        parser = PresentMonParser()
+        self.assertEqual(parser.feed(HEADER + _rows(3)), [1.0, 1.001, 1.002])
+        self.assertEqual(parser.column, 3)
+
+    def test_random_chunks(self):
+        data = HEADER + _rows(500)
+        expected = PresentMonParser().feed(data)
+        generator = random.Random(0)
+        for _ in range(20):
+            parser = PresentMonParser()
+            frame_times = []
+            position = 0
+            while position < len(data):
+                size = generator.randint(1, 64)
+                frame_times += parser.feed(data[position : position + size])
+                position += size
+            self.assertEqual(frame_times, expected)
+
+    def test_split_between_cr_and_lf(self):
+        parser = PresentMonParser()
+        data = HEADER + _rows(2)
+        split = data.rindex(b"\r\n") + 1
+        self.assertEqual(parser.feed(data[:split]), [1.0])
+        self.assertEqual(parser.feed(data[split:]), [1.001])
+
+    def test_rows_of_another_width(self):
+        parser = PresentMonParser()
+        parser.feed(HEADER)
+        wide = b"game.exe,4242,0.01,1.5,2.5,extra\r\n"
+        self.assertEqual(parser.feed(wide + _rows(1)), [1.5, 1.0])
+        short = b"game.exe,4242,0.02,NA\r\n"
+        self.assertEqual(parser.feed(short + _rows(1)), [1.0])
+
+    def test_missing_column(self):
+        with self.assertRaises(RuntimeError):
+            PresentMonParser().feed(b"Application,ProcessID\r\ngame.exe,4242\r\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import os
+import tempfile
+import unittest
+
+from performance_monitor.info_getter.record import RecordWriter, read_records
+
+
+class RecordTest(unittest.TestCase):
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._directory.name, "sensors.pmrec")
+
+    def tearDown(self):
+        self._directory.cleanup()
+
+    def write(self, *timestamps: float):
+        writer = RecordWriter(self.path)
+        for timestamp in timestamps:
+            writer.append(timestamp, {"cpu": {"load": [timestamp, 50.0]}})
+        writer.close()
+
+    def timestamps(self):
+        return [timestamp for timestamp, _ in read_records(self.path)]
+
+    def test_round_trip(self):
+        self.write(1.0, 2.0)
+        records = list(read_records(self.path))
+        self.assertEqual(records[1], (2.0, {"cpu": {"load": [2.0, 50.0]}}))
+
+    def test_append_after_cut_header(self):
+        self.write(1.0, 2.0)
+        with open(self.path, "ab") as file:
+            file.write(b"\x00" * 5)
+        self.write(3.0)
+        self.assertEqual(self.timestamps(), [1.0, 2.0, 3.0])
+
+    def test_append_after_cut_data(self):
+        self.write(1.0, 2.0)
+        with open(self.path, "r+b") as file:
+            file.truncate(os.path.getsize(self.path) - 3)
+        self.write(3.0)
+        self.assertEqual(self.timestamps(), [1.0, 3.0])
+
+    def test_not_a_record_file(self):
+        with open(self.path, "wb") as file:
+            file.write(b"something else")
+        with self.assertRaises(ValueError):
+            RecordWriter(self.path)
+
+
+if __name__ == "__main__":
+    unittest.main()